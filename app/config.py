@@ -26,11 +26,138 @@ def env_flag(name: str, *, default: bool = False) -> bool:
     return default
 
 
+def env_int(name: str, *, default: int, minimum: int | None = None) -> int:
+    """Return an integer from environment variables.
+
+    Missing or malformed values fall back to ``default``; when ``minimum`` is
+    given the result is clamped so that misconfiguration cannot produce
+    nonsensical sizes or budgets.
+    """
+    value = os.getenv(name)
+    try:
+        result = int(value.strip()) if value is not None else default
+    except ValueError:
+        result = default
+    if minimum is not None and result < minimum:
+        result = minimum
+    return result
+
+
+def env_choice(name: str, choices: tuple[str, ...], *, default: str) -> str:
+    """Return one of ``choices`` from environment variables (case-insensitive)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    normalised = value.strip().lower()
+    return normalised if normalised in choices else default
+
+
 BOARD15_ENABLED: Final[bool] = env_flag("BOARD15_ENABLED", default=True)
 BOARD15_TEST_ENABLED: Final[bool] = env_flag("BOARD15_TEST_ENABLED", default=True)
+BOARD15_BOT_DIFFICULTIES: Final[tuple[str, ...]] = ("normal", "hard")
+BOARD15_BOT_DIFFICULTY: Final[str] = env_choice(
+    "BOARD15_BOT_DIFFICULTY", BOARD15_BOT_DIFFICULTIES, default="normal"
+)
+# Wall-clock cap of one hard-bot move.  The search samples fleets until the
+# budget runs out, so the move depends on machine speed and load.
+BOARD15_HARD_BOT_BUDGET_MS: Final[int] = env_int(
+    "BOARD15_HARD_BOT_BUDGET_MS", default=250, minimum=10
+)
+# With BOARD15_HARD_BOT_REPLAY the search draws exactly BOARD15_HARD_BOT_SAMPLES
+# fleets instead, so hard-bot moves replay from the match seed.  The budget
+# still caps the move; a move it cuts short does not replay.  The default is
+# about 170 ms of CPU here.
+BOARD15_HARD_BOT_REPLAY: Final[bool] = env_flag("BOARD15_HARD_BOT_REPLAY", default=False)
+BOARD15_HARD_BOT_SAMPLES: Final[int] = env_int(
+    "BOARD15_HARD_BOT_SAMPLES", default=1500, minimum=50
+)
+
+BOARD15_COMPUTE_EXECUTOR: Final[str] = env_choice(
+    "BOARD15_COMPUTE_EXECUTOR", ("thread", "process"), default="thread"
+)
+BOARD15_COMPUTE_WORKERS: Final[int] = env_int(
+    "BOARD15_COMPUTE_WORKERS", default=min(4, os.cpu_count() or 1), minimum=1
+)
+
+BOARD15_FRAME_CACHE_SIZE: Final[int] = env_int(
+    "BOARD15_FRAME_CACHE_SIZE", default=48, minimum=0
+)
+BOARD15_RENDER_BACKEND: Final[str] = env_choice(
+    "BOARD15_RENDER_BACKEND", ("pil", "numpy"), default="pil"
+)
+BOARD15_IMAGE_FORMAT: Final[str] = env_choice(
+    "BOARD15_IMAGE_FORMAT", ("palette", "png", "webp"), default="palette"
+)
+BOARD15_PNG_COMPRESS_LEVEL: Final[int] = env_int(
+    "BOARD15_PNG_COMPRESS_LEVEL", default=6, minimum=0
+)
+BOARD15_RENDER_CACHE_BYTES: Final[int] = env_int(
+    "BOARD15_RENDER_CACHE_BYTES", default=8 * 1024 * 1024, minimum=0
+)
+
+BOARD15_BOARD_FORMATS: Final[tuple[str, ...]] = ("image", "text")
+BOARD15_BOARD_FORMAT: Final[str] = env_choice(
+    "BOARD15_BOARD_FORMAT", BOARD15_BOARD_FORMATS, default="image"
+)
+BOARD15_FANOUT_CONCURRENCY: Final[int] = env_int(
+    "BOARD15_FANOUT_CONCURRENCY", default=3, minimum=1
+)
+BOARD15_EDIT_IN_PLACE: Final[bool] = env_flag("BOARD15_EDIT_IN_PLACE", default=False)
+BOARD15_EDIT_MAX_AGE: Final[int] = env_int(
+    "BOARD15_EDIT_MAX_AGE", default=48 * 60 * 60, minimum=0
+)
+
+FILE_ID_CACHE_PATH: Final[str] = os.getenv("FILE_ID_CACHE_PATH", "file_ids.json")
+FILE_ID_CACHE_SIZE: Final[int] = env_int("FILE_ID_CACHE_SIZE", default=1024, minimum=0)
+
+SEND_GLOBAL_PER_SECOND: Final[int] = env_int("SEND_GLOBAL_PER_SECOND", default=25, minimum=1)
+SEND_CHAT_PER_MINUTE: Final[int] = env_int("SEND_CHAT_PER_MINUTE", default=60, minimum=1)
+SEND_GROUP_PER_MINUTE: Final[int] = env_int("SEND_GROUP_PER_MINUTE", default=20, minimum=1)
+SEND_MAX_RETRIES: Final[int] = env_int("SEND_MAX_RETRIES", default=3, minimum=0)
+
+UPDATE_QUEUE_SIZE: Final[int] = env_int("UPDATE_QUEUE_SIZE", default=1000, minimum=1)
+UPDATE_QUEUE_WORKERS: Final[int] = env_int("UPDATE_QUEUE_WORKERS", default=4, minimum=1)
+UPDATE_QUEUE_DRAIN_SECONDS: Final[int] = env_int(
+    "UPDATE_QUEUE_DRAIN_SECONDS", default=20, minimum=0
+)
+
+LAYOUT_POOL_SIZE: Final[int] = env_int("LAYOUT_POOL_SIZE", default=8, minimum=0)
+LAYOUT_POOL_LOW_WATERMARK: Final[int] = env_int(
+    "LAYOUT_POOL_LOW_WATERMARK", default=3, minimum=0
+)
 
 __all__ = [
+    "BOARD15_BOARD_FORMAT",
+    "BOARD15_BOARD_FORMATS",
+    "BOARD15_BOT_DIFFICULTIES",
+    "BOARD15_BOT_DIFFICULTY",
+    "BOARD15_COMPUTE_EXECUTOR",
+    "BOARD15_COMPUTE_WORKERS",
+    "BOARD15_EDIT_IN_PLACE",
+    "BOARD15_EDIT_MAX_AGE",
     "BOARD15_ENABLED",
+    "BOARD15_FANOUT_CONCURRENCY",
+    "BOARD15_FRAME_CACHE_SIZE",
+    "BOARD15_HARD_BOT_BUDGET_MS",
+    "BOARD15_HARD_BOT_REPLAY",
+    "BOARD15_HARD_BOT_SAMPLES",
+    "BOARD15_IMAGE_FORMAT",
+    "BOARD15_PNG_COMPRESS_LEVEL",
+    "BOARD15_RENDER_CACHE_BYTES",
+    "BOARD15_RENDER_BACKEND",
     "BOARD15_TEST_ENABLED",
+    "FILE_ID_CACHE_PATH",
+    "FILE_ID_CACHE_SIZE",
+    "LAYOUT_POOL_LOW_WATERMARK",
+    "LAYOUT_POOL_SIZE",
+    "SEND_CHAT_PER_MINUTE",
+    "SEND_GLOBAL_PER_SECOND",
+    "SEND_GROUP_PER_MINUTE",
+    "SEND_MAX_RETRIES",
+    "UPDATE_QUEUE_DRAIN_SECONDS",
+    "UPDATE_QUEUE_SIZE",
+    "UPDATE_QUEUE_WORKERS",
+    "env_choice",
     "env_flag",
+    "env_int",
 ]
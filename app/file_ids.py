@@ -0,0 +1,223 @@
+"""Reuse of Telegram ``file_id`` values for repeated photos.
+
+Telegram returns a ``file_id`` for every uploaded photo and accepts it in
+place of the bytes on later sends.  The welcome picture is sent on every
+``/start`` and ``/newgame`` and identical board frames are re-sent, so
+:func:`send_cached_photo` remembers the ``file_id`` of each upload by the
+SHA-256 of its content and references it next time.  A ``file_id`` the API
+rejects as invalid or expired is forgotten and the bytes are uploaded again;
+other errors are raised to the caller.
+
+The mapping is bounded (``FILE_ID_CACHE_SIZE`` entries, least recently used
+evicted) and persisted as JSON at ``FILE_ID_CACHE_PATH`` so it survives
+restarts; writes are batched to at most one per :data:`FLUSH_INTERVAL`
+seconds plus a final :func:`flush_file_ids` on shutdown.  The file is read
+and written in a worker thread, never on the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from telegram import InputFile
+from telegram.error import BadRequest
+
+from app.config import FILE_ID_CACHE_PATH, FILE_ID_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 30.0
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileIdCache:
+    """Bounded ``content digest -> file_id`` mapping backed by a JSON file."""
+
+    def __init__(self, path: Optional[Path], max_entries: int = 1024) -> None:
+        self.path = path
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serialises writes so an older snapshot never replaces a newer one.
+        self._write_lock = threading.Lock()
+        self._loaded = path is None
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> None:
+        """Read the persisted entries now instead of on the first lookup."""
+
+        with self._lock:
+            if not self._loaded:
+                self._load_locked()
+
+    def _load_locked(self) -> None:
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("FILE_ID_CACHE | cannot read %s", self.path, exc_info=True)
+            return
+        if isinstance(data, dict):
+            for digest, file_id in data.items():
+                if isinstance(digest, str) and isinstance(file_id, str):
+                    self._entries[digest] = file_id
+        self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Write the entries if they changed; blocking, so run it in a thread."""
+
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                self._saved_at = time.monotonic()
+                entries = dict(self._entries)
+            if self.path is None:
+                return
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            try:
+                tmp_path.write_text(json.dumps(entries), encoding="utf-8")
+                os.replace(tmp_path, self.path)
+            except OSError:
+                logger.warning("FILE_ID_CACHE | cannot write %s", self.path, exc_info=True)
+
+    def get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            if not self._loaded:
+                self._load_locked()
+            file_id = self._entries.get(digest)
+            if file_id is not None:
+                self._entries.move_to_end(digest)
+            return file_id
+
+    def put(self, digest: str, file_id: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load_locked()
+            self._entries[digest] = file_id
+            self._entries.move_to_end(digest)
+            self._evict_locked()
+            self._dirty = True
+
+    def save_due(self) -> bool:
+        """Return whether unsaved entries are older than :data:`FLUSH_INTERVAL`."""
+
+        return self._dirty and time.monotonic() - self._saved_at >= FLUSH_INTERVAL
+
+    def discard(self, digest: str) -> None:
+        with self._lock:
+            if self._entries.pop(digest, None) is not None:
+                self._dirty = True
+
+    def flush(self) -> None:
+        self.save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: Optional[FileIdCache] = None
+
+
+def get_file_id_cache() -> FileIdCache:
+    global _cache
+    if _cache is None:
+        path = Path(FILE_ID_CACHE_PATH) if FILE_ID_CACHE_PATH else None
+        _cache = FileIdCache(path, FILE_ID_CACHE_SIZE)
+    return _cache
+
+
+def flush_file_ids() -> None:
+    if _cache is not None:
+        _cache.flush()
+
+
+# Fragments of the BadRequest messages Telegram uses for a file_id it no
+# longer accepts; other errors (a bad caption, a missing chat) would fail
+# the upload just the same.
+FILE_ID_ERRORS = (
+    "wrong file identifier",
+    "wrong remote file identifier",
+    "file reference expired",
+    "wrong padding",
+    "type of file mismatch",
+)
+
+
+def _is_file_id_error(exc: BadRequest) -> bool:
+    message = exc.message.lower()
+    return any(fragment in message for fragment in FILE_ID_ERRORS)
+
+
+def _sent_file_id(message: Any) -> Optional[str]:
+    """Return the ``file_id`` of the largest size of a sent photo."""
+
+    try:
+        file_id = message.photo[-1].file_id
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return None
+    return file_id if isinstance(file_id, str) else None
+
+
+async def send_cached_photo(
+    send: Callable[[Any], Awaitable[Any]],
+    data: bytes,
+    *,
+    filename: str,
+) -> Any:
+    """Send a photo via ``send(photo)``, by ``file_id`` when ``data`` was sent before."""
+
+    cache = get_file_id_cache()
+    if not cache.loaded:
+        await asyncio.to_thread(cache.load)
+    digest = content_digest(data)
+    file_id = cache.get(digest)
+    if file_id is not None:
+        try:
+            return await send(file_id)
+        except BadRequest as exc:
+            if not _is_file_id_error(exc):
+                raise
+            logger.warning("FILE_ID_CACHE | stale file_id for %s, uploading again", digest[:12])
+            cache.discard(digest)
+    message = await send(InputFile(data, filename=filename))
+    file_id = _sent_file_id(message)
+    if file_id is not None:
+        cache.put(digest, file_id)
+        if cache.save_due():
+            await asyncio.to_thread(cache.save)
+    return message
+
+
+__all__ = [
+    "FileIdCache",
+    "content_digest",
+    "flush_file_ids",
+    "get_file_id_cache",
+    "send_cached_photo",
+]
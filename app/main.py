@@ -6,6 +6,7 @@ import signal
 import asyncio
 
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from telegram import Update
 from telegram.ext import (
     ApplicationBuilder,
@@ -30,7 +31,17 @@ from handlers.board_test import board_test_two
 from handlers.router import router_text
 
 from app.webhook_utils import normalize_webhook_base
-from app.config import BOARD15_ENABLED, BOARD15_TEST_ENABLED
+from app.config import (
+    BOARD15_ENABLED,
+    BOARD15_TEST_ENABLED,
+    UPDATE_QUEUE_DRAIN_SECONDS,
+    UPDATE_QUEUE_SIZE,
+    UPDATE_QUEUE_WORKERS,
+)
+from app.file_ids import flush_file_ids
+from app.send_scheduler import get_send_scheduler
+from app.update_queue import UpdateQueue
+from logic.layout_pool import start_layout_pool, stop_layout_pool
 
 
 if BOARD15_ENABLED:
@@ -76,7 +87,15 @@ signal.signal(signal.SIGINT, _handle_exit)
 # shortly after startup on some platforms (e.g. Render) when the polling task
 # fails.  By explicitly disabling it, the application runs purely in webhook
 # mode.
-bot_app = ApplicationBuilder().token(token).updater(None).build()
+# Every Bot API request of the handlers is queued and throttled by the send
+# scheduler (see ``app.send_scheduler``).
+bot_app = (
+    ApplicationBuilder()
+    .token(token)
+    .updater(None)
+    .rate_limiter(get_send_scheduler())
+    .build()
+)
 bot_app.add_handler(CommandHandler("start", start))
 bot_app.add_handler(CommandHandler("newgame", newgame))
 bot_app.add_handler(CommandHandler("board", board))
@@ -92,7 +111,7 @@ bot_app.add_handler(CallbackQueryHandler(confirm_join, pattern="^join_"))
 if BOARD15_ENABLED:
     bot_app.add_handler(CommandHandler("board15", board15))
     bot_app.add_handler(CallbackQueryHandler(send_board15_invite_link, pattern="^b15_get_link$"))
-    bot_app.add_handler(CallbackQueryHandler(add_board15_bot, pattern="^b15_add_bot$"))
+    bot_app.add_handler(CallbackQueryHandler(add_board15_bot, pattern="^b15_add_bot(?:_hard)?$"))
     if BOARD15_TEST_ENABLED:
         bot_app.add_handler(CommandHandler("board15test", board15_test))
 bot_app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, router_text))
@@ -105,6 +124,16 @@ async def handle_error(update: object, context: ContextTypes.DEFAULT_TYPE) -> No
 bot_app.add_error_handler(handle_error)
 
 
+async def _process_update(update: Update) -> None:
+    await bot_app.process_update(update)
+
+
+# The webhook only queues updates; workers process them after the answer.
+update_queue = UpdateQueue(
+    _process_update, max_size=UPDATE_QUEUE_SIZE, workers=UPDATE_QUEUE_WORKERS
+)
+
+
 app = FastAPI()
 
 
@@ -119,6 +148,11 @@ async def on_startup() -> None:
 
     await bot_app.initialize()
     await bot_app.start()
+    update_queue.start()
+
+    if BOARD15_ENABLED:
+        import game_board15.placement  # noqa: F401  # registers the 15×15 layouts
+    await start_layout_pool()
 
     webhook = f"{webhook_url}/webhook"
 
@@ -150,8 +184,15 @@ async def on_shutdown() -> None:
     logger.info("Shutting down bot application")
     try:
         await bot_app.bot.delete_webhook()
+        await update_queue.drain(UPDATE_QUEUE_DRAIN_SECONDS)
         await bot_app.stop()
         await bot_app.shutdown()
+        await stop_layout_pool()
+        await asyncio.to_thread(flush_file_ids)
+        if BOARD15_ENABLED:
+            from game_board15.compute import shutdown_executor
+
+            shutdown_executor()
     except Exception:
         logger.exception("Error during shutdown")
         raise
@@ -160,15 +201,22 @@ async def on_shutdown() -> None:
 
 
 @app.post("/webhook")
-async def telegram_webhook(request: Request) -> dict[str, bool]:
+async def telegram_webhook(request: Request) -> Response:
     # Отсекаем нелегитимные POST'ы до попытки парсинга
     if WEBHOOK_SECRET:
         got = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
         if got != WEBHOOK_SECRET:
-            return {"ok": True}
-    update = Update.de_json(await request.json(), bot_app.bot)
-    await bot_app.process_update(update)
-    return {"ok": True}
+            return JSONResponse({"ok": True})
+    try:
+        update = Update.de_json(await request.json(), bot_app.bot)
+    except (AttributeError, TypeError, ValueError):
+        logger.warning("Ignoring malformed webhook payload")
+        return JSONResponse({"ok": False}, status_code=400)
+    # Отвечаем сразу: обработка идёт в фоне, при переполнении очереди
+    # Telegram повторит доставку после 503.
+    if not update_queue.offer(update):
+        return JSONResponse({"ok": False}, status_code=503)
+    return JSONResponse({"ok": True})
 
 
 @app.api_route("/", methods=["GET", "HEAD"])
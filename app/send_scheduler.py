@@ -0,0 +1,323 @@
+"""Central scheduler for outbound Bot API requests.
+
+Telegram allows about 30 messages per second per bot, one message per
+second in a private chat (short bursts are tolerated) and 20 messages per
+minute in a group.  :class:`SendScheduler` is installed as the rate limiter
+of the application's bot, so every ``send_message``, ``send_photo``,
+``edit_message_*`` and ``delete_message`` made by the handlers goes through
+it without changes at the call sites:
+
+* requests for a chat form a FIFO queue and are sent one at a time, so
+  their order is kept, except that move results go before cosmetic
+  requests (deletes, chat actions) still waiting in the same chat;
+* every chat has its own token bucket (``SEND_CHAT_PER_MINUTE``, or
+  ``SEND_GROUP_PER_MINUTE`` for groups) for new messages and all chats share
+  a global one (``SEND_GLOBAL_PER_SECOND``).  Edits and cosmetic requests do
+  not post messages and skip the chat bucket, so cleaning up old boards
+  does not delay the next move result;
+* move results are served before cosmetic requests when the global bucket
+  is empty.  The priority follows from the endpoint and can be overridden
+  with ``rate_limit_args=PRIORITY_LOW`` / ``PRIORITY_HIGH``;
+* on ``RetryAfter`` all requests pause for the time Telegram asks for and
+  the request is retried up to ``SEND_MAX_RETRIES`` times.
+
+Queue depth and wait times are available from :func:`send_scheduler_stats`
+and logged periodically.  Requests without a ``chat_id`` (webhook setup,
+callback answers) are not throttled.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from app.config import (
+    SEND_CHAT_PER_MINUTE,
+    SEND_GLOBAL_PER_SECOND,
+    SEND_GROUP_PER_MINUTE,
+    SEND_MAX_RETRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+# Requests that carry no game state and may wait behind move results.
+LOW_PRIORITY_ENDPOINTS = frozenset(
+    {"deleteMessage", "deleteMessages", "sendChatAction", "setMessageReaction"}
+)
+# Requests that change existing messages instead of posting new ones.
+EDIT_ENDPOINTS = frozenset(
+    {"editMessageText", "editMessageCaption", "editMessageMedia", "editMessageReplyMarkup"}
+)
+# Requests that do not count against a chat's message rate.
+CHAT_BUCKET_EXEMPT_ENDPOINTS = LOW_PRIORITY_ENDPOINTS | EDIT_ENDPOINTS
+# Messages a chat may send back to back before its rate applies.
+CHAT_BURST = 3
+# Idle chats are forgotten once this many are tracked.
+PRUNE_THRESHOLD = 1024
+# Queue depth and wait times are logged after this many requests.
+STATS_LOG_INTERVAL = 500
+
+
+class _TokenBucket:
+    """Token bucket whose waiters are served by priority."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated: Optional[float] = None
+        self._waiting = [0, 0]
+
+    def _refill(self, now: float) -> None:
+        if self._updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.burst
+
+    async def acquire(self, priority: int = PRIORITY_HIGH) -> None:
+        loop = asyncio.get_running_loop()
+        self._waiting[priority] += 1
+        try:
+            while True:
+                self._refill(loop.time())
+                if self.tokens >= 1 and not any(self._waiting[:priority]):
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep(max((1 - self.tokens) / self.rate, 0.01))
+        finally:
+            self._waiting[priority] -= 1
+
+
+class _ChatQueue:
+    """Sends of one chat, one at a time; high priority requests go first."""
+
+    __slots__ = ("bucket", "depth", "_busy", "_waiting", "_changed")
+
+    def __init__(self, bucket: _TokenBucket) -> None:
+        self.bucket = bucket
+        self.depth = 0
+        self._busy = False
+        self._waiting = [0, 0]
+        self._changed = asyncio.Condition()
+
+    async def acquire(self, priority: int) -> None:
+        async with self._changed:
+            self._waiting[priority] += 1
+            try:
+                await self._changed.wait_for(
+                    lambda: not self._busy and not any(self._waiting[:priority])
+                )
+                self._busy = True
+            finally:
+                self._waiting[priority] -= 1
+                # A cancelled high priority waiter may unblock the others.
+                self._changed.notify_all()
+
+    async def release(self) -> None:
+        async with self._changed:
+            self._busy = False
+            self._changed.notify_all()
+
+
+@dataclass
+class SendStats:
+    requests: int = 0
+    retries: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+def _retry_seconds(exc: RetryAfter) -> float:
+    # ``retry_after`` warns while it may still be an int; the stored value is
+    # always a timedelta.
+    value = getattr(exc, "_retry_after", None)
+    if value is None:
+        value = exc.retry_after
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return float(value)
+
+
+class SendScheduler(BaseRateLimiter[int]):
+    """Per-chat FIFO queues behind a shared, priority-aware token bucket."""
+
+    def __init__(
+        self,
+        *,
+        global_per_second: float = SEND_GLOBAL_PER_SECOND,
+        chat_per_minute: float = SEND_CHAT_PER_MINUTE,
+        group_per_minute: float = SEND_GROUP_PER_MINUTE,
+        max_retries: int = SEND_MAX_RETRIES,
+    ) -> None:
+        self.global_per_second = global_per_second
+        self.chat_per_minute = chat_per_minute
+        self.group_per_minute = group_per_minute
+        self.max_retries = max_retries
+        self._global = _TokenBucket(global_per_second, global_per_second)
+        self._chats: Dict[Any, _ChatQueue] = {}
+        self._paused_until = 0.0
+        self._stats = SendStats()
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self._chats.clear()
+
+    def _prune(self) -> None:
+        """Forget idle chats whose bucket has refilled; they start over unchanged."""
+
+        now = asyncio.get_running_loop().time()
+        for chat_id, queue in list(self._chats.items()):
+            if not queue.depth and queue.bucket.full(now):
+                del self._chats[chat_id]
+
+    def _chat_queue(self, chat_id: Any) -> _ChatQueue:
+        queue = self._chats.get(chat_id)
+        if queue is None:
+            if len(self._chats) >= PRUNE_THRESHOLD:
+                self._prune()
+            group = isinstance(chat_id, str) or (isinstance(chat_id, int) and chat_id < 0)
+            per_minute = self.group_per_minute if group else self.chat_per_minute
+            queue = self._chats[chat_id] = _ChatQueue(_TokenBucket(per_minute / 60, CHAT_BURST))
+        return queue
+
+    async def _wait_pause(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (delay := self._paused_until - loop.time()) > 0:
+            await asyncio.sleep(delay)
+
+    async def _call(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            await self._wait_pause()
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as exc:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self._stats.retries += 1
+                delay = _retry_seconds(exc)
+                self._paused_until = max(self._paused_until, loop.time() + delay)
+                logger.warning(
+                    "SEND_SCHEDULER | %s hit flood control, retry %s/%s in %.1fs",
+                    endpoint,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int],
+    ) -> Any:
+        chat_id = data.get("chat_id")
+        if chat_id is None:
+            return await self._call(callback, args, kwargs, endpoint)
+        if rate_limit_args in (PRIORITY_HIGH, PRIORITY_LOW):
+            priority = rate_limit_args
+        else:
+            priority = PRIORITY_LOW if endpoint in LOW_PRIORITY_ENDPOINTS else PRIORITY_HIGH
+
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        queue = self._chat_queue(chat_id)
+        queue.depth += 1
+        stats = self._stats
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        try:
+            # Nothing is sent during a flood-control pause; do not hold the
+            # chat while waiting for it.
+            await self._wait_pause()
+            await queue.acquire(priority)
+            try:
+                if endpoint not in CHAT_BUCKET_EXEMPT_ENDPOINTS:
+                    await queue.bucket.acquire()
+                await self._global.acquire(priority)
+                waited = loop.time() - queued_at
+                stats.requests += 1
+                stats.wait_seconds += waited
+                stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+                if stats.requests % STATS_LOG_INTERVAL == 0:
+                    self._log_stats()
+                return await self._call(callback, args, kwargs, endpoint)
+            finally:
+                await queue.release()
+        finally:
+            stats.queued -= 1
+            queue.depth -= 1
+
+    def stats(self) -> Dict[str, float]:
+        stats = self._stats
+        return {
+            "requests": stats.requests,
+            "retries": stats.retries,
+            "queued": stats.queued,
+            "max_queued": stats.max_queued,
+            "chats": len(self._chats),
+            "mean_wait_ms": stats.wait_seconds * 1000 / stats.requests if stats.requests else 0.0,
+            "max_wait_ms": stats.max_wait_seconds * 1000,
+        }
+
+    def _log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            "SEND_SCHEDULER | requests=%s queued=%s max_queued=%s mean_wait_ms=%.1f "
+            "max_wait_ms=%.1f retries=%s",
+            stats["requests"],
+            stats["queued"],
+            stats["max_queued"],
+            stats["mean_wait_ms"],
+            stats["max_wait_ms"],
+            stats["retries"],
+        )
+
+
+_scheduler: Optional[SendScheduler] = None
+
+
+def get_send_scheduler() -> SendScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = SendScheduler()
+    return _scheduler
+
+
+def send_scheduler_stats() -> Dict[str, float]:
+    return get_send_scheduler().stats()
+
+
+__all__ = [
+    "PRIORITY_HIGH",
+    "PRIORITY_LOW",
+    "SendScheduler",
+    "get_send_scheduler",
+    "send_scheduler_stats",
+]
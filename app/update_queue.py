@@ -0,0 +1,154 @@
+"""In-process queue between the webhook endpoint and update processing.
+
+Telegram keeps a webhook request open until the bot answers and retries
+(and slows down) delivery when answers are slow.  The endpoint therefore
+only validates an update and hands it to :class:`UpdateQueue`; worker tasks
+process it afterwards.
+
+Every chat has its own backlog and at most one of its updates is processed
+at a time, so the updates of a chat keep the order they arrived in.  Chats
+with pending updates wait in one ready queue shared by the ``workers``
+tasks: a worker takes a chat, processes its oldest update and puts the chat
+back at the end of the ready queue if more updates are waiting.  A slow
+handler therefore holds up only its own chat and one worker; the other
+chats are served by the remaining workers.  ``bot_app.process_update`` runs
+the handlers directly, so the workers are the only bound on how many
+updates are processed at once.
+
+The queue holds at most ``UPDATE_QUEUE_SIZE`` updates.  When it is full
+:meth:`UpdateQueue.offer` refuses the update and the endpoint answers 503,
+which makes Telegram deliver it again later.  :meth:`UpdateQueue.drain`
+lets the workers finish queued updates on shutdown.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _chat_key(update: Any) -> int:
+    chat = getattr(update, "effective_chat", None)
+    chat_id = getattr(chat, "id", None)
+    if chat_id is None:
+        user = getattr(update, "effective_user", None)
+        chat_id = getattr(user, "id", 0)
+    return chat_id if isinstance(chat_id, int) else 0
+
+
+class UpdateQueue:
+    """Bounded per-chat queues of updates processed by ``workers`` tasks."""
+
+    def __init__(
+        self,
+        process: Callable[[Any], Awaitable[Any]],
+        *,
+        max_size: int,
+        workers: int,
+    ) -> None:
+        self.process = process
+        self.max_size = max(1, max_size)
+        self.worker_count = max(1, workers)
+        # Updates of a chat; the head is being processed or waits for a worker.
+        self._chats: Dict[int, Deque[Any]] = {}
+        self._ready: Optional[asyncio.Queue] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.pending = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._ready = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"update-worker-{idx}")
+            for idx in range(self.worker_count)
+        ]
+
+    def offer(self, update: Any) -> bool:
+        """Queue ``update``; return ``False`` if the queue is full or stopped."""
+
+        if not self._tasks or self.pending >= self.max_size:
+            self.rejected += 1
+            logger.warning(
+                "UPDATE_QUEUE | rejected update, pending=%s/%s", self.pending, self.max_size
+            )
+            return False
+        self.pending += 1
+        self._idle.clear()
+        key = _chat_key(update)
+        backlog = self._chats.get(key)
+        if backlog is not None:
+            # The chat is already queued or being processed.
+            backlog.append(update)
+        else:
+            self._chats[key] = deque([update])
+            self._ready.put_nowait(key)
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            key = await self._ready.get()
+            backlog = self._chats[key]
+            try:
+                await self.process(backlog[0])
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failed += 1
+                logger.exception("UPDATE_QUEUE | failed to process update")
+            finally:
+                backlog.popleft()
+                self.pending -= 1
+                if backlog:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._chats[key]
+                if not self.pending:
+                    self._idle.set()
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Process the queued updates, then stop the workers.
+
+        Updates still queued after ``timeout`` seconds are dropped.
+        """
+
+        if not self._tasks:
+            return
+        tasks, self._tasks = self._tasks, []
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("UPDATE_QUEUE | dropped %s updates on shutdown", self.pending)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._chats.clear()
+        self.pending = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending,
+            "max_size": self.max_size,
+            "workers": self.worker_count,
+            "chats": len(self._chats),
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+__all__ = ["UpdateQueue"]
@@ -0,0 +1,291 @@
+"""Monte-Carlo targeting for the "hard" 15×15 bot difficulty.
+
+The bot samples random fleets that are consistent with everything the shooter
+can see (misses, contours, wounded and sunk ships, its own fleet) and shoots
+at the unknown cell covered most often.  The heavy part works on plain data
+only so it can run in a worker thread or process without touching the match.
+The search samples until a per-move millisecond budget runs out.  Such a
+move depends on how many fleets the machine drew in time; when moves must
+replay from the match seed, the caller asks for a fixed number of samples
+instead and the budget only guards against a slow machine (a move it cuts
+short does not replay).
+"""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .bot_targeting import BOARD_SIZE, Coord, _is_available_target, _target_pool
+from .models import Match15, PLAYER_ORDER
+from .placement import SHIP_LAYOUT
+
+DIFFICULTY_NORMAL = "normal"
+DIFFICULTY_HARD = "hard"
+
+MAX_SAMPLES = 20000
+RANDOM_TRIES = 24
+
+# (cells bitmask, bitmask of cells plus their neighbours, cell coordinates)
+Placement = Tuple[int, int, Tuple[Coord, ...]]
+
+
+def _bit(coord: Coord) -> int:
+    return 1 << (coord[0] * BOARD_SIZE + coord[1])
+
+
+def _halo_mask(cells: Sequence[Coord]) -> int:
+    mask = 0
+    for r, c in cells:
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < BOARD_SIZE and 0 <= nc < BOARD_SIZE:
+                    mask |= _bit((nr, nc))
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _placements(size: int) -> Tuple[Placement, ...]:
+    out: List[Placement] = []
+    for r in range(BOARD_SIZE):
+        for c in range(BOARD_SIZE):
+            shapes = [[(r, c + i) for i in range(size)]]
+            if size > 1:
+                shapes.append([(r + i, c) for i in range(size)])
+            for cells in shapes:
+                if any(nr >= BOARD_SIZE or nc >= BOARD_SIZE for nr, nc in cells):
+                    continue
+                mask = 0
+                for cell in cells:
+                    mask |= _bit(cell)
+                out.append((mask, _halo_mask(cells), tuple(cells)))
+    return tuple(out)
+
+
+@dataclass(frozen=True)
+class HuntProblem:
+    """Public view of the field for one shooter, as plain picklable data."""
+
+    blocked: int
+    clusters: Tuple[Tuple[Coord, ...], ...]
+    fleet: Tuple[int, ...]
+    candidates: Tuple[Coord, ...]
+
+
+def _hit_clusters(hits: Sequence[Coord]) -> List[Tuple[Coord, ...]]:
+    remaining = set(hits)
+    clusters: List[Tuple[Coord, ...]] = []
+    while remaining:
+        start = remaining.pop()
+        stack = [start]
+        cluster = [start]
+        while stack:
+            r, c = stack.pop()
+            for nxt in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if nxt in remaining:
+                    remaining.remove(nxt)
+                    stack.append(nxt)
+                    cluster.append(nxt)
+        clusters.append(tuple(sorted(cluster)))
+    clusters.sort()
+    return clusters
+
+
+def build_hunt_problem(match: Match15, shooter: str) -> HuntProblem:
+    """Collect what ``shooter`` publicly knows about the field."""
+
+    field = match.field
+    blocked = 0
+    hits: List[Coord] = []
+    for r in range(BOARD_SIZE):
+        for c in range(BOARD_SIZE):
+            coord = (r, c)
+            state = field.state_at(coord)
+            owner = field.owner_at(coord)
+            if owner == shooter and state in (1, 3, 4):
+                blocked |= _halo_mask([coord])
+            elif state == 4:
+                blocked |= _halo_mask([coord])
+            elif state in (2, 5):
+                blocked |= _bit(coord)
+            elif state == 3:
+                hits.append(coord)
+                for dr in (-1, 1):
+                    for dc in (-1, 1):
+                        nr, nc = r + dr, c + dc
+                        if 0 <= nr < BOARD_SIZE and 0 <= nc < BOARD_SIZE:
+                            blocked |= _bit((nr, nc))
+    for coord in hits:
+        blocked &= ~_bit(coord)
+
+    fleet: List[int] = []
+    alive_cells = getattr(match, "alive_cells", {}) or {}
+    for key in PLAYER_ORDER:
+        if key == shooter or alive_cells.get(key, 0) <= 0:
+            continue
+        sizes = list(SHIP_LAYOUT)
+        for ship in field.ships.get(key, []):
+            if not ship.alive and len(ship.cells) in sizes:
+                sizes.remove(len(ship.cells))
+        fleet.extend(sizes)
+    fleet.sort(reverse=True)
+
+    pool = _target_pool(match, shooter)
+    candidates = tuple(
+        sorted(
+            coord
+            for coord in pool.cells()
+            if _is_available_target(field, shooter, coord)
+        )
+    )
+    return HuntProblem(
+        blocked=blocked,
+        clusters=tuple(_hit_clusters(hits)),
+        fleet=tuple(fleet),
+        candidates=candidates,
+    )
+
+
+def _sample_fleet(
+    rng: random.Random,
+    cluster_options: Sequence[Sequence[Tuple[int, Placement]]],
+    free_options: Dict[int, Sequence[Placement]],
+    fleet: Sequence[int],
+    blocked: int,
+) -> Optional[List[Placement]]:
+    forbidden = blocked
+    remaining = list(fleet)
+    placed: List[Placement] = []
+    for options in cluster_options:
+        legal = [
+            (size, placement)
+            for size, placement in options
+            if size in remaining and not placement[0] & forbidden
+        ]
+        if not legal:
+            return None
+        size, placement = legal[rng.randrange(len(legal))]
+        remaining.remove(size)
+        forbidden |= placement[1]
+        placed.append(placement)
+
+    for size in remaining:
+        options = free_options.get(size, ())
+        if not options:
+            return None
+        choice: Optional[Placement] = None
+        for _ in range(RANDOM_TRIES):
+            candidate = options[rng.randrange(len(options))]
+            if not candidate[0] & forbidden:
+                choice = candidate
+                break
+        if choice is None:
+            legal_free = [p for p in options if not p[0] & forbidden]
+            if not legal_free:
+                return None
+            choice = legal_free[rng.randrange(len(legal_free))]
+        forbidden |= choice[1]
+        placed.append(choice)
+    return placed
+
+
+def estimate_hit_density(
+    problem: HuntProblem,
+    samples: int,
+    seed: int,
+    budget_ms: Optional[int] = None,
+) -> Tuple[Dict[Coord, int], int]:
+    """Return per-cell ship counts over consistent fleets and how many were found.
+
+    Up to ``samples`` fleets are drawn, fewer when ``budget_ms`` runs out
+    first; draws that hit a dead end are not counted.  A search that draws
+    all ``samples`` depends only on ``problem``, ``samples`` and ``seed``.
+    """
+
+    rng = random.Random(seed)
+    deadline = None
+    if budget_ms is not None:
+        deadline = time.perf_counter() + max(budget_ms, 1) / 1000.0
+    hit_mask = 0
+    for cluster in problem.clusters:
+        for coord in cluster:
+            hit_mask |= _bit(coord)
+    hit_halo = _halo_mask([coord for cluster in problem.clusters for coord in cluster])
+
+    cluster_options: List[List[Tuple[int, Placement]]] = []
+    for cluster in problem.clusters:
+        cluster_mask = 0
+        for coord in cluster:
+            cluster_mask |= _bit(coord)
+        options: List[Tuple[int, Placement]] = []
+        for size in sorted(set(problem.fleet)):
+            if size < len(cluster):
+                continue
+            for placement in _placements(size):
+                mask, halo, _cells = placement
+                if mask & hit_mask != cluster_mask:
+                    continue
+                if mask & problem.blocked or (halo & ~mask) & hit_mask:
+                    continue
+                options.append((size, placement))
+        cluster_options.append(options)
+
+    free_options: Dict[int, Sequence[Placement]] = {
+        size: tuple(
+            placement
+            for placement in _placements(size)
+            if not placement[0] & (problem.blocked | hit_halo)
+        )
+        for size in set(problem.fleet)
+    }
+
+    counts: Dict[Coord, int] = {}
+    found = 0
+    for _ in range(max(samples, 1)):
+        placed = _sample_fleet(
+            rng, cluster_options, free_options, problem.fleet, problem.blocked
+        )
+        if placed is not None:
+            found += 1
+            for mask, _halo, cells in placed:
+                if mask & hit_mask:
+                    cells = tuple(cell for cell in cells if not _bit(cell) & hit_mask)
+                for cell in cells:
+                    counts[cell] = counts.get(cell, 0) + 1
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    return counts, found
+
+
+def choose_hard_target(
+    problem: HuntProblem,
+    samples: int,
+    seed: int,
+    budget_ms: Optional[int] = None,
+) -> Optional[Coord]:
+    """Pick the legal target most often covered by sampled fleets."""
+
+    if not problem.candidates:
+        return None
+    counts, found = estimate_hit_density(problem, samples, seed, budget_ms)
+    if not found:
+        return None
+    best = max(counts.get(coord, 0) for coord in problem.candidates)
+    if best <= 0:
+        return None
+    top = [coord for coord in problem.candidates if counts.get(coord, 0) == best]
+    return random.Random(seed).choice(top)
+
+
+__all__ = [
+    "DIFFICULTY_HARD",
+    "DIFFICULTY_NORMAL",
+    "HuntProblem",
+    "MAX_SAMPLES",
+    "build_hunt_problem",
+    "choose_hard_target",
+    "estimate_hit_density",
+]
@@ -1,75 +1,106 @@
-"""Helpers for bot targeting logic in the 15×15 mode."""
+"""15×15 adapter over the shared targeting module :mod:`logic.targeting`."""
 from __future__ import annotations
 
 import random
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from logic import targeting
+from logic.targeting import BoardView, Coord
 
 from .battle import HIT, KILL, ShotResult
-from .models import Field15, Match15, Ship
+from .models import Field15, Match15, PLAYER_ORDER, Ship
 
-Coord = Tuple[int, int]
 BOARD_SIZE = 15
 
 
-def _normalize_coord_value(value: object) -> Optional[Coord]:
-    if isinstance(value, (list, tuple)) and len(value) >= 2:
-        try:
-            return int(value[0]), int(value[1])
-        except (TypeError, ValueError):
-            return None
-    return None
+def _field_view(field: Field15, shooter: str) -> BoardView:
+    return BoardView(
+        BOARD_SIZE,
+        field.state_at,
+        lambda coord: field.owner_at(coord) == shooter,
+    )
 
 
-def _is_adjacent(a: Coord, b: Coord) -> bool:
-    return abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+_normalize_coord_value = targeting.normalize_coord
+_is_adjacent = targeting.is_adjacent
 
 
-def _has_diagonal_wounded(field: Field15, coord: Coord) -> bool:
-    r, c = coord
-    for dr in (-1, 1):
-        for dc in (-1, 1):
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < BOARD_SIZE and 0 <= nc < BOARD_SIZE:
-                if field.state_at((nr, nc)) == 3:
-                    return True
-    return False
+def _orthogonal_neighbors(coord: Coord) -> List[Coord]:
+    return targeting.orthogonal_neighbors(coord, BOARD_SIZE)
 
 
-def _orthogonal_neighbors(coord: Coord) -> List[Coord]:
-    r, c = coord
-    neighbours: List[Coord] = []
-    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-        nr, nc = r + dr, c + dc
-        if 0 <= nr < BOARD_SIZE and 0 <= nc < BOARD_SIZE:
-            neighbours.append((nr, nc))
-    return neighbours
+def _has_diagonal_wounded(field: Field15, coord: Coord) -> bool:
+    return targeting.has_diagonal_wounded(_field_view(field, ""), coord)
 
 
 def _normalize_target_hits(entry: Dict[str, object], field: Field15) -> List[Coord]:
-    raw_hits = entry.get("target_hits") or []
-    normalized: List[Coord] = []
-    seen: Set[Coord] = set()
-    for item in raw_hits:
-        coord = _normalize_coord_value(item)
-        if coord is None or coord in seen:
-            continue
-        if field.state_at(coord) == 3:
-            normalized.append(coord)
-            seen.add(coord)
-    entry["target_hits"] = normalized
-    if not normalized:
-        entry["target_owner"] = None
-    return normalized
+    return targeting.normalize_hits(_field_view(field, ""), entry)
 
 
 def _is_available_target(field: Field15, shooter: str, coord: Coord) -> bool:
-    owner = field.owner_at(coord)
-    if owner == shooter:
-        return False
-    if _has_diagonal_wounded(field, coord):
-        return False
-    state = field.state_at(coord)
-    return state not in (2, 3, 4, 5)
+    return targeting.is_available(_field_view(field, shooter), coord)
+
+
+class TargetPool(targeting.TargetPool):
+    """Shared-module target pool bound to a concrete 15×15 field."""
+
+    __slots__ = ("field", "shooter")
+
+    def __init__(self, field: Field15, shooter: str) -> None:
+        self.field = field
+        self.shooter = shooter
+        super().__init__(_field_view(field, shooter))
+
+    def rebind(self, field: Field15) -> None:
+        """Read ``field`` from now on; it is the same board reloaded."""
+
+        if field is not self.field:
+            self.field = field
+            self.view = _field_view(field, self.shooter)
+
+
+# Pools by (match id, shooter).  The bot loop reloads the match from storage
+# before every move, so a pool stored on the match object would be lost and
+# rebuilt from a full board scan each time.
+_target_pools: Dict[Tuple[Optional[str], str], TargetPool] = {}
+
+
+def _shot_affected_cells(result: ShotResult) -> Set[Coord]:
+    touched: List[Coord] = [result.coord]
+    if result.killed_ship is not None:
+        touched.extend(tuple(cell) for cell in result.killed_ship.cells)
+    touched.extend(tuple(cell) for cell in result.contour or [])
+    return targeting.surrounding_cells(touched, BOARD_SIZE)
+
+
+def _target_pool(match: Match15, shooter: str) -> TargetPool:
+    """Return the cached target pool of ``shooter`` for the current field."""
+
+    key = (getattr(match, "match_id", None), shooter)
+    pool = _target_pools.get(key)
+    if pool is None:
+        pool = _target_pools[key] = TargetPool(match.field, shooter)
+    else:
+        pool.rebind(match.field)
+    return pool
+
+
+def _patch_target_pools(match: Match15, result: ShotResult) -> None:
+    match_id = getattr(match, "match_id", None)
+    affected: Optional[Set[Coord]] = None
+    for shooter in PLAYER_ORDER:
+        pool = _target_pools.get((match_id, shooter))
+        if pool is None:
+            continue
+        if affected is None:
+            affected = _shot_affected_cells(result)
+        pool.rebind(match.field)
+        pool.refresh(affected)
+
+
+def _drop_target_pools(match_id: Optional[str]) -> None:
+    for shooter in PLAYER_ORDER:
+        _target_pools.pop((match_id, shooter), None)
 
 
 def _find_ship_cells(
@@ -97,45 +128,9 @@ def _collect_line_candidates(
     hits: List[Coord],
     owner: Optional[str] = None,
 ) -> List[Coord]:
-    if not hits:
-        return []
-    ship_cells = _find_ship_cells(field, owner, hits)
-    if ship_cells:
-        remaining = [
-            coord
-            for coord in ship_cells
-            if coord not in hits and _is_available_target(field, shooter, coord)
-        ]
-        if remaining:
-            return remaining
-
-    rows = {r for r, _ in hits}
-    cols = {c for _, c in hits}
-    candidates: List[Coord] = []
-    seen: Set[Coord] = set()
-    if len(rows) == 1:
-        ordered = sorted(hits, key=lambda item: item[1])
-        endpoints = [ordered[0], ordered[-1]]
-        for r, c in endpoints:
-            for delta in (-1, 1):
-                candidate = (r, c + delta)
-                if candidate in seen:
-                    continue
-                seen.add(candidate)
-                if _is_available_target(field, shooter, candidate):
-                    candidates.append(candidate)
-    elif len(cols) == 1:
-        ordered = sorted(hits, key=lambda item: item[0])
-        endpoints = [ordered[0], ordered[-1]]
-        for r, c in endpoints:
-            for delta in (-1, 1):
-                candidate = (r + delta, c)
-                if candidate in seen:
-                    continue
-                seen.add(candidate)
-                if _is_available_target(field, shooter, candidate):
-                    candidates.append(candidate)
-    return candidates
+    return targeting.line_candidates(
+        _field_view(field, shooter), hits, _find_ship_cells(field, owner, hits)
+    )
 
 
 def _collect_neighbor_candidates(
@@ -143,16 +138,7 @@ def _collect_neighbor_candidates(
     shooter: str,
     hits: List[Coord],
 ) -> List[Coord]:
-    candidates: List[Coord] = []
-    seen: Set[Coord] = set()
-    for hit in hits:
-        for candidate in _orthogonal_neighbors(hit):
-            if candidate in seen:
-                continue
-            seen.add(candidate)
-            if _is_available_target(field, shooter, candidate):
-                candidates.append(candidate)
-    return candidates
+    return targeting.neighbor_candidates(_field_view(field, shooter), hits)
 
 
 def _choose_bot_target(
@@ -160,31 +146,17 @@ def _choose_bot_target(
     shooter: str,
     entry: Dict[str, object],
     rng: random.Random,
+    *,
+    pool: Optional[TargetPool] = None,
 ) -> Optional[Coord]:
-    hits = _normalize_target_hits(entry, field)
     owner = entry.get("target_owner")
-    if hits:
-        if len(hits) == 1:
-            neighbors = _collect_neighbor_candidates(field, shooter, hits)
-            if neighbors:
-                rng.shuffle(neighbors)
-                return neighbors[0]
-        else:
-            line_candidates = _collect_line_candidates(field, shooter, hits, owner=owner)
-            if line_candidates:
-                rng.shuffle(line_candidates)
-                return line_candidates[0]
-            neighbors = _collect_neighbor_candidates(field, shooter, hits)
-            if neighbors:
-                rng.shuffle(neighbors)
-                return neighbors[0]
-
-    coords = [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)]
-    rng.shuffle(coords)
-    for coord in coords:
-        if _is_available_target(field, shooter, coord):
-            return coord
-    return None
+    return targeting.choose_target(
+        pool.view if pool is not None else _field_view(field, shooter),
+        entry,
+        rng,
+        pool=pool,
+        ship_cells=lambda hits: _find_ship_cells(field, owner, hits),
+    )
 
 
 def _clear_targets_for_owner(
@@ -245,58 +217,25 @@ def _update_bot_target_state(
     shooter: str,
     result: ShotResult,
 ) -> None:
+    _patch_target_pools(match, result)
     entry = match.shots.setdefault(shooter, {})
-    field = getattr(match, "field", None)
-    hits_raw = entry.get("target_hits") or []
-    normalized_hits: List[Coord] = []
-    seen: Set[Coord] = set()
-    for item in hits_raw:
-        coord = _normalize_coord_value(item)
-        if coord is None or coord in seen:
-            continue
-        if isinstance(field, Field15) and field.state_at(coord) != 3:
-            continue
-        normalized_hits.append(coord)
-        seen.add(coord)
-
+    view = _field_view(match.field, shooter)
+    if result.result == HIT and result.owner is None:
+        targeting.normalize_hits(view, entry)
+        return
+    targeting.record_result(view, entry, result.coord, result.result, result.owner)
     if result.result == KILL:
-        entry["target_hits"] = []
-        entry["target_owner"] = None
         _clear_targets_for_owner(match, result.owner, exclude=shooter)
-        return
-
-    if result.result != HIT:
-        entry["target_hits"] = normalized_hits
-        if not normalized_hits:
-            entry["target_owner"] = None
-        return
-
-    coord = result.coord
-    owner = result.owner
-    if owner is None:
-        entry["target_hits"] = normalized_hits
-        if not normalized_hits:
-            entry["target_owner"] = None
-        return
-
-    if entry.get("target_owner") not in (None, owner):
-        normalized_hits = []
-
-    if normalized_hits and not any(_is_adjacent(hit, coord) for hit in normalized_hits):
-        normalized_hits = []
-
-    if coord not in normalized_hits:
-        normalized_hits.append(coord)
-
-    entry["target_hits"] = normalized_hits
-    entry["target_owner"] = owner
-
-    _propagate_hit_to_other_entries(match, shooter, owner, coord)
+    elif result.result == HIT:
+        _propagate_hit_to_other_entries(match, shooter, result.owner, result.coord)
 
 
 __all__ = [
     "BOARD_SIZE",
     "Coord",
+    "TargetPool",
     "_choose_bot_target",
+    "_drop_target_pools",
+    "_target_pool",
     "_update_bot_target_state",
 ]
@@ -0,0 +1,152 @@
+"""Shared worker pool for CPU-heavy 15×15 work.
+
+Bot thinking and PIL rendering are pushed off the event loop so that the
+webhook keeps answering while many bot matches are running.  The pool is a
+thread pool by default; ``BOARD15_COMPUTE_EXECUTOR=process`` switches to a
+process pool for deployments with several cores.  Jobs submitted with a
+``match_id`` are cancelled when that match ends.  Workers build the
+renderer's cached base layer when they start so the first frame of a match
+does not pay for it.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, TypeVar
+
+from app.config import BOARD15_COMPUTE_EXECUTOR, BOARD15_COMPUTE_WORKERS
+
+from .render import warm_up as warm_up_render
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ComputeExecutor:
+    """Lazily created thread/process pool with per-match job tracking."""
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int = 2,
+        *,
+        initializer: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.initializer = initializer
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Set[asyncio.Future]] = {}
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=self.initializer,
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="board15-compute",
+                        initializer=self.initializer,
+                    )
+            return self._pool
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        match_id: Optional[str] = None,
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_pool(), functools.partial(fn, *args))
+        if match_id is None:
+            return await future
+        pending = self._pending.setdefault(match_id, set())
+        pending.add(future)
+        try:
+            return await future
+        finally:
+            pending.discard(future)
+            if not pending and self._pending.get(match_id) is pending:
+                self._pending.pop(match_id, None)
+
+    def cancel_match(self, match_id: Optional[str]) -> int:
+        """Cancel outstanding jobs of ``match_id`` and return how many were hit."""
+
+        if not match_id:
+            return 0
+        pending = self._pending.pop(match_id, set())
+        cancelled = 0
+        for future in list(pending):
+            if not future.done():
+                future.cancel()
+                cancelled += 1
+        if cancelled:
+            logger.info(
+                "COMPUTE_CANCEL | match=%s jobs=%s", match_id, cancelled
+            )
+        return cancelled
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        for match_id in list(self._pending):
+            self.cancel_match(match_id)
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor: Optional[ComputeExecutor] = None
+
+
+def get_executor() -> ComputeExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ComputeExecutor(
+            BOARD15_COMPUTE_EXECUTOR,
+            BOARD15_COMPUTE_WORKERS,
+            initializer=warm_up_render,
+        )
+    return _executor
+
+
+async def run_compute(
+    fn: Callable[..., T],
+    *args: Any,
+    match_id: Optional[str] = None,
+) -> T:
+    """Run ``fn(*args)`` on the shared pool and await its result."""
+
+    return await get_executor().run(fn, *args, match_id=match_id)
+
+
+def cancel_match(match_id: Optional[str]) -> int:
+    if _executor is None:
+        return 0
+    return _executor.cancel_match(match_id)
+
+
+def shutdown_executor(*, wait: bool = False) -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+
+
+__all__ = [
+    "ComputeExecutor",
+    "cancel_match",
+    "get_executor",
+    "run_compute",
+    "shutdown_executor",
+]
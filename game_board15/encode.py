@@ -0,0 +1,219 @@
+"""Encoding of 15×15 board frames for upload.
+
+``BOARD15_IMAGE_FORMAT`` selects what :func:`encode_frame` emits:
+
+* ``palette`` (default) — palette-mode PNG.  A frame holds a couple hundred
+  colours (mostly antialiased axis labels), so the palette is exact and the
+  file is about half the size of a truecolour PNG;
+* ``png`` — truecolour RGBA PNG;
+* ``webp`` — lossless WebP, the smallest output.
+
+PNGs use ``BOARD15_PNG_COMPRESS_LEVEL``.  PIL's quantizer is exact for such
+frames but slower than the encoder itself, so frames are mapped onto one
+process-wide palette with per-channel lookup tables instead: the index of a
+pixel is ``(R[r] + G[g] + B[b]) % 256``, evaluated with C image operations.
+A frame that cannot be mapped exactly (more than 256 colours, transparency)
+is written as a truecolour PNG.
+
+Encode time and output size are counted per format; see
+:func:`encode_stats`.  With a process pool every worker keeps its own
+counters.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import DefaultDict, Dict, List, Optional, Sequence, Set, Tuple
+
+from PIL import Image, ImageChops
+
+from app.config import BOARD15_IMAGE_FORMAT, BOARD15_PNG_COMPRESS_LEVEL
+
+logger = logging.getLogger(__name__)
+
+FORMAT_PALETTE = "palette"
+FORMAT_PNG = "png"
+FORMAT_WEBP = "webp"
+
+PNG_COMPRESS_LEVEL = min(BOARD15_PNG_COMPRESS_LEVEL, 9)
+# Lossless WebP effort: method 2 with quality 0 is about as fast as a PNG of
+# the same frame at a third of its size; higher settings gain a few percent
+# for several times the encode time.
+WEBP_METHOD = 2
+WEBP_QUALITY = 0
+
+RGB = Tuple[int, int, int]
+ChannelTables = Tuple[List[int], List[int], List[int]]
+
+
+def _channel_tables(colors: Sequence[RGB]) -> Optional[ChannelTables]:
+    """Return tables mapping ``colors[i]`` to ``i``, or ``None`` if none exist.
+
+    Every colour is an edge joining its red, green and blue values.  Peeling
+    the edges (repeatedly removing one that holds a channel value no other
+    remaining colour uses) and fixing the tables in reverse order always
+    leaves a free entry to give each colour its index.  Peeling fails only
+    when colours share channel values cyclically.
+    """
+
+    edges = [((0, color[0]), (1, color[1]), (2, color[2])) for color in colors]
+    incident: DefaultDict[Tuple[int, int], Set[int]] = defaultdict(set)
+    for idx, edge in enumerate(edges):
+        for vertex in edge:
+            incident[vertex].add(idx)
+    stack = [vertex for vertex, owners in incident.items() if len(owners) == 1]
+    order: List[Tuple[int, Tuple[int, int]]] = []
+    while stack:
+        vertex = stack.pop()
+        if len(incident[vertex]) != 1:
+            continue
+        (idx,) = incident[vertex]
+        order.append((idx, vertex))
+        for other in edges[idx]:
+            incident[other].discard(idx)
+            if len(incident[other]) == 1:
+                stack.append(other)
+    if len(order) != len(edges):
+        return None
+    tables: ChannelTables = ([0] * 256, [0] * 256, [0] * 256)
+    for idx, free in reversed(order):
+        total = sum(tables[ch][value] for ch, value in edges[idx] if (ch, value) != free)
+        tables[free[0]][free[1]] = (idx - total) % 256
+    return tables
+
+
+class _Palette:
+    """Process-wide palette that grows as frames bring new colours."""
+
+    def __init__(self) -> None:
+        self.colors: List[RGB] = []
+        self.tables: Optional[ChannelTables] = None
+        self._known: Set[RGB] = set()
+        self._lock = threading.Lock()
+
+    def mapping(self, colors: Sequence[RGB]) -> Optional[Tuple[ChannelTables, List[RGB]]]:
+        """Return tables and palette covering ``colors``."""
+
+        with self._lock:
+            new = [color for color in colors if color not in self._known]
+            if not new and self.tables is not None:
+                return self.tables, self.colors
+            candidate = self.colors + sorted(new)
+            tables = _channel_tables(candidate) if len(candidate) <= 256 else None
+            if tables is not None:
+                self.colors = candidate
+                self.tables = tables
+                self._known.update(new)
+                return tables, candidate
+        # The shared palette is full: map this frame on its own.
+        own = sorted(colors)
+        tables = _channel_tables(own)
+        return (tables, own) if tables is not None else None
+
+
+_palette = _Palette()
+
+
+def to_palette(image: Image.Image) -> Optional[Image.Image]:
+    """Return an exact ``P`` copy of an opaque ``image``, or ``None``."""
+
+    found = image.getcolors(256)
+    if found is None:
+        return None
+    colors: List[RGB] = []
+    for _count, color in found:
+        if len(color) == 4 and color[3] != 255:
+            return None
+        colors.append(tuple(color[:3]))
+    mapping = _palette.mapping(colors)
+    if mapping is None:
+        return None
+    (red, green, blue), palette = mapping
+    channels = image.split()
+    indices = ImageChops.add_modulo(
+        ImageChops.add_modulo(channels[0].point(red), channels[1].point(green)),
+        channels[2].point(blue),
+    )
+    indices.putpalette([value for color in palette for value in color])
+    return indices
+
+
+@dataclass
+class EncodeStats:
+    frames: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+
+_stats: Dict[str, EncodeStats] = {}
+_stats_lock = threading.Lock()
+
+
+def encode_frame(image: Image.Image, fmt: Optional[str] = None) -> BytesIO:
+    """Encode ``image`` in ``fmt`` (``BOARD15_IMAGE_FORMAT`` by default).
+
+    The buffer is rewound and named after the format so uploads carry the
+    right file type.
+    """
+
+    fmt = fmt or BOARD15_IMAGE_FORMAT
+    started = time.perf_counter()
+    buffer = BytesIO()
+    if fmt == FORMAT_WEBP:
+        image.save(buffer, format="WEBP", lossless=True, quality=WEBP_QUALITY, method=WEBP_METHOD)
+        buffer.name = "board.webp"
+    else:
+        if fmt == FORMAT_PALETTE:
+            palette_image = to_palette(image)
+            if palette_image is None:
+                fmt = FORMAT_PNG
+            else:
+                image = palette_image
+        image.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+        buffer.name = "board.png"
+    elapsed = time.perf_counter() - started
+    size = buffer.tell()
+    buffer.seek(0)
+    with _stats_lock:
+        stats = _stats.setdefault(fmt, EncodeStats())
+        stats.frames += 1
+        stats.bytes += size
+        stats.seconds += elapsed
+    logger.debug("RENDER_ENCODE | format=%s bytes=%s ms=%.1f", fmt, size, elapsed * 1000)
+    return buffer
+
+
+def encode_stats() -> Dict[str, Dict[str, float]]:
+    """Return frames, bytes, mean size and mean encode time per format."""
+
+    with _stats_lock:
+        return {
+            fmt: {
+                "frames": stats.frames,
+                "bytes": stats.bytes,
+                "mean_bytes": stats.bytes / stats.frames if stats.frames else 0.0,
+                "mean_ms": stats.seconds * 1000 / stats.frames if stats.frames else 0.0,
+            }
+            for fmt, stats in _stats.items()
+        }
+
+
+def reset_encode_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+__all__ = [
+    "EncodeStats",
+    "FORMAT_PALETTE",
+    "FORMAT_PNG",
+    "FORMAT_WEBP",
+    "encode_frame",
+    "encode_stats",
+    "reset_encode_stats",
+    "to_palette",
+]
@@ -5,21 +5,45 @@ import asyncio
 import logging
 import random
 from urllib.parse import quote_plus
-from typing import Dict, Iterable, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
+from app.config import (
+    BOARD15_BOT_DIFFICULTIES,
+    BOARD15_BOT_DIFFICULTY,
+    BOARD15_HARD_BOT_BUDGET_MS,
+    BOARD15_HARD_BOT_REPLAY,
+    BOARD15_HARD_BOT_SAMPLES,
+)
 from handlers.commands import (
     ADMIN_ID,
     NAME_HINT_BOARD15,
     get_player_name,
     set_waiting_for_name,
 )
+from logic.rng import joke_start, match_rng
 
 from . import storage
 from .battle import HIT, KILL, MISS, ShotResult, advance_turn, apply_shot
-from .bot_targeting import _choose_bot_target, _update_bot_target_state
+from . import compute
+from .bot_montecarlo import (
+    DIFFICULTY_HARD,
+    MAX_SAMPLES,
+    build_hunt_problem,
+    choose_hard_target,
+)
+from .bot_targeting import (
+    Coord,
+    _choose_bot_target,
+    _drop_target_pools,
+    _is_available_target,
+    _normalize_coord_value,
+    _normalize_target_hits,
+    _target_pool,
+    _update_bot_target_state,
+)
 from .models import Match15, Player, PLAYER_ORDER
 from .render import render_board
 from .router import STATE_KEY
@@ -33,6 +57,10 @@ PENDING_BOARD15_TEST_FAST = "board15_test_fast"
 
 _bot_loop_tasks: Dict[str, asyncio.Task] = {}
 _bot_loop_starting: Set[str] = set()
+_turn_events: Dict[str, asyncio.Event] = {}
+_speculations: Dict[str, Tuple[tuple, asyncio.Task]] = {}
+
+TURN_POLL_INTERVAL = 0.5
 
 async def _prompt_for_name(
     update: Update,
@@ -142,6 +170,12 @@ async def _create_board15_match(
                         callback_data="b15_add_bot",
                     )
                 ],
+                [
+                    InlineKeyboardButton(
+                        "Пригласить сильного бота",
+                        callback_data="b15_add_bot_hard",
+                    )
+                ],
             ]
         )
         await message.reply_text(
@@ -286,6 +320,10 @@ async def add_board15_bot(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     flags = match.messages.setdefault("_flags", {})
     flags["board15_bot"] = True
     flags.setdefault("bot_delay", 3.0)
+    if getattr(query, "data", None) == "b15_add_bot_hard":
+        flags["bot_difficulty"] = DIFFICULTY_HARD
+    else:
+        flags.setdefault("bot_difficulty", BOARD15_BOT_DIFFICULTY)
 
     storage.append_snapshot(match)
 
@@ -431,6 +469,168 @@ async def ensure_auto_play_bots(
         _bot_loop_starting.discard(match_id)
 
 
+def _bot_difficulty(match: Match15) -> str:
+    messages = getattr(match, "messages", None)
+    flags = messages.get("_flags") if isinstance(messages, dict) else None
+    value = flags.get("bot_difficulty") if isinstance(flags, dict) else None
+    if value in BOARD15_BOT_DIFFICULTIES:
+        return value
+    return BOARD15_BOT_DIFFICULTY
+
+
+async def _select_bot_target(
+    match: Match15,
+    shooter: str,
+    entry: Dict[str, object],
+    rng: random.Random,
+) -> Optional[Coord]:
+    """Pick the next bot shot according to the match difficulty.
+
+    The Monte-Carlo search for hard bots runs on the shared compute pool so that
+    a slow decision never blocks the event loop serving other matches.  It
+    stops at ``BOARD15_HARD_BOT_BUDGET_MS``; with ``BOARD15_HARD_BOT_REPLAY``
+    it draws a fixed number of fleets so the move replays from the seed.
+    """
+
+    field = match.field
+    if _bot_difficulty(match) == DIFFICULTY_HARD and not _normalize_target_hits(entry, field):
+        problem = build_hunt_problem(match, shooter)
+        seed = rng.getrandbits(32)
+        samples = BOARD15_HARD_BOT_SAMPLES if BOARD15_HARD_BOT_REPLAY else MAX_SAMPLES
+        try:
+            coord = await compute.run_compute(
+                choose_hard_target,
+                problem,
+                samples,
+                seed,
+                BOARD15_HARD_BOT_BUDGET_MS,
+                match_id=getattr(match, "match_id", None),
+            )
+        except Exception:
+            logger.exception(
+                "Hard bot search failed for match %s", getattr(match, "match_id", "?")
+            )
+            coord = None
+        if coord is not None and _is_available_target(field, shooter, coord):
+            return coord
+    return _choose_bot_target(
+        field,
+        shooter,
+        entry,
+        rng,
+        pool=_target_pool(match, shooter),
+    )
+
+
+def _bot_move_rng(match: Match15, shooter: str) -> random.Random:
+    """Per-move RNG so a speculated move and a fresh one draw the same numbers."""
+
+    shots = getattr(match, "shots", {}) or {}
+    move_number = sum(len(entry.get("history") or []) for entry in shots.values())
+    return match_rng(match, "bot", shooter, move_number)
+
+
+def _speculation_token(match: Match15, shooter: str) -> tuple:
+    entry = match.shots.get(shooter) or {}
+    hits = tuple(
+        coord
+        for coord in (
+            _normalize_coord_value(item) for item in entry.get("target_hits") or []
+        )
+        if coord is not None
+    )
+    return (
+        shooter,
+        _bot_difficulty(match),
+        tuple(tuple(row) for row in match.field.grid),
+        hits,
+        entry.get("target_owner"),
+    )
+
+
+def _retrieve_speculation(task: asyncio.Task) -> None:
+    """Log a failed speculation; discarded ones are never awaited."""
+
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.warning("Speculative bot move failed", exc_info=exc)
+
+
+def _discard_speculation(match_id: Optional[str]) -> None:
+    pending = _speculations.pop(match_id, None) if match_id else None
+    if pending is not None and not pending[1].done():
+        pending[1].cancel()
+
+
+def speculate_bot_move(match: Match15) -> None:
+    """Start computing the next bot shot while the previous move is delivered.
+
+    Only used when a bot loop is running for the match and the player to move
+    is a bot.  The result is keyed by the state it was computed from and is
+    dropped if anything changes before the bot actually moves.
+    """
+
+    match_id = getattr(match, "match_id", None)
+    task = _bot_loop_tasks.get(match_id) if match_id else None
+    if task is None or task.done() or match.status != "playing":
+        return
+    shooter = match.turn
+    player = match.players.get(shooter)
+    if player is None or getattr(player, "user_id", None) != 0:
+        return
+    token = _speculation_token(match, shooter)
+    existing = _speculations.get(match_id)
+    if existing is not None and existing[0] == token:
+        return
+    _discard_speculation(match_id)
+    entry = match.shots.setdefault(shooter, {})
+    speculation = asyncio.ensure_future(
+        _select_bot_target(match, shooter, entry, _bot_move_rng(match, shooter))
+    )
+    speculation.add_done_callback(_retrieve_speculation)
+    _speculations[match_id] = (token, speculation)
+
+
+async def _next_bot_target(match: Match15, shooter: str) -> Optional[Coord]:
+    match_id = match.match_id
+    pending = _speculations.pop(match_id, None)
+    if pending is not None:
+        token, speculation = pending
+        if token == _speculation_token(match, shooter) and not speculation.cancelled():
+            try:
+                coord = await speculation
+            except Exception:
+                # Logged by _retrieve_speculation.
+                coord = None
+            if coord is not None and _is_available_target(match.field, shooter, coord):
+                return coord
+        else:
+            speculation.cancel()
+    entry = match.shots.setdefault(shooter, {})
+    return await _select_bot_target(match, shooter, entry, _bot_move_rng(match, shooter))
+
+
+def notify_turn_change(match_id: Optional[str]) -> None:
+    """Wake the bot loop of ``match_id`` after a human has moved."""
+
+    event = _turn_events.get(match_id) if match_id else None
+    if event is not None:
+        event.set()
+
+
+async def _wait_for_turn_change(match_id: str) -> None:
+    event = _turn_events.get(match_id)
+    if event is None:
+        event = _turn_events[match_id] = asyncio.Event()
+    try:
+        await asyncio.wait_for(event.wait(), TURN_POLL_INTERVAL)
+    except asyncio.TimeoutError:
+        pass
+    event.clear()
+
+
 async def _auto_play_bots(
     context: ContextTypes.DEFAULT_TYPE,
     match: Match15,
@@ -475,7 +675,6 @@ async def _auto_play_bots(
                 )
 
     match_ref = match
-    rng = random.Random(match_ref.match_id)
 
     async def _send_initial(match_obj: Match15) -> None:
         nonlocal human_key
@@ -537,7 +736,7 @@ async def _auto_play_bots(
 
                 current = match_ref.turn
                 if current in active_humans:
-                    await asyncio.sleep(0.5)
+                    await _wait_for_turn_change(match_ref.match_id)
                     continue
                 if match_ref.alive_cells.get(current, 0) <= 0:
                     match_ref.next_turn()
@@ -552,14 +751,14 @@ async def _auto_play_bots(
                     entry.setdefault("last_result", None)
                     entry.setdefault("last_coord", None)
                     entry.setdefault("move_count", 0)
-                    entry.setdefault("joke_start", random.randint(1, 10))
+                    entry.setdefault("joke_start", joke_start(match_ref, key))
                     if entry.get("target_hits") is None:
                         entry["target_hits"] = []
                     entry.setdefault("target_owner", None)
 
                 await asyncio.sleep(delay)
                 shooter_entry = match_ref.shots.setdefault(current, {})
-                coord = _choose_bot_target(field, current, shooter_entry, rng)
+                coord = await _next_bot_target(match_ref, current)
                 if coord is None:
                     match_ref.next_turn()
                     storage.save_match(match_ref)
@@ -605,6 +804,8 @@ async def _auto_play_bots(
                 elimination_order = router_ref._record_eliminations(
                     match_ref, outcome.eliminated
                 )
+                if not outcome.finished:
+                    speculate_bot_move(match_ref)
 
                 next_line_default = router_ref._format_next_turn_line(
                     match_ref,
@@ -758,45 +959,25 @@ async def _auto_play_bots(
                     expected_changes=expected_cells,
                 )
 
+                messages: Dict[str, List[str]] = {}
                 shooter = match_ref.players.get(current)
                 if shooter and getattr(shooter, "chat_id", 0):
-                    try:
-                        await router_ref._send_state(
-                            context,
-                            match_ref,
-                            current,
-                            message_self,
-                            snapshot=snapshot,
-                        )
-                    except Exception:
-                        logger.exception("Failed to notify bot player %s", current)
-
+                    messages[current] = [message_self]
                 for other_key, other_player in router_ref._iter_real_players(match_ref):
                     if other_key == current:
                         continue
                     if match_ref.alive_cells.get(other_key, 0) <= 0:
                         continue
                     message_enemy = enemy_messages.get(other_key)
-                    if not message_enemy:
-                        continue
-                    try:
-                        await router_ref._send_state(
-                            context,
-                            match_ref,
-                            other_key,
-                            message_enemy,
-                            snapshot=snapshot,
-                        )
-                    except Exception:
-                        logger.exception("Failed to notify player %s", other_key)
-
-                for eliminated_key in outcome.eliminated:
-                    await router_ref._broadcast_elimination(
-                        context,
-                        match_ref,
-                        eliminated_key,
-                        snapshot=snapshot,
-                    )
+                    if message_enemy:
+                        messages[other_key] = [message_enemy]
+                await router_ref._deliver_states(
+                    context,
+                    match_ref,
+                    messages,
+                    snapshot=snapshot,
+                    eliminated=outcome.eliminated,
+                )
 
                 if outcome.finished:
                     ranking = router_ref._final_ranking(
@@ -812,6 +993,11 @@ async def _auto_play_bots(
             logger.exception(
                 "Auto-play loop failed for match %s", getattr(match_ref, "match_id", "?")
             )
+        finally:
+            _discard_speculation(match_id)
+            _turn_events.pop(match_id, None)
+            compute.cancel_match(getattr(match_ref, "match_id", None))
+            _drop_target_pools(match_id)
 
     await _send_initial(match_ref)
     loop = getattr(context, "application", None)
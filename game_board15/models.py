@@ -1,13 +1,14 @@
 """Data models for the 15×15 three-player mode."""
 from __future__ import annotations
 
-import random
 import uuid
 from copy import deepcopy
 from dataclasses import dataclass, field as dc_field
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from logic.rng import match_rng, new_seed
+
 Coord = Tuple[int, int]
 
 
@@ -309,6 +310,8 @@ class Match15:
     match_id: str
     status: str = "waiting"
     created_at: str = dc_field(default_factory=lambda: datetime.utcnow().isoformat())
+    # root of all per-match randomness, see ``logic.rng``
+    seed: Optional[int] = dc_field(default_factory=new_seed)
     players: Dict[str, Player] = dc_field(default_factory=dict)
     field: Field15 = dc_field(default_factory=Field15)
     boards: Dict[str, Field15] = dc_field(
@@ -345,10 +348,19 @@ class Match15:
 
     @staticmethod
     def new(user_id: int, chat_id: int, name: str) -> "Match15":
+        # Auto-generate full fleets for all players as required by the
+        # specification. Layouts come pre-generated from the layout pool; the
+        # placement module registers the 15×15 generator and is imported
+        # lazily here to avoid circular imports at module load time.  The
+        # layout seed becomes the match seed so the whole game can be replayed.
+        from logic.layout_pool import MODE_BOARD15, take_layout
+        from . import placement  # noqa: F401  # registers the generator
+
+        seed, (field, fleets) = take_layout(MODE_BOARD15)
         match_id = uuid.uuid4().hex
-        match = Match15(match_id=match_id)
+        match = Match15(match_id=match_id, seed=seed)
         color_keys = list(PLAYER_COLOR_SCHEMES.keys())
-        random.shuffle(color_keys)
+        match_rng(match, "colors").shuffle(color_keys)
         match.color_map = {
             player_key: color_keys[idx % len(color_keys)]
             for idx, player_key in enumerate(PLAYER_ORDER)
@@ -361,12 +373,6 @@ class Match15:
         )
         match.players["A"] = player_a
 
-        # Auto-generate full fleets for all players as required by the
-        # specification. The placement logic lives in ``placement`` and is
-        # imported lazily here to avoid circular imports at module load time.
-        from .placement import generate_field  # local import
-
-        field, fleets = generate_field()
         match.field = field
         match.boards = {key: match.field for key in PLAYER_ORDER}
         match.field.ships = fleets
@@ -409,6 +415,7 @@ class Match15:
             "match_id": self.match_id,
             "status": self.status,
             "created_at": self.created_at,
+            "seed": self.seed,
             "players": {
                 key: {
                     "user_id": player.user_id,
@@ -464,6 +471,8 @@ class Match15:
         match = Match15(match_id=data["match_id"])
         match.status = data.get("status", "waiting")
         match.created_at = data.get("created_at", match.created_at)
+        # Matches stored before seeding fall back to their id (``match_seed``).
+        match.seed = data.get("seed")
         match.players = {
             key: Player(
                 user_id=player_data.get("user_id", 0),
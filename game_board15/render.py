@@ -2,14 +2,28 @@
 from __future__ import annotations
 
 import colorsys
+import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field as dc_field
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
+from app.config import (
+    BOARD15_FRAME_CACHE_SIZE,
+    BOARD15_IMAGE_FORMAT,
+    BOARD15_RENDER_BACKEND,
+)
+
+from .encode import encode_frame
 from .models import Field15, PLAYER_DARK_COLORS, PLAYER_LIGHT_COLORS, PLAYER_ORDER
+from .render_cache import CachedFrame, get_render_cache, view_digest
+
+logger = logging.getLogger(__name__)
 
 Coord = Tuple[int, int]
 
@@ -55,6 +69,9 @@ EMOJI_FONT_PATHS: Sequence[Path | str] = (
 
 COLS = "ABCDEFGHIJKLMNO"
 
+IMAGE_WIDTH = MARGIN_LEFT + CELL_SIZE * 15 + MARGIN_RIGHT
+IMAGE_HEIGHT = MARGIN_TOP + CELL_SIZE * 15 + MARGIN_BOTTOM
+
 
 @dataclass
 class RenderState:
@@ -64,29 +81,22 @@ class RenderState:
     reveal_ships: bool = True
     rendered_ship_cells: int = 20
     last_move: Optional[Coord] = None
-    attempt: int = 1
     color_map: Dict[str, str] = dc_field(
         default_factory=lambda: {key: key for key in PLAYER_ORDER}
     )
-
-    def clone_for_retry(self, *, attempt: int, footer_label: str) -> "RenderState":
-        return RenderState(
-            field=self.field,
-            history=self.history,
-            footer_label=footer_label,
-            reveal_ships=self.reveal_ships,
-            rendered_ship_cells=self.rendered_ship_cells,
-            last_move=self.last_move,
-            attempt=attempt,
-            color_map=dict(self.color_map),
-        )
+    # Set by the sender so views of a snapshot share one cached public layer
+    # that is patched from the previous snapshot instead of redrawn.
+    delta: Optional["FrameDelta"] = None
 
 
+@lru_cache(maxsize=None)
 def _load_font(
     size: int,
     *,
     paths: Sequence[Path | str] = TEXT_FONT_PATHS,
 ) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """Load the first available font from ``paths`` (once per process)."""
+
     for path in paths:
         try:
             return ImageFont.truetype(str(path), size=size)
@@ -161,6 +171,30 @@ def _draw_axes(
         for idx, y in enumerate(row_centers):
             draw.text((right_x, y), str(idx + 1), anchor="lm", font=font, fill=AXIS_COLOR)
 
+
+@lru_cache(maxsize=1)
+def _base_layer() -> Image.Image:
+    """Background, axis labels and grid shared by every frame; copy before drawing."""
+
+    image = Image.new("RGBA", (IMAGE_WIDTH, IMAGE_HEIGHT), BG_COLOR + (255,))
+    draw = ImageDraw.Draw(image)
+    _draw_axes(
+        draw,
+        draw_top=True,
+        draw_left=True,
+        draw_bottom=False,
+        draw_right=False,
+    )
+    _draw_grid(draw)
+    return image
+
+
+def warm_up() -> None:
+    """Build the cached fonts and layers so the first frame is not slower."""
+
+    _base_layer()
+
+
 def _mix(color: Tuple[int, int, int], factor: float) -> Tuple[int, int, int]:
     r, g, b = color
     return (
@@ -222,130 +256,602 @@ def _draw_cross(draw: ImageDraw.ImageDraw, rect: Tuple[int, int, int, int]) -> N
     )
 
 
-def render_board(state: RenderState, player_key: str) -> BytesIO:
-    field_width = CELL_SIZE * 15
-    field_height = CELL_SIZE * 15
-    image_width = MARGIN_LEFT + field_width + MARGIN_RIGHT
-    image_height = MARGIN_TOP + field_height + MARGIN_BOTTOM
-    image = Image.new("RGBA", (image_width, image_height), BG_COLOR + (255,))
-    draw = ImageDraw.Draw(image)
+# A cell is described by the primitives that paint it, e.g.
+# (("fill", rgb), ("cross",), ("outline",)).  Equal recipes give equal pixels,
+# so each recipe is rasterised once into a sprite and pasted afterwards.
+CellRecipe = Tuple[Tuple[object, ...], ...]
+
+# Sprites cover the cell interior only, so pasting them never touches the grid
+# lines already present in the base layer.
+SPRITE_SIZE = CELL_SIZE - 1
+SPRITE_CACHE_SIZE = 1024
+_SPRITE_BOXES = [
+    [
+        (
+            MARGIN_LEFT + c * CELL_SIZE + 1,
+            MARGIN_TOP + r * CELL_SIZE + 1,
+            MARGIN_LEFT + (c + 1) * CELL_SIZE,
+            MARGIN_TOP + (r + 1) * CELL_SIZE,
+        )
+        for c in range(15)
+    ]
+    for r in range(15)
+]
+
+
+def _cell_recipe(
+    state_value: int,
+    field_state: int,
+    fresh: bool,
+    owner: Optional[str],
+    field_owner: Optional[str],
+    player_key: str,
+    reveal_ships: bool,
+    light_color: Callable[[Optional[str]], Tuple[int, int, int]],
+    dark_color: Callable[[Optional[str]], Tuple[int, int, int]],
+) -> Tuple[CellRecipe, int]:
+    """Return the drawing recipe of a cell and how many own ship cells it shows."""
+
+    ops: List[Tuple[object, ...]] = []
+    if field_state == 1:
+        if field_owner == player_key:
+            ops.append(("fill", light_color(player_key)))
+        elif reveal_ships and owner:
+            ops.append(("fill", light_color(owner)))
+
+    if state_value == 2 or field_state == 2:
+        color = MISS_RECENT_COLOR if fresh and state_value == 2 else MISS_STALE_COLOR
+        ops.append(("dot", color))
+    if state_value == 3 or field_state == 3:
+        ops.append(("fill", dark_color(owner or player_key)))
+        ops.append(("target",) if fresh and state_value == 3 else ("cross",))
+    if state_value == 4 or field_state == 4:
+        ops.append(("fill", dark_color(owner or player_key)))
+        ops.append(("target",) if fresh and state_value == 4 else ("cross",))
+        ops.append(("outline",))
+    if state_value == 5 or field_state == 5:
+        ops.append(("dot", MISS_STALE_COLOR))
+    return tuple(ops), _visible_own(state_value, field_state, owner, field_owner, player_key)
+
+
+def _visible_own(
+    state_value: int,
+    field_state: int,
+    owner: Optional[str],
+    field_owner: Optional[str],
+    player_key: str,
+) -> int:
+    """Number of own ship cells a cell contributes to the ``sh_disp`` guard."""
+
+    visible_own = 0
+    if field_state == 1 and field_owner == player_key:
+        visible_own += 1
+    if (state_value == 3 or field_state == 3) and owner == player_key:
+        visible_own += 1
+    if (state_value == 4 or field_state == 4) and owner == player_key:
+        visible_own += 1
+    return visible_own
 
-    _draw_axes(draw, draw_top=True, draw_left=True, draw_bottom=False, draw_right=False)
+
+def _paint_cell(
+    draw: ImageDraw.ImageDraw,
+    rect: Tuple[int, int, int, int],
+    recipe: CellRecipe,
+) -> None:
+    for op in recipe:
+        kind = op[0]
+        if kind == "fill":
+            draw.rectangle(rect, fill=op[1])
+        elif kind == "dot":
+            cx = (rect[0] + rect[2]) // 2
+            cy = (rect[1] + rect[3]) // 2
+            radius = MISS_DOT_RADIUS
+            draw.ellipse(
+                [cx - radius, cy - radius, cx + radius, cy + radius],
+                fill=op[1],
+            )
+        elif kind == "target":
+            _draw_target_symbol(draw, rect)
+        elif kind == "cross":
+            _draw_cross(draw, rect)
+        elif kind == "outline":
+            draw.rectangle(rect, outline=KILL_OUTLINE, width=3)
+
+
+@lru_cache(maxsize=SPRITE_CACHE_SIZE)
+def _cell_sprite(recipe: CellRecipe) -> Image.Image:
+    """Rasterise ``recipe`` once; the sprite is the interior of a blank cell."""
+
+    tile = Image.new("RGBA", (CELL_SIZE + 1, CELL_SIZE + 1), BG_COLOR + (255,))
+    _paint_cell(ImageDraw.Draw(tile), (0, 0, CELL_SIZE, CELL_SIZE), recipe)
+    return tile.crop((1, 1, 1 + SPRITE_SIZE, 1 + SPRITE_SIZE))
+
+
+LookKey = Tuple[object, ...]
+LookGrid = List[List[Optional[LookKey]]]
+
+
+def _cell_look(cell_value: object, field_state: int, field_owner: Optional[str]) -> Optional[LookKey]:
+    """Reduce a cell to what its pixels depend on; ``None`` for a blank cell."""
+
+    if isinstance(cell_value, (list, tuple)):
+        state_value = int(cell_value[0]) if cell_value else 0
+        owner = cell_value[1] if len(cell_value) > 1 else None
+        try:
+            age = int(cell_value[2]) if len(cell_value) > 2 else 1
+        except (TypeError, ValueError):
+            age = 1
+    else:
+        state_value = int(cell_value)
+        owner = None
+        age = 1
+    if not state_value and not field_state:
+        return None
+    owner = owner if owner is not None else field_owner
+    return (state_value, field_state, age == 0, owner, field_owner)
+
+
+def count_visible_own_cells(field: Field15, history: Sequence[Sequence[object]], player_key: str) -> int:
+    """Return how many own ship cells the view of ``player_key`` shows.
+
+    This is the ``sh_disp`` guard computed from the data model alone: it
+    matches the count a render of the same field and history reports, so
+    callers can validate a view before paying for the render.
+    """
 
     visible_own = 0
-    color_map = state.color_map or {}
-    player_color_key = color_map.get(player_key, player_key)
-    default_light = PLAYER_LIGHT_COLORS.get(
-        player_color_key,
-        PLAYER_LIGHT_COLORS.get("A"),
-    )
-    default_dark = PLAYER_DARK_COLORS.get(
-        player_color_key,
-        PLAYER_DARK_COLORS.get("A"),
-    )
+    for r in range(15):
+        history_row = history[r]
+        grid_row = field.grid[r]
+        owners_row = field.owners[r]
+        for c in range(15):
+            look = _cell_look(history_row[c], grid_row[c], owners_row[c])
+            if look is not None:
+                state_value, field_state, _fresh, owner, field_owner = look
+                visible_own += _visible_own(state_value, field_state, owner, field_owner, player_key)
+    return visible_own
+
+
+class _ViewPainter:
+    """Turns cell looks of one player view into recipes, counts and sprites."""
+
+    def __init__(self, state: RenderState, player_key: str, *, sprites: bool = True) -> None:
+        self.player_key = player_key
+        self.reveal_ships = state.reveal_ships
+        self.sprites = sprites
+        self.color_map = state.color_map or {}
+        self.player_color_key = self.color_map.get(player_key, player_key)
+        self.default_light = PLAYER_LIGHT_COLORS.get(
+            self.player_color_key,
+            PLAYER_LIGHT_COLORS.get("A"),
+        )
+        self.default_dark = PLAYER_DARK_COLORS.get(
+            self.player_color_key,
+            PLAYER_DARK_COLORS.get("A"),
+        )
+        # Cells repeat a handful of looks per frame; resolve each look once.
+        self._looks: Dict[LookKey, Tuple[CellRecipe, int, object]] = {}
 
-    def light_color(owner: Optional[str]) -> Tuple[int, int, int]:
+    def light_color(self, owner: Optional[str]) -> Tuple[int, int, int]:
         if owner:
-            color_id = color_map.get(owner, owner)
+            color_id = self.color_map.get(owner, owner)
         else:
-            color_id = player_color_key
-        return PLAYER_LIGHT_COLORS.get(color_id, default_light)
+            color_id = self.player_color_key
+        return PLAYER_LIGHT_COLORS.get(color_id, self.default_light)
 
-    def dark_color(owner: Optional[str]) -> Tuple[int, int, int]:
+    def dark_color(self, owner: Optional[str]) -> Tuple[int, int, int]:
         if owner:
-            color_id = color_map.get(owner, owner)
+            color_id = self.color_map.get(owner, owner)
         else:
-            color_id = player_color_key
-        return PLAYER_DARK_COLORS.get(color_id, default_dark)
+            color_id = self.player_color_key
+        return PLAYER_DARK_COLORS.get(color_id, self.default_dark)
+
+    def resolve(self, look: LookKey) -> Tuple[CellRecipe, int, object]:
+        """Return ``(recipe, visible own cells, core sprite or None)``."""
+
+        resolved = self._looks.get(look)
+        if resolved is None:
+            state_value, field_state, fresh, owner, field_owner = look
+            recipe, own_cells = _cell_recipe(
+                state_value,
+                field_state,
+                fresh,
+                owner,
+                field_owner,
+                self.player_key,
+                self.reveal_ships,
+                self.light_color,
+                self.dark_color,
+            )
+            sprite = _cell_sprite(recipe).im if self.sprites and recipe else None
+            resolved = self._looks[look] = (recipe, own_cells, sprite)
+        return resolved
+
+
+def _draw_last_move(draw: ImageDraw.ImageDraw, last_move: Optional[Coord]) -> None:
+    if not last_move:
+        return
+    lr, lc = last_move
+    rect = _cell_rect(lr, lc)
+    cx = (rect[0] + rect[2]) // 2
+    cy = (rect[1] + rect[3]) // 2
+    draw.ellipse(
+        [cx - 10, cy - 10, cx + 10, cy + 10],
+        outline=(220, 0, 0),
+        width=2,
+    )
+
 
+def _compose_full(
+    state: RenderState,
+    player_key: str,
+    *,
+    sprites: bool = True,
+) -> Tuple[Image.Image, LookGrid, int]:
+    image = _base_layer().copy()
+    draw = ImageDraw.Draw(image)
+    painter = _ViewPainter(state, player_key, sprites=sprites)
+    # Core paste: same pixels as ``Image.paste`` without its per-call checks.
+    paste = image.im.paste
+    looks: LookGrid = [[None] * 15 for _ in range(15)]
+    visible_own = 0
+    grid = state.field.grid
+    owners = state.field.owners
     for r in range(15):
+        history_row = state.history[r]
+        grid_row = grid[r]
+        owners_row = owners[r]
+        looks_row = looks[r]
         for c in range(15):
-            rect = _cell_rect(r, c)
-            cell_value = state.history[r][c]
-            if isinstance(cell_value, (list, tuple)):
-                state_value = int(cell_value[0]) if cell_value else 0
-                owner = cell_value[1] if len(cell_value) > 1 else None
-                try:
-                    age = int(cell_value[2]) if len(cell_value) > 2 else 1
-                except (TypeError, ValueError):
-                    age = 1
-            else:
-                state_value = int(cell_value)
-                owner = None
-                age = 1
-            fresh = age == 0
-            field_state = state.field.grid[r][c]
-            field_owner = state.field.owners[r][c]
-            owner = owner if owner is not None else field_owner
-            if field_state == 1:
-                if field_owner == player_key:
-                    visible_own += 1
-                    draw.rectangle(
-                        rect,
-                        fill=light_color(player_key),
-                    )
-                elif state.reveal_ships and owner:
-                    draw.rectangle(
-                        rect,
-                        fill=light_color(owner),
-                    )
-
-            if state_value == 2 or field_state == 2:
-                cx = (rect[0] + rect[2]) // 2
-                cy = (rect[1] + rect[3]) // 2
-                color = MISS_RECENT_COLOR if fresh and state_value == 2 else MISS_STALE_COLOR
-                radius = MISS_DOT_RADIUS
-                draw.ellipse(
-                    [cx - radius, cy - radius, cx + radius, cy + radius],
-                    fill=color,
-                )
-            if state_value == 3 or field_state == 3:
-                if owner == player_key:
-                    visible_own += 1
-                fill_color = dark_color(owner or player_key)
-                draw.rectangle(rect, fill=fill_color)
-                if fresh and state_value == 3:
-                    _draw_target_symbol(draw, rect)
-                else:
-                    _draw_cross(draw, rect)
-            if state_value == 4 or field_state == 4:
-                if owner == player_key:
-                    visible_own += 1
-                fill_color = dark_color(owner or player_key)
-                draw.rectangle(rect, fill=fill_color)
-                if fresh and state_value == 4:
-                    _draw_target_symbol(draw, rect)
-                else:
-                    _draw_cross(draw, rect)
-                draw.rectangle(rect, outline=KILL_OUTLINE, width=3)
-            if state_value == 5 or field_state == 5:
-                cx = (rect[0] + rect[2]) // 2
-                cy = (rect[1] + rect[3]) // 2
-                radius = MISS_DOT_RADIUS
-                draw.ellipse(
-                    [cx - radius, cy - radius, cx + radius, cy + radius],
-                    fill=MISS_STALE_COLOR,
-                )
+            look = _cell_look(history_row[c], grid_row[c], owners_row[c])
+            if look is None:
+                continue
+            looks_row[c] = look
+            recipe, own_cells, sprite = painter.resolve(look)
+            visible_own += own_cells
+            if sprite is not None:
+                paste(sprite, _SPRITE_BOXES[r][c])
+            elif recipe and not sprites:
+                x0 = MARGIN_LEFT + c * CELL_SIZE
+                y0 = MARGIN_TOP + r * CELL_SIZE
+                _paint_cell(draw, (x0, y0, x0 + CELL_SIZE, y0 + CELL_SIZE), recipe)
+
+    if not sprites:
+        _draw_grid(draw)
+    _draw_last_move(draw, state.last_move)
+    return image, looks, visible_own
+
+
+def compose_board(
+    state: RenderState,
+    player_key: str,
+    *,
+    sprites: bool = True,
+) -> Image.Image:
+    """Build the frame for ``player_key`` from scratch without encoding it.
 
-    _draw_grid(draw)
+    With ``sprites`` (the default) every non-empty cell is a single paste of a
+    cached sprite; ``sprites=False`` paints the primitives directly (their
+    fills spill over the borders, so the grid is redrawn) and serves as the
+    reference the sprites are checked and benchmarked against.
+    """
 
-    if state.last_move:
-        lr, lc = state.last_move
-        rect = _cell_rect(lr, lc)
-        cx = (rect[0] + rect[2]) // 2
-        cy = (rect[1] + rect[3]) // 2
-        draw.ellipse(
-            [cx - 10, cy - 10, cx + 10, cy + 10],
-            outline=(220, 0, 0),
-            width=2,
-        )
+    image, _looks, visible_own = _compose_full(state, player_key, sprites=sprites)
+    state.rendered_ship_cells = visible_own
+    return image
+
+
+@dataclass(frozen=True)
+class FrameDelta:
+    """Identifies the snapshot a frame shows and what changed since the last one.
+
+    ``key`` identifies the shared board (the match id) and versions identify
+    the snapshots: the cached public layer is reused as is when it is already
+    at ``version`` and patched by repainting ``cells`` when it is exactly at
+    ``base_version`` (``None`` for the first snapshot of a match).
+    """
+
+    key: str
+    base_version: Optional[Tuple[int, int]]
+    version: Tuple[int, int]
+    cells: FrozenSet[Coord]
+
+
+@dataclass
+class _PublicLayer:
+    """Board pixels every viewer shares; view-dependent cells are left blank."""
+
+    version: Tuple[int, int]
+    context: Tuple[object, ...]
+    image: Image.Image
+    looks: LookGrid
+    private: Set[Coord]
+    own_counts: Dict[str, int] = dc_field(default_factory=dict)
+    # Array of ``image`` when the NumPy backend drew the layer.  The image is
+    # mapped onto it, so the core pastes of ``_patch_public`` update both.
+    pixels: object = None
+
+
+_frames: "OrderedDict[str, _PublicLayer]" = OrderedDict()
+_frames_lock = threading.Lock()
+
+
+def _is_private(look: LookKey) -> bool:
+    """Whether the pixels of ``look`` depend on the viewer.
+
+    Intact ships are only filled for their owner (or with ``reveal_ships``),
+    and hits without a known owner fall back to the viewer's colour.
+    """
+
+    state_value, field_state, _fresh, owner, _field_owner = look
+    if field_state == 1:
+        return True
+    return owner is None and (state_value in (3, 4) or field_state in (3, 4))
+
+
+def _layer_context(state: RenderState) -> Tuple[object, ...]:
+    return tuple(sorted((state.color_map or {}).items()))
 
+
+def _public_painter(state: RenderState) -> _ViewPainter:
+    # Public looks do not depend on the viewer, so any key resolves them.
+    return _ViewPainter(state, "")
+
+
+PaintCell = Tuple[int, int, CellRecipe]
+
+
+def _scan_public(state: RenderState) -> Tuple[LookGrid, Set[Coord], List[PaintCell]]:
+    """Return the looks, the private cells and the public cells to paint."""
+
+    painter = _public_painter(state)
+    looks: LookGrid = [[None] * 15 for _ in range(15)]
+    private: Set[Coord] = set()
+    cells: List[PaintCell] = []
+    grid = state.field.grid
+    owners = state.field.owners
+    for r in range(15):
+        history_row = state.history[r]
+        grid_row = grid[r]
+        owners_row = owners[r]
+        looks_row = looks[r]
+        for c in range(15):
+            look = _cell_look(history_row[c], grid_row[c], owners_row[c])
+            if look is None:
+                continue
+            looks_row[c] = look
+            if _is_private(look):
+                private.add((r, c))
+                continue
+            recipe = painter.resolve(look)[0]
+            if recipe:
+                cells.append((r, c, recipe))
+    return looks, private, cells
+
+
+def _compose_public(state: RenderState, version: Tuple[int, int]) -> _PublicLayer:
+    looks, private, cells = _scan_public(state)
+    image = _base_layer().copy()
+    paste = image.im.paste
+    for r, c, recipe in cells:
+        paste(_cell_sprite(recipe).im, _SPRITE_BOXES[r][c])
+    return _PublicLayer(
+        version=version,
+        context=_layer_context(state),
+        image=image,
+        looks=looks,
+        private=private,
+    )
+
+
+def _patch_public(
+    layer: _PublicLayer,
+    state: RenderState,
+    version: Tuple[int, int],
+    cells: Iterable[Coord],
+) -> None:
+    """Bring ``layer`` to ``version`` in place by repainting ``cells``."""
+
+    paste = layer.image.im.paste
+    painter = _public_painter(state)
+    blank = _cell_sprite(()).im
+    looks = layer.looks
+    for r, c in set(cells):
+        if not (0 <= r < 15 and 0 <= c < 15):
+            continue
+        look = _cell_look(state.history[r][c], state.field.grid[r][c], state.field.owners[r][c])
+        looks[r][c] = look
+        layer.private.discard((r, c))
+        sprite = blank
+        if look is not None:
+            if _is_private(look):
+                layer.private.add((r, c))
+            else:
+                resolved = painter.resolve(look)[2]
+                if resolved is not None:
+                    sprite = resolved
+        paste(sprite, _SPRITE_BOXES[r][c])
+    layer.version = version
+    layer.own_counts.clear()
+
+
+def _private_looks(layer: _PublicLayer) -> List[Tuple[int, int, LookKey]]:
+    looks = layer.looks
+    return [(r, c, looks[r][c]) for r, c in layer.private]
+
+
+def _view_cells(
+    private: Sequence[Tuple[int, int, LookKey]], state: RenderState, player_key: str
+) -> List[PaintCell]:
+    """Return the private cells as ``player_key`` sees them."""
+
+    painter = _ViewPainter(state, player_key, sprites=False)
+    cells: List[PaintCell] = []
+    for r, c, look in private:
+        recipe = painter.resolve(look)[0]
+        if recipe:
+            cells.append((r, c, recipe))
+    return cells
+
+
+def _view_own_count(layer: _PublicLayer, player_key: str) -> int:
+    visible_own = layer.own_counts.get(player_key)
+    if visible_own is None:
+        visible_own = 0
+        for looks_row in layer.looks:
+            for look in looks_row:
+                if look is not None:
+                    state_value, field_state, _fresh, owner, field_owner = look
+                    visible_own += _visible_own(state_value, field_state, owner, field_owner, player_key)
+        layer.own_counts[player_key] = visible_own
+    return visible_own
+
+
+def _copy_view(layer: _PublicLayer) -> Image.Image:
+    return layer.image.copy()
+
+
+def _finish_view(
+    image: Image.Image,
+    private: Sequence[Tuple[int, int, LookKey]],
+    state: RenderState,
+    player_key: str,
+) -> Image.Image:
+    """Overlay the view-dependent cells of ``player_key`` on a copy of the layer."""
+
+    paste = image.im.paste
+    for r, c, recipe in _view_cells(private, state, player_key):
+        paste(_cell_sprite(recipe).im, _SPRITE_BOXES[r][c])
+    _draw_last_move(ImageDraw.Draw(image), state.last_move)
+    return image
+
+
+@lru_cache(maxsize=None)
+def _backend(name: str):
+    """Return the NumPy backend module for ``name`` or ``None`` for PIL."""
+
+    if name != "numpy":
+        return None
+    try:
+        from . import render_numpy
+    except ImportError:
+        logger.warning("BOARD15_RENDER_BACKEND=numpy but NumPy is not installed; using PIL")
+        return None
+    return render_numpy
+
+
+def render_frame(
+    state: RenderState,
+    player_key: str,
+    *,
+    backend: Optional[str] = None,
+) -> Image.Image:
+    """Compose the frame of ``player_key`` on the cached public layer.
+
+    The layer of a match is drawn once per snapshot: the first view patches
+    the layer of the previous snapshot (or draws it when that is not the
+    base), the other views find it ready and only add their overlay.
+    Without ``state.delta`` (or when the cache is disabled) the frame is
+    rendered in full from scratch.
+
+    ``backend`` (``BOARD15_RENDER_BACKEND`` by default) picks who paints the
+    cells: ``"pil"`` pastes the sprites one by one, ``"numpy"`` writes them
+    with one array assignment per layer or overlay.  Both produce the same
+    pixels and share the cached layers.
+    """
+
+    numpy_backend = _backend(backend or BOARD15_RENDER_BACKEND)
+    delta = state.delta
+    if delta is None or BOARD15_FRAME_CACHE_SIZE <= 0:
+        if numpy_backend is not None:
+            return numpy_backend.compose_board_numpy(state, player_key)
+        return compose_board(state, player_key)
+    if numpy_backend is not None:
+        compose_public = numpy_backend.compose_public_numpy
+        copy_view = numpy_backend.copy_view_numpy
+        finish_view = numpy_backend.finish_view_numpy
+    else:
+        compose_public = _compose_public
+        copy_view = _copy_view
+        finish_view = _finish_view
+    # Layers are patched in place, so the lock is held while the layer is
+    # brought to the snapshot and copied; the lock also keeps concurrent views
+    # from drawing the same layer twice.  The overlay is painted on the copy
+    # outside the lock so views of different matches compose in parallel.
+    with _frames_lock:
+        layer = _frames.get(delta.key)
+        if layer is None or layer.context != _layer_context(state):
+            layer = None
+        elif layer.version != delta.version:
+            if delta.base_version is not None and layer.version == delta.base_version:
+                _patch_public(layer, state, delta.version, delta.cells)
+            else:
+                layer = None
+        if layer is None:
+            layer = _frames[delta.key] = compose_public(state, delta.version)
+        _frames.move_to_end(delta.key)
+        while len(_frames) > BOARD15_FRAME_CACHE_SIZE:
+            _frames.popitem(last=False)
+        canvas = copy_view(layer)
+        private = _private_looks(layer)
+        visible_own = _view_own_count(layer, player_key)
+    image = finish_view(canvas, private, state, player_key)
     state.rendered_ship_cells = visible_own
+    return image
 
-    buffer = BytesIO()
-    image.save(buffer, format="PNG")
-    buffer.seek(0)
+
+def clear_frame_cache() -> None:
+    with _frames_lock:
+        _frames.clear()
+
+
+def render_board(state: RenderState, player_key: str) -> BytesIO:
+    """Return the encoded frame, served from the render cache when possible."""
+
+    cache = get_render_cache()
+    key = None
+    if cache.enabled:
+        key = view_digest(state, player_key, salt=BOARD15_IMAGE_FORMAT)
+        cached = cache.get(key)
+        if cached is not None:
+            state.rendered_ship_cells = cached.visible_own
+            return cached.buffer()
+    buffer = encode_frame(render_frame(state, player_key))
+    if key is not None:
+        cache.put(
+            key,
+            CachedFrame(
+                data=buffer.getvalue(),
+                name=buffer.name,
+                visible_own=state.rendered_ship_cells,
+            ),
+        )
     return buffer
 
 
-__all__ = ["RenderState", "render_board"]
+def render_board_job(
+    render_fn: Callable[[RenderState, str], BytesIO],
+    state: RenderState,
+    player_key: str,
+) -> Tuple[BytesIO, int]:
+    """Render in a worker and return the PNG with the visible own-ship count.
+
+    A process pool works on a pickled copy of ``state``, so the guard counter
+    has to travel back with the result instead of being read from the state.
+    """
+
+    buffer = render_fn(state, player_key)
+    return buffer, state.rendered_ship_cells
+
+
+__all__ = [
+    "FrameDelta",
+    "RenderState",
+    "clear_frame_cache",
+    "compose_board",
+    "count_visible_own_cells",
+    "render_board",
+    "render_board_job",
+    "render_frame",
+    "warm_up",
+]
@@ -0,0 +1,226 @@
+"""Benchmark for the 15×15 renderer.
+
+Plays a few seeded games to different depths and times frame composition
+for every player view: the baseline that rebuilds the whole canvas per frame
+like the renderer did before the base-layer and sprite caches, the primitive
+reference painter on the cached base and cell sprites.  It also times all
+views of a snapshot through the shared public layer, the full render, a
+render cache hit, each output format of the encoder and, when NumPy is
+installed, the vectorised backend on full frames and on the shared layer::
+
+    python -m game_board15.render_benchmark --frames 200
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import replace
+from typing import Callable, List, Sequence, Tuple
+
+from logic.layout_pool import layout_rng
+from logic.rng import seeded_rng
+
+from PIL import Image, ImageDraw
+
+from . import battle
+from .encode import FORMAT_PALETTE, FORMAT_PNG, FORMAT_WEBP, encode_frame
+from .models import Match15, Player, PLAYER_ORDER
+from .placement import generate_field
+from .render_cache import get_render_cache
+from .render import (
+    AXIS_FONT_SIZE,
+    BG_COLOR,
+    CELL_SIZE,
+    IMAGE_HEIGHT,
+    IMAGE_WIDTH,
+    MARGIN_LEFT,
+    MARGIN_TOP,
+    FrameDelta,
+    RenderState,
+    _ViewPainter,
+    _cell_look,
+    _cell_recipe,
+    _draw_axes,
+    _draw_grid,
+    _draw_last_move,
+    _load_font,
+    _paint_cell,
+    clear_frame_cache,
+    compose_board,
+    render_board,
+    render_frame,
+)
+
+Scenario = Tuple[RenderState, str]
+
+DEFAULT_DEPTHS = (0, 20, 60, 120, 180)
+
+
+def build_scenarios(seed: int = 0, depths: Sequence[int] = DEFAULT_DEPTHS) -> List[Scenario]:
+    """Return ``(state, player_key)`` pairs for games played ``depths`` shots deep."""
+
+    scenarios: List[Scenario] = []
+    for idx, depth in enumerate(depths):
+        game_seed = seed * 1000 + idx
+        match = Match15(match_id=f"bench-{game_seed}", seed=game_seed)
+        match.field, fleets = generate_field(layout_rng(game_seed))
+        match.field.ships = fleets
+        match.status = "playing"
+        for key in PLAYER_ORDER:
+            match.players[key] = Player(user_id=0, chat_id=0, name=key)
+        cells = [(r, c) for r in range(15) for c in range(15)]
+        seeded_rng(game_seed, "bench").shuffle(cells)
+        for coord in cells[:depth]:
+            if match.status != "playing":
+                break
+            shooter = match.turn
+            r, c = coord
+            if match.field.grid[r][c] not in (0, 1) or match.field.owners[r][c] == shooter:
+                continue
+            battle.apply_shot(match, shooter, coord)
+            match.turn_idx = (match.turn_idx + 1) % len(match.order)
+        delta = FrameDelta(
+            key=match.match_id, base_version=None, version=(0, depth), cells=frozenset()
+        )
+        for key in PLAYER_ORDER:
+            state = RenderState(
+                field=match.field,
+                history=match.cell_history,
+                footer_label="",
+                reveal_ships=False,
+                last_move=match.field.last_move,
+                color_map=dict(match.color_map),
+                delta=delta,
+            )
+            scenarios.append((state, key))
+    return scenarios
+
+
+def compose_baseline(state: RenderState, player_key: str) -> Image.Image:
+    """Compose a frame without any of the renderer's caches.
+
+    Mirrors the renderer before the base-layer and sprite changes: a new
+    canvas, the axis font opened from disk, the axes, every cell painted from
+    primitives with its colours worked out again, and the grid on top.
+    """
+
+    _load_font.cache_clear()
+    image = Image.new("RGBA", (IMAGE_WIDTH, IMAGE_HEIGHT), BG_COLOR + (255,))
+    draw = ImageDraw.Draw(image)
+    _load_font(AXIS_FONT_SIZE)
+    _draw_axes(draw)
+    painter = _ViewPainter(state, player_key, sprites=False)
+    visible_own = 0
+    for r in range(15):
+        for c in range(15):
+            look = _cell_look(state.history[r][c], state.field.grid[r][c], state.field.owners[r][c])
+            if look is None:
+                continue
+            recipe, own_cells = _cell_recipe(
+                *look,
+                player_key,
+                state.reveal_ships,
+                painter.light_color,
+                painter.dark_color,
+            )
+            visible_own += own_cells
+            x0 = MARGIN_LEFT + c * CELL_SIZE
+            y0 = MARGIN_TOP + r * CELL_SIZE
+            _paint_cell(draw, (x0, y0, x0 + CELL_SIZE, y0 + CELL_SIZE), recipe)
+    _draw_grid(draw)
+    _draw_last_move(draw, state.last_move)
+    state.rendered_ship_cells = visible_own
+    return image
+
+
+def time_frames(
+    fn: Callable[[RenderState, str], object],
+    scenarios: Sequence[Scenario],
+    frames: int,
+) -> float:
+    """Return the mean milliseconds per frame over ``frames`` calls."""
+
+    for state, key in scenarios:
+        fn(state, key)
+    started = time.perf_counter()
+    for idx in range(frames):
+        state, key = scenarios[idx % len(scenarios)]
+        fn(state, key)
+    return (time.perf_counter() - started) * 1000 / max(frames, 1)
+
+
+def time_views(scenarios: Sequence[Scenario], rounds: int, backend: str = "pil") -> float:
+    """Return the mean milliseconds to compose all views of one snapshot.
+
+    Every round moves the scenarios to a new snapshot version, so each
+    measurement draws the shared public layer once and overlays every view.
+    """
+
+    snapshots: dict = {}
+    for state, key in scenarios:
+        snapshots.setdefault(state.delta.key, []).append((state, key))
+    started = time.perf_counter()
+    for round_idx in range(rounds):
+        for views in snapshots.values():
+            for state, key in views:
+                state.delta = replace(state.delta, version=(round_idx + 1, 0))
+                render_frame(state, key, backend=backend)
+    clear_frame_cache()
+    return (time.perf_counter() - started) * 1000 / max(rounds * len(snapshots), 1)
+
+
+def run(frames: int = 200, seed: int = 0) -> dict:
+    scenarios = build_scenarios(seed)
+    baseline = time_frames(compose_baseline, scenarios, frames)
+    primitives = time_frames(
+        lambda state, key: compose_board(state, key, sprites=False), scenarios, frames
+    )
+    sprites = time_frames(compose_board, scenarios, frames)
+    views = time_views(scenarios, max(frames // len(scenarios), 1))
+    cache = get_render_cache()
+
+    def render_uncached(state: RenderState, key: str) -> object:
+        cache.clear()
+        return render_board(state, key)
+
+    full = time_frames(render_uncached, scenarios, max(frames // 10, 1))
+    cached = time_frames(render_board, scenarios, frames)
+    results = {
+        "compose_baseline_ms": baseline,
+        "compose_primitives_ms": primitives,
+        "compose_sprites_ms": sprites,
+        "speedup": baseline / sprites if sprites else float("inf"),
+        "speedup_vs_primitives": primitives / sprites if sprites else float("inf"),
+        "compose_all_views_ms": views,
+        "render_encoded_ms": full,
+        "render_cached_ms": cached,
+    }
+    frames_to_encode = [compose_board(state, key) for state, key in scenarios]
+    for fmt in (FORMAT_PNG, FORMAT_PALETTE, FORMAT_WEBP):
+        started = time.perf_counter()
+        sizes = [len(encode_frame(image, fmt).getvalue()) for image in frames_to_encode]
+        elapsed = time.perf_counter() - started
+        results[f"encode_{fmt}_ms"] = elapsed * 1000 / len(sizes)
+        results[f"encode_{fmt}_kb"] = sum(sizes) / len(sizes) / 1024
+    try:
+        from .render_numpy import compose_board_numpy
+    except ImportError:
+        return results
+    results["compose_numpy_ms"] = time_frames(compose_board_numpy, scenarios, frames)
+    results["compose_all_views_numpy_ms"] = time_views(
+        scenarios, max(frames // len(scenarios), 1), backend="numpy"
+    )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the 15×15 board renderer.")
+    parser.add_argument("--frames", type=int, default=200, help="frames per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the benchmark games")
+    args = parser.parse_args(argv)
+    for name, value in run(args.frames, args.seed).items():
+        print(f"{name:>24}: {value:.3f}")
+
+
+if __name__ == "__main__":
+    main()
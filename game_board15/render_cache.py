@@ -0,0 +1,153 @@
+"""Content-addressed cache of encoded 15×15 frames.
+
+The same view is often rendered again without any change: eliminations and
+final summaries re-send the last snapshot, ``/board15`` shows an unchanged
+board and failed sends are retried.  Frames are cached by a digest of
+everything their pixels depend on — field, history, last move, viewer,
+reveal flag and colour map — and the encoded bytes are kept in an LRU that
+is bounded by their total size (``BOARD15_RENDER_CACHE_BYTES``, ``0``
+disables it).  Hit ratio and memory are available from
+:func:`render_cache_stats` and logged periodically.  With a process pool
+every worker keeps its own cache.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Optional
+
+from app.config import BOARD15_RENDER_CACHE_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Hit ratio and memory are logged after this many lookups.
+STATS_LOG_INTERVAL = 500
+
+
+def view_digest(state, player_key: str, *, salt: str = "") -> str:
+    """Return the cache key of the view of ``player_key`` on ``state``.
+
+    ``salt`` carries output settings (e.g. the image format) that change the
+    bytes without changing the board.
+    """
+
+    payload = repr(
+        (
+            state.field.grid,
+            state.field.owners,
+            state.history,
+            state.last_move,
+            bool(state.reveal_ships),
+            sorted((state.color_map or {}).items()),
+            player_key,
+            salt,
+        )
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedFrame:
+    data: bytes
+    name: str
+    visible_own: int
+
+    def buffer(self) -> BytesIO:
+        buffer = BytesIO(self.data)
+        buffer.name = self.name
+        return buffer
+
+
+class RenderCache:
+    """LRU of encoded frames evicted by total size in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self._entries: "OrderedDict[str, CachedFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[CachedFrame]:
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            lookups = self.hits + self.misses
+        if lookups % STATS_LOG_INTERVAL == 0:
+            stats = self.stats()
+            logger.info(
+                "RENDER_CACHE | hit_ratio=%.2f entries=%s bytes=%s/%s evictions=%s",
+                stats["hit_ratio"],
+                stats["entries"],
+                stats["bytes"],
+                stats["max_bytes"],
+                stats["evictions"],
+            )
+        return frame
+
+    def put(self, key: str, frame: CachedFrame) -> None:
+        size = len(frame.data)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old.data)
+            self._entries[key] = frame
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _key, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted.data)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = RenderCache(BOARD15_RENDER_CACHE_BYTES)
+
+
+def get_render_cache() -> RenderCache:
+    return _cache
+
+
+def render_cache_stats() -> Dict[str, float]:
+    return _cache.stats()
+
+
+__all__ = [
+    "CachedFrame",
+    "RenderCache",
+    "get_render_cache",
+    "render_cache_stats",
+    "view_digest",
+]
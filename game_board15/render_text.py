@@ -0,0 +1,89 @@
+"""Monospaced text rendering of the 15×15 board.
+
+A cheap alternative to the PNG frame: players can choose it, and the
+router falls back to it when a frame cannot be rendered or uploaded.  The
+symbols are those of the 10×10 text boards.  Colours are not available, so
+every cell of an opponent carries the opponent's key in lower case next to
+its symbol; own cells carry no marker.
+"""
+from __future__ import annotations
+
+from html import escape
+from typing import Dict, Iterable, Optional, Tuple
+
+from logic.render import (
+    EMPTY_SYMBOL,
+    HIT_SYMBOL,
+    LAST_MOVE_HIT_SYMBOL,
+    LAST_MOVE_MISS_SYMBOL,
+    LAST_MOVE_SUNK_SYMBOL,
+    MISS_SYMBOL,
+    SHIP_SYMBOL,
+    SUNK_SYMBOL,
+)
+
+from .parser import COLS
+from .render import LookKey, RenderState, _cell_look, _visible_own
+
+HEADER_LINE = "   " + " ".join(COLS)
+
+
+def _cell_text(look: LookKey, player_key: str, reveal_ships: bool) -> str:
+    """Return the two characters of a cell: its symbol and owner marker."""
+
+    state_value, field_state, fresh, owner, field_owner = look
+    if state_value == 4 or field_state == 4:
+        symbol = LAST_MOVE_SUNK_SYMBOL if fresh and state_value == 4 else SUNK_SYMBOL
+        owner = owner or player_key
+    elif state_value == 3 or field_state == 3:
+        symbol = LAST_MOVE_HIT_SYMBOL if fresh and state_value == 3 else HIT_SYMBOL
+        owner = owner or player_key
+    elif state_value in (2, 5) or field_state in (2, 5):
+        symbol = LAST_MOVE_MISS_SYMBOL if fresh and state_value == 2 else MISS_SYMBOL
+        owner = None
+    elif field_state == 1 and field_owner == player_key:
+        symbol = SHIP_SYMBOL
+        owner = player_key
+    elif field_state == 1 and reveal_ships and owner:
+        symbol = SHIP_SYMBOL
+    else:
+        return EMPTY_SYMBOL + " "
+    marker = owner.lower() if owner and owner != player_key else " "
+    return symbol + marker
+
+
+def render_board_text(state: RenderState, player_key: str) -> str:
+    """Return the view of ``player_key`` as an HTML ``<pre>`` block."""
+
+    cells: Dict[LookKey, str] = {}
+    visible_own = 0
+    lines = [HEADER_LINE]
+    for r in range(15):
+        history_row = state.history[r]
+        grid_row = state.field.grid[r]
+        owners_row = state.field.owners[r]
+        row = []
+        for c in range(15):
+            look = _cell_look(history_row[c], grid_row[c], owners_row[c])
+            if look is None:
+                row.append(EMPTY_SYMBOL + " ")
+                continue
+            text = cells.get(look)
+            if text is None:
+                text = cells[look] = _cell_text(look, player_key, state.reveal_ships)
+            visible_own += _visible_own(look[0], look[1], look[3], look[4], player_key)
+            row.append(text)
+        lines.append(f"{r + 1:>2} " + "".join(row).rstrip())
+    state.rendered_ship_cells = visible_own
+    return "<pre>" + "\n".join(lines) + "</pre>"
+
+
+def legend(labels: Iterable[Tuple[str, Optional[str]]]) -> str:
+    """Return the marker legend for ``(player_key, label)`` pairs of opponents."""
+
+    return ", ".join(
+        f"{key.lower()} — {escape(label or key)}" for key, label in labels
+    )
+
+
+__all__ = ["legend", "render_board_text"]
@@ -3,12 +3,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import random
-from typing import Dict, List, Optional, Set, Tuple
+import time
+from html import escape
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
-from telegram import Update
+from telegram import InputFile, InputMediaPhoto, Update
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
+from app.config import (
+    BOARD15_BOARD_FORMAT,
+    BOARD15_EDIT_IN_PLACE,
+    BOARD15_EDIT_MAX_AGE,
+    BOARD15_FANOUT_CONCURRENCY,
+)
+from app.file_ids import send_cached_photo
+from logic.rng import joke_start, match_rng
 from logic.phrases import (
     ENEMY_HIT,
     ENEMY_KILL,
@@ -43,11 +53,24 @@ from .models import (
 )
 from .parser import ParseError, format_coord, parse_coord
 from . import parser as parser_module
-from .render import RenderState, render_board
+from .compute import cancel_match as cancel_compute_jobs
+from .compute import run_compute
+from .render import (
+    FrameDelta,
+    RenderState,
+    count_visible_own_cells,
+    render_board,
+    render_board_job,
+)
+from .render_text import legend, render_board_text
 
 logger = logging.getLogger(__name__)
 
 CHAT_PREFIXES = ("@", "!")
+BOARD_FORMAT_IMAGE = "image"
+BOARD_FORMAT_TEXT = "text"
+# Words a player sends to choose how their board is delivered.
+BOARD_FORMAT_WORDS = {"текст": BOARD_FORMAT_TEXT, "картинка": BOARD_FORMAT_IMAGE}
 STATE_KEY = "board15_state"
 parser = parser_module
 
@@ -198,31 +221,66 @@ def _record_eliminations(match, eliminated: List[str]) -> List[str]:
     return order
 
 
-async def _broadcast_elimination(
+def _elimination_text(match, player_key: str) -> str:
+    label = _player_label(match, player_key)
+    return f"⛔ Игрок {label} выбыл (флот уничтожен)"
+
+
+async def _deliver_states(
     context: ContextTypes.DEFAULT_TYPE,
     match,
-    player_key: str,
+    messages: Dict[str, List[str]],
     *,
     snapshot: "Snapshot15" | None = None,
+    eliminated: Sequence[str] = (),
+    strict: Optional[str] = None,
 ) -> None:
-    label = _player_label(match, player_key)
-    text = f"⛔ Игрок {label} выбыл (флот уничтожен)"
-    for other_key, player in _iter_real_players(match):
-        try:
-            await _send_state(
-                context,
-                match,
-                other_key,
-                text,
-                snapshot=snapshot,
-            )
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            logger.exception(
-                "Failed to send elimination notice for player %s",
-                player_key,
-            )
+    """Send the states of a move to all players concurrently.
+
+    Every player gets ``messages[player]`` followed by a notice for each
+    ``eliminated`` player, in that order.  Sends are grouped by chat: players
+    sharing a chat are served one after another so their messages do not
+    interleave, while up to ``BOARD15_FANOUT_CONCURRENCY`` chats are served
+    at the same time, so the last recipient does not wait for everyone
+    else's render and upload.  Failures are logged, except that the first
+    failure for ``strict`` is raised once all deliveries finished.
+    """
+
+    queues: Dict[str, List[str]] = {
+        key: list(messages.get(key) or ()) for key, _player in _iter_real_players(match)
+    }
+    for key in messages:
+        if key not in queues and messages[key]:
+            queues[key] = list(messages[key])
+    notices = [_elimination_text(match, key) for key in eliminated]
+    for key, _player in _iter_real_players(match):
+        queues[key].extend(notices)
+
+    chats: Dict[object, List[Tuple[str, str]]] = {}
+    for key, texts in queues.items():
+        player = match.players.get(key)
+        chat = player.chat_id if player is not None else ("player", key)
+        chats.setdefault(chat, []).extend((key, text) for text in texts)
+
+    semaphore = asyncio.Semaphore(BOARD15_FANOUT_CONCURRENCY)
+    failures: Dict[str, Exception] = {}
+
+    async def deliver(sends: List[Tuple[str, str]]) -> None:
+        async with semaphore:
+            for player_key, text in sends:
+                try:
+                    await _send_state(context, match, player_key, text, snapshot=snapshot)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    if player_key == strict and player_key not in failures:
+                        failures[player_key] = exc
+                        continue
+                    logger.exception("Failed to notify player %s", player_key)
+
+    await asyncio.gather(*(deliver(sends) for sends in chats.values() if sends))
+    if strict is not None and strict in failures:
+        raise failures[strict]
 
 
 def _final_ranking(match, winner: Optional[str], elimination_order: List[str]) -> List[str]:
@@ -279,11 +337,12 @@ def _phrase_or_joke(match, player_key: str, phrases: List[str]) -> str:
     shots = match.shots.setdefault(player_key, {})
     start = shots.get("joke_start")
     if start is None:
-        start = shots["joke_start"] = random.randint(1, 10)
+        start = shots["joke_start"] = joke_start(match, player_key)
     count = shots.get("move_count", 0)
+    rng = match_rng(match, "phrase", player_key, count)
     if isinstance(start, int) and count >= start and (count - start) % 10 == 0:
-        return f"Слушай анекдот по этому поводу:\n{random_joke()}"
-    return random_phrase(phrases)
+        return f"Слушай анекдот по этому поводу:\n{random_joke(rng)}"
+    return random_phrase(phrases, rng)
 
 
 def _compose_move_message(
@@ -312,6 +371,64 @@ def _format_next_turn_line(
     return f"Следующим ходит {label}."
 
 
+class _BoardMessageGone(Exception):
+    """The board message can no longer be edited."""
+
+
+def _board_media(photo, caption: str, filename: str) -> InputMediaPhoto:
+    if isinstance(photo, InputFile):
+        photo = photo.input_file_content
+    return InputMediaPhoto(media=photo, caption=caption or None, filename=filename)
+
+
+async def _edit_board_photo(
+    context: ContextTypes.DEFAULT_TYPE,
+    chat_id: int,
+    msgs: Dict[str, object],
+    data: bytes,
+    filename: str,
+    caption: str,
+) -> bool:
+    """Replace the photo of the last board message, returning ``False`` if it cannot.
+
+    Messages older than ``BOARD15_EDIT_MAX_AGE`` seconds are not edited.
+    """
+
+    board_id = msgs.get("board")
+    sent_at = msgs.get("board_sent_at")
+    if not board_id or not isinstance(sent_at, (int, float)):
+        return False
+    if time.time() - sent_at > BOARD15_EDIT_MAX_AGE:
+        return False
+
+    async def edit(photo):
+        try:
+            return await context.bot.edit_message_media(
+                chat_id=chat_id,
+                message_id=board_id,
+                media=_board_media(photo, caption, filename),
+            )
+        except BadRequest as exc:
+            reason = str(exc).lower()
+            if "not modified" in reason:
+                return None
+            # Errors about the message itself must not evict the file_id.
+            if "message" in reason and "file" not in reason:
+                raise _BoardMessageGone(str(exc)) from exc
+            raise
+
+    try:
+        await send_cached_photo(edit, data, filename=filename)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        logger.info(
+            "BOARD15_EDIT_FALLBACK | chat=%s message=%s reason=%s", chat_id, board_id, exc
+        )
+        return False
+    return True
+
+
 async def _send_state(
     context: ContextTypes.DEFAULT_TYPE,
     match,
@@ -331,6 +448,7 @@ async def _send_state(
         elif hasattr(match, "create_snapshot"):
             snapshot = match.create_snapshot()
     previous_snapshot = None
+    snapshot_idx: int | None = None
     snapshots = getattr(match, "snapshots", [])
     if snapshot is not None and snapshots:
         try:
@@ -339,6 +457,7 @@ async def _send_state(
             if len(snapshots) >= 2:
                 previous_snapshot = snapshots[-2]
         else:
+            snapshot_idx = idx
             if idx > 0:
                 previous_snapshot = snapshots[idx - 1]
     elif len(snapshots) >= 2:
@@ -350,11 +469,14 @@ async def _send_state(
     else:
         history_grid = _ensure_history(match)
         last_move = getattr(field, "last_move", None)
+    frame_cells: Set[Tuple[int, int]] | None = None
     if previous_snapshot is not None and snapshot is not None:
         expected_changes = set(getattr(match, "_last_expected_changes", set()))
         changed_cells = storage.snapshot_changed_cells(previous_snapshot, snapshot)
+        fresh_before = storage.snapshot_fresh_cells(previous_snapshot)
         allowed_cells = set(expected_changes)
-        allowed_cells.update(storage.snapshot_fresh_cells(previous_snapshot))
+        allowed_cells.update(fresh_before)
+        frame_cells = changed_cells | fresh_before
         unexpected = changed_cells - allowed_cells
         if unexpected:
             logger.critical(
@@ -374,7 +496,10 @@ async def _send_state(
         reveal_ships = bool(flags.get("board15_reveal_ships"))
     state_store = context.bot_data.setdefault(STATE_KEY, {})
     match_id = getattr(match, "match_id", "unknown")
-    footer = f"match={match_id} • player={player_key} • sh_disp=20"
+    # The guard is derived from the data model, so a bad view is rejected
+    # before rendering and a good one is rendered exactly once.
+    expected_visible = count_visible_own_cells(field, history_grid, player_key)
+    footer = f"match={match_id} • player={player_key} • sh_disp={expected_visible}"
     color_map: Dict[str, str] = {key: key for key in PLAYER_ORDER}
     match_map = getattr(match, "color_map", None)
     if isinstance(match_map, dict):
@@ -393,6 +518,20 @@ async def _send_state(
             if player_color:
                 color_map[key] = player_color
 
+    delta: FrameDelta | None = None
+    if snapshot_idx is not None and snapshot is not None:
+        # All views of a snapshot share one public layer, patched from the
+        # previous snapshot: only changed cells and cells whose "fresh"
+        # marker decays need to be repainted.
+        base_version = None
+        if snapshot_idx > 0 and previous_snapshot is not None and frame_cells is not None:
+            base_version = (snapshot_idx - 1, len(previous_snapshot.shot_history))
+        delta = FrameDelta(
+            key=str(match_id),
+            base_version=base_version,
+            version=(snapshot_idx, len(snapshot.shot_history)),
+            cells=frozenset(frame_cells or ()),
+        )
     render_state = RenderState(
         field=field,
         history=history_grid,
@@ -400,58 +539,136 @@ async def _send_state(
         reveal_ships=reveal_ships,
         last_move=last_move,
         color_map=color_map,
+        delta=delta,
     )
-    buffer = render_board(render_state, player_key)
-    visible = render_state.rendered_ship_cells
-    if visible != 20:
-        retry_footer = f"{footer} • retry sh_disp={visible}"
-        retry_state = render_state.clone_for_retry(attempt=2, footer_label=retry_footer)
-        buffer_retry = render_board(retry_state, player_key)
-        second_visible = retry_state.rendered_ship_cells
-        if second_visible != visible:
-            logger.critical(
-                "RENDER_GUARD_FAIL_OWN20 | match=%s player=%s first=%s second=%s",
-                match.match_id,
-                player_key,
-                visible,
-                second_visible,
-            )
-            state_store[chat_id] = retry_state
-            return
-        if second_visible != 20:
-            logger.critical(
-                "RENDER_GUARD_PERSISTENT_OWN20 | match=%s player=%s value=%s",
-                match.match_id,
-                player_key,
-                second_visible,
-            )
-            state_store[chat_id] = retry_state
-            return
-        buffer = buffer_retry
-        render_state = retry_state
+    render_state.rendered_ship_cells = expected_visible
+    if expected_visible != 20:
+        logger.critical(
+            "RENDER_GUARD_PERSISTENT_OWN20 | match=%s player=%s value=%s",
+            match.match_id,
+            player_key,
+            expected_visible,
+        )
+        state_store[chat_id] = render_state
+        return
     caption = (message or "").replace("\r\n", "\n")
     caption_lines = caption.split("\n")
     while caption_lines and not caption_lines[0].strip():
         caption_lines.pop(0)
     caption = "\n".join(caption_lines).rstrip()
-    try:
-        sent = await context.bot.send_photo(
+    msgs = match.messages.setdefault(player_key, {})
+    buffer = None
+    if msgs.get("board_format", BOARD15_BOARD_FORMAT) != BOARD_FORMAT_TEXT:
+        try:
+            buffer, visible = await run_compute(
+                render_board_job, render_board, render_state, player_key
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(
+                "BOARD15_TEXT_FALLBACK | render failed | match=%s player=%s",
+                match_id,
+                player_key,
+            )
+        else:
+            render_state.rendered_ship_cells = visible
+            if visible != expected_visible:
+                logger.critical(
+                    "RENDER_GUARD_FAIL_OWN20 | match=%s player=%s expected=%s rendered=%s",
+                    match.match_id,
+                    player_key,
+                    expected_visible,
+                    visible,
+                )
+                state_store[chat_id] = render_state
+                return
+    if buffer is not None:
+        edit_in_place = BOARD15_EDIT_IN_PLACE
+        if isinstance(flags, dict) and "board15_edit_in_place" in flags:
+            edit_in_place = bool(flags["board15_edit_in_place"])
+        try:
+            await _send_board_photo(context, chat_id, msgs, buffer, caption, edit_in_place)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(
+                "BOARD15_TEXT_FALLBACK | upload failed | match=%s player=%s",
+                match_id,
+                player_key,
+            )
+            buffer = None
+    if buffer is None:
+        try:
+            await _send_board_text(context, match, player_key, render_state, caption)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Failed to send state to player %s", player_key)
+            raise
+    state_store[chat_id] = render_state
+    if caption:
+        msgs.setdefault("text_history", []).append(caption)
+
+
+async def _send_board_photo(
+    context: ContextTypes.DEFAULT_TYPE,
+    chat_id: int,
+    msgs: Dict[str, object],
+    buffer,
+    caption: str,
+    edit_in_place: bool,
+) -> None:
+    data = buffer.getvalue()
+    filename = getattr(buffer, "name", "board.png")
+    if edit_in_place and await _edit_board_photo(
+        context, chat_id, msgs, data, filename, caption
+    ):
+        return
+    sent = await send_cached_photo(
+        lambda photo: context.bot.send_photo(
             chat_id,
-            photo=buffer,
+            photo=photo,
             caption=caption or None,
-        )
-    except asyncio.CancelledError:
-        raise
-    except Exception:
-        logger.exception("Failed to send state to player %s", player_key)
-        raise
-    state_store[chat_id] = render_state
-    msgs = match.messages.setdefault(player_key, {})
+        ),
+        data,
+        filename=filename,
+    )
     board_hist = msgs.setdefault("board_history", [])
     board_hist.append(getattr(sent, "message_id", None))
     msgs["board"] = getattr(sent, "message_id", None)
+    msgs["board_sent_at"] = time.time()
+
+
+async def _send_board_text(
+    context: ContextTypes.DEFAULT_TYPE,
+    match,
+    player_key: str,
+    render_state: RenderState,
+    caption: str,
+) -> None:
+    """Send the board of ``player_key`` as a text message."""
+
+    parts = [render_board_text(render_state, player_key)]
+    opponents = [
+        (key, _player_label(match, key))
+        for key in getattr(match, "players", {})
+        if key != player_key
+    ]
+    if opponents:
+        parts.append(legend(opponents))
     if caption:
-        msgs.setdefault("text_history", []).append(caption)
+        parts.append(escape(caption))
+    msgs = match.messages.setdefault(player_key, {})
+    sent = await context.bot.send_message(
+        match.players[player_key].chat_id,
+        "\n".join(parts),
+        parse_mode="HTML",
+    )
+    msgs.setdefault("board_history", []).append(getattr(sent, "message_id", None))
+    msgs["board"] = getattr(sent, "message_id", None)
+    # A text message cannot be edited into a photo.
+    msgs.pop("board_sent_at", None)
 
 
 def _update_history(match, shooter: str, result: ShotResult) -> bool:
@@ -564,6 +781,16 @@ async def router_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         return
 
 
+    board_format = BOARD_FORMAT_WORDS.get(text.lower())
+    if board_format is not None:
+        match.messages.setdefault(player_key, {})["board_format"] = board_format
+        storage.save_match(match)
+        if board_format == BOARD_FORMAT_TEXT:
+            await message.reply_text("Поле будет приходить текстом.")
+        else:
+            await message.reply_text("Поле будет приходить картинкой.")
+        return
+
     try:
         coord = parse_coord(text)
     except ParseError as exc:
@@ -593,7 +820,7 @@ async def router_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     for key in player_keys:
         entry = match.shots.setdefault(key, {})
         entry.setdefault("move_count", 0)
-        entry.setdefault("joke_start", random.randint(1, 10))
+        entry.setdefault("joke_start", joke_start(match, key))
 
     for key in player_keys:
         entry = match.shots.setdefault(key, {})
@@ -617,6 +844,11 @@ async def router_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         expected_changes=expected_cells,
     )
 
+    if not outcome.finished:
+        from . import handlers as handlers_module
+
+        handlers_module.speculate_bot_move(match)
+
     next_line_default = _format_next_turn_line(
         match, outcome.next_turn, finished=outcome.finished
     )
@@ -739,39 +971,19 @@ async def router_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                 next_line_default,
             )
 
-    await _send_state(
+    messages = {player_key: [message_self]}
+    for other_key, _player in _iter_real_players(match):
+        if other_key != player_key and enemy_messages.get(other_key):
+            messages[other_key] = [enemy_messages[other_key]]
+    await _deliver_states(
         context,
         match,
-        player_key,
-        message_self,
+        messages,
         snapshot=snapshot,
+        eliminated=outcome.eliminated,
+        strict=player_key,
     )
 
-    for other_key, _player in _iter_real_players(match):
-        if other_key == player_key:
-            continue
-        message_enemy = enemy_messages.get(other_key)
-        if not message_enemy:
-            continue
-        try:
-            await _send_state(
-                context,
-                match,
-                other_key,
-                message_enemy,
-                snapshot=snapshot,
-            )
-        except Exception:
-            logger.exception("Failed to notify player %s", other_key)
-
-    for eliminated_key in outcome.eliminated:
-        await _broadcast_elimination(
-            context,
-            match,
-            eliminated_key,
-            snapshot=snapshot,
-        )
-
     if (
         match.status == "playing"
         and not outcome.finished
@@ -802,7 +1014,13 @@ async def router_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                 getattr(match, "match_id", "?"),
             )
 
+    if not outcome.finished:
+        from . import handlers as handlers_module
+
+        handlers_module.notify_turn_change(getattr(match, "match_id", None))
+
     if outcome.finished:
+        cancel_compute_jobs(getattr(match, "match_id", None))
         ranking = _final_ranking(match, outcome.winner, elimination_order)
         await _send_final_summaries(context, match, ranking, outcome.winner)
 
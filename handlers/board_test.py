@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-import random
 import logging
 from telegram import Update
 from telegram.ext import ContextTypes
 
 import storage
 from models import Player
-from logic import placement, parser
+from logic import placement, parser, targeting
+from logic.rng import joke_start, match_rng
 from logic import battle_test as battle
 from logic.battle import apply_shot, MISS, HIT, KILL, REPEAT
 from logic.phrases import (
@@ -28,39 +28,114 @@ def _cell_state(cell):
     return cell[0] if isinstance(cell, (list, tuple)) else cell
 
 
+def _board_view(board) -> targeting.BoardView:
+    """View of an opponent board for the two-player bot."""
+    return targeting.BoardView(
+        len(board.grid),
+        lambda coord: _cell_state(board.grid[coord[0]][coord[1]]),
+        lambda coord: False,
+    )
+
+
+def _history_view(match, shooter: str) -> targeting.BoardView:
+    """View of the shared three-player history from ``shooter``'s side."""
+    own = match.boards[shooter].grid
+    return targeting.BoardView(
+        len(match.history),
+        lambda coord: _cell_state(match.history[coord[0]][coord[1]]),
+        lambda coord: _cell_state(own[coord[0]][coord[1]]) in (1, 3, 4),
+    )
+
+
 def _has_diagonal_wounded(board, coord):
-    r, c = coord
-    size = len(board.grid)
-    for dr in (-1, 1):
-        for dc in (-1, 1):
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < size and 0 <= nc < len(board.grid[nr]):
-                if _cell_state(board.grid[nr][nc]) == 3:
-                    return True
-    return False
+    return targeting.has_diagonal_wounded(_board_view(board), coord)
 
 
 def _available_bot_targets(board):
-    targets = []
-    for r, row in enumerate(board.grid):
-        for c, cell in enumerate(row):
-            if _cell_state(cell) in (2, 3, 4, 5):
-                continue
-            if _has_diagonal_wounded(board, (r, c)):
-                continue
-            targets.append((r, c))
-    return targets
+    view = _board_view(board)
+    return [
+        (r, c)
+        for r in range(view.size)
+        for c in range(view.size)
+        if targeting.is_available(view, (r, c))
+    ]
+
+
+def _remaining_fleet(boards) -> list[int]:
+    return sorted(
+        (len(ship.cells) for board in boards for ship in board.ships if ship.alive),
+        reverse=True,
+    )
+
+
+# Target pools of the bot players keyed by (match_id, shooter).  The auto-play
+# loops reload the match from storage before every move, so a pool stored on
+# the match object would be lost and rebuilt from a full board scan each time.
+_target_pools: dict[tuple[str, str], targeting.TargetPool] = {}
+
+
+def _bot_pool(match, shooter: str, view: targeting.BoardView) -> targeting.TargetPool:
+    key = (match.match_id, shooter)
+    pool = _target_pools.get(key)
+    if pool is None:
+        pool = _target_pools[key] = targeting.TargetPool(view)
+    else:
+        # The view reads the freshly loaded match.
+        pool.view = view
+    return pool
+
+
+def _drop_bot_pools(match_id: str) -> None:
+    for key in [key for key in _target_pools if key[0] == match_id]:
+        del _target_pools[key]
+
+
+def _choose_bot_coord(match, shooter: str, view: targeting.BoardView, fleet: list[int]):
+    entry = match.shots.setdefault(shooter, {})
+    rng = match_rng(match, "bot", shooter, entry.get("move_count", 0))
+    return targeting.choose_target(
+        view,
+        entry,
+        rng,
+        pool=_bot_pool(match, shooter, view),
+        strategy=targeting.HUNT_DENSITY,
+        fleet=fleet,
+    )
+
+
+def _record_bot_shot(match, shooter: str, view, coord, result: str, owner, touched) -> None:
+    entry = match.shots.setdefault(shooter, {})
+    targeting.record_result(view, entry, coord, result, owner)
+    _bot_pool(match, shooter, view).record_shot([coord, *touched])
+
+
+def note_history_shot(match, shooter: str, touched) -> None:
+    """Patch the pools of the other players after a shot at the shared history.
+
+    In the three-player test every shot changes the board all bots aim at,
+    human shots included.
+    """
+
+    match_id = getattr(match, "match_id", None)
+    for key in match.players:
+        if key == shooter:
+            continue
+        pool = _target_pools.get((match_id, key))
+        if pool is not None:
+            pool.view = _history_view(match, key)
+            pool.record_shot(touched)
 
 
 def _phrase_or_joke(match, player_key: str, phrases: list[str]) -> str:
     shots = match.shots[player_key]
     start = shots.get("joke_start")
     if start is None:
-        start = shots["joke_start"] = random.randint(1, 10)
+        start = shots["joke_start"] = joke_start(match, player_key)
     count = shots.get("move_count", 0)
+    rng = match_rng(match, "phrase", player_key, count)
     if count >= start and (count - start) % 10 == 0:
-        return f"Слушай анекдот по этому поводу:\n{random_joke()}"
-    return random_phrase(phrases)
+        return f"Слушай анекдот по этому поводу:\n{random_joke(rng)}"
+    return random_phrase(phrases, rng)
 
 
 def _compose_move_message(
@@ -109,205 +184,220 @@ async def _auto_play_bots(
         except Exception:
             logger.exception("Failed to send message to chat %s", chat_id_)
 
-    coords = [(r, c) for r in range(10) for c in range(10)]
     order = ["A", "B", "C"]
 
-    while True:
-        refreshed = storage.get_match(match.match_id)
-        if refreshed is not None:
-            match = refreshed
-        alive = [k for k, b in match.boards.items() if b.alive_cells > 0 and k in match.players]
-        if len(alive) == 1:
-            winner = alive[0]
-            winner_label = getattr(match.players[winner], 'name', '') or winner
-            storage.finish(match, winner)
-            for k, p in match.players.items():
-                if p.user_id != 0:
-                    if k == winner:
-                        msg = "Вы победили!🏆"
-                    else:
-                        msg = f"Игрок {winner_label} победил!"
-                    await _safe_send_message(p.chat_id, msg)
-            break
-
-        if match.turn == human:
-            await asyncio.sleep(0.5)
-            continue
-
-        if delay:
-            await asyncio.sleep(delay)
-
-        current = match.turn
-        coord = None
-        for pt in coords:
-            r, c = pt
-            if match.history[r][c] == 0 and _cell_state(match.boards[current].grid[r][c]) != 1:
-                coord = pt
-                break
-        if coord is None:
-            break
-
-        enemies = [k for k in alive if k != current]
-        for b in match.boards.values():
-            b.highlight = []
-        enemy_boards = {k: match.boards[k] for k in enemies}
-        results = battle.apply_shot_multi(coord, enemy_boards, match.history)
-        match.shots[current]["last_coord"] = coord
-        eliminated: list[str] = []
-        if any(res == battle.KILL for res in results.values()):
-            cells: list[tuple[int, int]] = []
-            for enemy, res in results.items():
-                if res == battle.KILL:
-                    cells.extend(match.boards[enemy].highlight)
-                    if match.boards[enemy].alive_cells == 0:
-                        eliminated.append(enemy)
-            match.last_highlight = cells.copy()
-            match.shots[current]["last_result"] = "kill"
-        elif any(res == battle.HIT for res in results.values()):
-            match.last_highlight = [coord]
-            match.shots[current]["last_result"] = "hit"
-        else:
-            match.last_highlight = [coord]
-            match.shots[current]["last_result"] = "miss"
-        for k in match.shots:
-            shots = match.shots[k]
-            shots.setdefault("move_count", 0)
-            shots.setdefault("joke_start", random.randint(1, 10))
-            shots["move_count"] += 1
-        coord_str = parser.format_coord(coord)
-        hit_any = any(
-            res in (battle.HIT, battle.KILL, battle.REPEAT)
-            for res in results.values()
-        )
-
-        if not hit_any:
-            alive_order = [k for k in order if k in alive]
-            idx_next = alive_order.index(current)
-            next_player = alive_order[(idx_next + 1) % len(alive_order)]
-        else:
-            next_player = current
-        match.turn = next_player
-
-        parts_self: list[str] = []
-        enemy_msgs: dict[str, tuple[int, str, str]] = {}
-        player_obj = match.players.get(current)
-        player_label = getattr(player_obj, "name", "") or current
-        for enemy, res in results.items():
-            enemy_obj = match.players.get(enemy)
-            enemy_label = getattr(enemy_obj, "name", "") or enemy
-            if res == battle.MISS:
-                phrase_enemy = _phrase_or_joke(match, enemy, ENEMY_MISS).strip()
-                enemy_msgs[enemy] = (
-                    res,
-                    f"Ход игрока {player_label}: {coord_str} - мимо.",
-                    phrase_enemy,
-                )
-            elif res == battle.REPEAT:
-                phrase_enemy = _phrase_or_joke(match, enemy, ENEMY_MISS).strip()
-                parts_self.append("клетка уже обстреляна.")
-                enemy_msgs[enemy] = (
-                    res,
-                    f"Ход игрока {player_label}: {coord_str} - клетка уже обстреляна.",
-                    phrase_enemy,
-                )
-            elif res == battle.HIT:
-                phrase_enemy = _phrase_or_joke(match, enemy, ENEMY_HIT).strip()
-                parts_self.append(f"корабль игрока {enemy_label} ранен.")
-                enemy_msgs[enemy] = (
-                    res,
-                    f"Ход игрока {player_label}: {coord_str} - ваш корабль ранен.",
-                    phrase_enemy,
-                )
-            elif res == battle.KILL:
-                phrase_enemy = _phrase_or_joke(match, enemy, ENEMY_KILL).strip()
-                parts_self.append(f"уничтожен корабль игрока {enemy_label}!")
-                enemy_msgs[enemy] = (
-                    res,
-                    f"Ход игрока {player_label}: {coord_str} - ваш корабль уничтожен.",
-                    phrase_enemy,
-                )
-
-        if any(res == battle.KILL for res in results.values()):
-            phrase_self = _phrase_or_joke(match, current, SELF_KILL).strip()
-        elif any(res == battle.HIT for res in results.values()):
-            phrase_self = _phrase_or_joke(match, current, SELF_HIT).strip()
-        elif any(res == battle.REPEAT for res in results.values()):
-            phrase_self = _phrase_or_joke(match, current, SELF_MISS).strip()
-        else:
-            phrase_self = _phrase_or_joke(match, current, SELF_MISS).strip()
-
-        next_obj = match.players.get(next_player)
-        next_name = getattr(next_obj, "name", "") or next_player
-        storage.save_match(match)
-        if enemy_msgs:
-            for enemy, (_, result_line_enemy, humor_enemy) in enemy_msgs.items():
-                if enemy == human:
-                    continue
-                if match.players[enemy].user_id != 0:
-                    message_enemy = _compose_move_message(
-                        result_line_enemy,
-                        humor_enemy,
-                        f"Следующим ходит {next_name}.",
-                    )
-                    await _safe_send_state(enemy, message_enemy)
-
-        human_entry = enemy_msgs.get(human)
-        player_is_bot = player_obj is None or player_obj.user_id == 0
-        if (
-            current != human
-            and human_entry is not None
-            and human_entry[0] in (battle.HIT, battle.KILL)
-            and match.players[human].user_id != 0
-        ):
-            _, result_line_human, humor_human = human_entry
-            message_human = _compose_move_message(
-                result_line_human,
-                humor_human,
-                f"Следующим ходит {next_name}.",
-            )
-            await _safe_send_state(human, message_human)
-        msg_body = " ".join(parts_self).strip() or "мимо"
-        body_self = msg_body.rstrip()
-        if not body_self.endswith((".", "!", "?")):
-            body_self += "."
-        result_line_self = f"Ваш ход: {coord_str} - {body_self}"
-        result_self = _compose_move_message(
-            result_line_self,
-            phrase_self,
-            f"Следующим ходит {next_name}.",
-        )
-        if match.players[current].user_id != 0:
-            await _safe_send_state(current, result_self)
-
-        finished = False
-        for enemy in eliminated:
-            enemy_label = getattr(match.players[enemy], 'name', '') or enemy
-            alive_players = [k for k, b in match.boards.items() if b.alive_cells > 0 and k in match.players]
-            if len(alive_players) == 1:
-                winner = alive_players[0]
+    match_id = match.match_id
+    try:
+        while True:
+            refreshed = storage.get_match(match.match_id)
+            if refreshed is not None:
+                match = refreshed
+            alive = [k for k, b in match.boards.items() if b.alive_cells > 0 and k in match.players]
+            if len(alive) == 1:
+                winner = alive[0]
                 winner_label = getattr(match.players[winner], 'name', '') or winner
                 storage.finish(match, winner)
                 for k, p in match.players.items():
                     if p.user_id != 0:
                         if k == winner:
-                            msg = (
-                                f"Флот игрока {enemy_label} потоплен! {enemy_label} занял 2 место. Вы победили!🏆"
-                            )
+                            msg = "Вы победили!🏆"
                         else:
-                            msg = (
-                                f"Флот игрока {enemy_label} потоплен! {enemy_label} занял 2 место. Игрок {winner_label} победил!"
-                            )
+                            msg = f"Игрок {winner_label} победил!"
                         await _safe_send_message(p.chat_id, msg)
-                finished = True
+                break
+
+            if match.turn == human:
+                await asyncio.sleep(0.5)
+                continue
+
+            if delay:
+                await asyncio.sleep(delay)
+
+            current = match.turn
+            enemies = [k for k in alive if k != current]
+            view = _history_view(match, current)
+            coord = _choose_bot_coord(
+                match, current, view, _remaining_fleet(match.boards[k] for k in enemies)
+            )
+            if coord is None:
+                break
+
+            for b in match.boards.values():
+                b.highlight = []
+            enemy_boards = {k: match.boards[k] for k in enemies}
+            results = battle.apply_shot_multi(coord, enemy_boards, match.history)
+            match.shots[current]["last_coord"] = coord
+            eliminated: list[str] = []
+            if any(res == battle.KILL for res in results.values()):
+                cells: list[tuple[int, int]] = []
+                for enemy, res in results.items():
+                    if res == battle.KILL:
+                        cells.extend(match.boards[enemy].highlight)
+                        if match.boards[enemy].alive_cells == 0:
+                            eliminated.append(enemy)
+                match.last_highlight = cells.copy()
+                match.shots[current]["last_result"] = "kill"
+            elif any(res == battle.HIT for res in results.values()):
+                match.last_highlight = [coord]
+                match.shots[current]["last_result"] = "hit"
             else:
-                for k, p in match.players.items():
-                    if p.user_id != 0:
-                        await _safe_send_message(
-                            p.chat_id,
-                            f"Флот игрока {enemy_label} потоплен! {enemy_label} выбывает.",
+                match.last_highlight = [coord]
+                match.shots[current]["last_result"] = "miss"
+            target_owner = next(
+                (k for k, res in results.items() if res in (battle.HIT, battle.KILL)),
+                None,
+            )
+            _record_bot_shot(
+                match,
+                current,
+                view,
+                coord,
+                match.shots[current]["last_result"],
+                target_owner,
+                match.last_highlight,
+            )
+            note_history_shot(match, current, [coord, *match.last_highlight])
+            for k in match.shots:
+                shots = match.shots[k]
+                shots.setdefault("move_count", 0)
+                shots.setdefault("joke_start", joke_start(match, k))
+                shots["move_count"] += 1
+            coord_str = parser.format_coord(coord)
+            hit_any = any(
+                res in (battle.HIT, battle.KILL, battle.REPEAT)
+                for res in results.values()
+            )
+
+            if not hit_any:
+                alive_order = [k for k in order if k in alive]
+                idx_next = alive_order.index(current)
+                next_player = alive_order[(idx_next + 1) % len(alive_order)]
+            else:
+                next_player = current
+            match.turn = next_player
+
+            parts_self: list[str] = []
+            enemy_msgs: dict[str, tuple[int, str, str]] = {}
+            player_obj = match.players.get(current)
+            player_label = getattr(player_obj, "name", "") or current
+            for enemy, res in results.items():
+                enemy_obj = match.players.get(enemy)
+                enemy_label = getattr(enemy_obj, "name", "") or enemy
+                if res == battle.MISS:
+                    phrase_enemy = _phrase_or_joke(match, enemy, ENEMY_MISS).strip()
+                    enemy_msgs[enemy] = (
+                        res,
+                        f"Ход игрока {player_label}: {coord_str} - мимо.",
+                        phrase_enemy,
+                    )
+                elif res == battle.REPEAT:
+                    phrase_enemy = _phrase_or_joke(match, enemy, ENEMY_MISS).strip()
+                    parts_self.append("клетка уже обстреляна.")
+                    enemy_msgs[enemy] = (
+                        res,
+                        f"Ход игрока {player_label}: {coord_str} - клетка уже обстреляна.",
+                        phrase_enemy,
+                    )
+                elif res == battle.HIT:
+                    phrase_enemy = _phrase_or_joke(match, enemy, ENEMY_HIT).strip()
+                    parts_self.append(f"корабль игрока {enemy_label} ранен.")
+                    enemy_msgs[enemy] = (
+                        res,
+                        f"Ход игрока {player_label}: {coord_str} - ваш корабль ранен.",
+                        phrase_enemy,
+                    )
+                elif res == battle.KILL:
+                    phrase_enemy = _phrase_or_joke(match, enemy, ENEMY_KILL).strip()
+                    parts_self.append(f"уничтожен корабль игрока {enemy_label}!")
+                    enemy_msgs[enemy] = (
+                        res,
+                        f"Ход игрока {player_label}: {coord_str} - ваш корабль уничтожен.",
+                        phrase_enemy,
+                    )
+
+            if any(res == battle.KILL for res in results.values()):
+                phrase_self = _phrase_or_joke(match, current, SELF_KILL).strip()
+            elif any(res == battle.HIT for res in results.values()):
+                phrase_self = _phrase_or_joke(match, current, SELF_HIT).strip()
+            elif any(res == battle.REPEAT for res in results.values()):
+                phrase_self = _phrase_or_joke(match, current, SELF_MISS).strip()
+            else:
+                phrase_self = _phrase_or_joke(match, current, SELF_MISS).strip()
+
+            next_obj = match.players.get(next_player)
+            next_name = getattr(next_obj, "name", "") or next_player
+            storage.save_match(match)
+            if enemy_msgs:
+                for enemy, (_, result_line_enemy, humor_enemy) in enemy_msgs.items():
+                    if enemy == human:
+                        continue
+                    if match.players[enemy].user_id != 0:
+                        message_enemy = _compose_move_message(
+                            result_line_enemy,
+                            humor_enemy,
+                            f"Следующим ходит {next_name}.",
                         )
-        if finished:
-            break
+                        await _safe_send_state(enemy, message_enemy)
+
+            human_entry = enemy_msgs.get(human)
+            player_is_bot = player_obj is None or player_obj.user_id == 0
+            if (
+                current != human
+                and human_entry is not None
+                and human_entry[0] in (battle.HIT, battle.KILL)
+                and match.players[human].user_id != 0
+            ):
+                _, result_line_human, humor_human = human_entry
+                message_human = _compose_move_message(
+                    result_line_human,
+                    humor_human,
+                    f"Следующим ходит {next_name}.",
+                )
+                await _safe_send_state(human, message_human)
+            msg_body = " ".join(parts_self).strip() or "мимо"
+            body_self = msg_body.rstrip()
+            if not body_self.endswith((".", "!", "?")):
+                body_self += "."
+            result_line_self = f"Ваш ход: {coord_str} - {body_self}"
+            result_self = _compose_move_message(
+                result_line_self,
+                phrase_self,
+                f"Следующим ходит {next_name}.",
+            )
+            if match.players[current].user_id != 0:
+                await _safe_send_state(current, result_self)
+
+            finished = False
+            for enemy in eliminated:
+                enemy_label = getattr(match.players[enemy], 'name', '') or enemy
+                alive_players = [k for k, b in match.boards.items() if b.alive_cells > 0 and k in match.players]
+                if len(alive_players) == 1:
+                    winner = alive_players[0]
+                    winner_label = getattr(match.players[winner], 'name', '') or winner
+                    storage.finish(match, winner)
+                    for k, p in match.players.items():
+                        if p.user_id != 0:
+                            if k == winner:
+                                msg = (
+                                    f"Флот игрока {enemy_label} потоплен! {enemy_label} занял 2 место. Вы победили!🏆"
+                                )
+                            else:
+                                msg = (
+                                    f"Флот игрока {enemy_label} потоплен! {enemy_label} занял 2 место. Игрок {winner_label} победил!"
+                                )
+                            await _safe_send_message(p.chat_id, msg)
+                    finished = True
+                else:
+                    for k, p in match.players.items():
+                        if p.user_id != 0:
+                            await _safe_send_message(
+                                p.chat_id,
+                                f"Флот игрока {enemy_label} потоплен! {enemy_label} выбывает.",
+                            )
+            if finished:
+                break
+    finally:
+        _drop_bot_pools(match_id)
 
 
 async def _auto_play_bot(
@@ -342,107 +432,112 @@ async def _auto_play_bot(
 
     game_started = False
 
-    while True:
-        refreshed = storage.get_match(match.match_id)
-        if refreshed is not None:
-            match = refreshed
-        if bot not in match.players:
-            break
-        if match.status == "finished":
-            break
-        if not game_started:
-            if match.status != "playing":
+    match_id = match.match_id
+    try:
+        while True:
+            refreshed = storage.get_match(match.match_id)
+            if refreshed is not None:
+                match = refreshed
+            if bot not in match.players:
+                break
+            if match.status == "finished":
+                break
+            if not game_started:
+                if match.status != "playing":
+                    await asyncio.sleep(0.5)
+                    continue
+                game_started = True
+                continue
+            if match.boards[human].alive_cells <= 0:
+                break
+            if match.turn != bot:
                 await asyncio.sleep(0.5)
                 continue
-            game_started = True
-            continue
-        if match.boards[human].alive_cells <= 0:
-            break
-        if match.turn != bot:
-            await asyncio.sleep(0.5)
-            continue
-        if delay:
-            await asyncio.sleep(delay)
-
-        board = match.boards[human]
-        available_cells = _available_bot_targets(board)
-        if not available_cells:
-            break
-        coord = random.choice(available_cells)
-
-        for b in match.boards.values():
-            b.highlight = []
-
-        result = apply_shot(board, coord)
-        coord_str = parser.format_coord(coord)
-        bot_shots = match.shots.setdefault(bot, {})
-        bot_shots.setdefault("history", []).append(coord_str)
-        bot_shots["last_coord"] = coord
-        bot_shots["last_result"] = result
-        for key in (human, bot):
-            shots = match.shots.setdefault(key, {})
-            shots.setdefault("move_count", 0)
-            shots.setdefault("joke_start", random.randint(1, 10))
-            shots["move_count"] += 1
-
-        if result == MISS:
-            match.turn = human
-            phrase_enemy = _phrase_or_joke(match, human, ENEMY_MISS).strip()
-            message = _compose_move_message(
-                f"Ход соперника: {coord_str} — Промах.",
-                phrase_enemy,
-                "Следующим ходите вы.",
-            )
-        elif result == HIT:
-            match.turn = bot
-            phrase_enemy = _phrase_or_joke(match, human, ENEMY_HIT).strip()
-            message = _compose_move_message(
-                f"Ход соперника: {coord_str} — Ваш корабль ранен.",
-                phrase_enemy,
-                "Следующим ходит соперник.",
-            )
-        elif result == REPEAT:
-            match.turn = bot
-            phrase_enemy = _phrase_or_joke(match, human, ENEMY_MISS).strip()
-            message = _compose_move_message(
-                f"Ход соперника: {coord_str} — Клетка уже обстреляна.",
-                phrase_enemy,
-                "Следующим ходит соперник.",
-            )
-        elif result == KILL:
-            phrase_enemy = _phrase_or_joke(match, human, ENEMY_KILL).strip()
-            if board.alive_cells == 0:
+            if delay:
+                await asyncio.sleep(delay)
+
+            board = match.boards[human]
+            view = _board_view(board)
+            coord = _choose_bot_coord(match, bot, view, _remaining_fleet([board]))
+            if coord is None:
+                break
+
+            for b in match.boards.values():
+                b.highlight = []
+
+            result = apply_shot(board, coord)
+            _record_bot_shot(match, bot, view, coord, result, human, board.highlight)
+            coord_str = parser.format_coord(coord)
+            bot_shots = match.shots.setdefault(bot, {})
+            bot_shots.setdefault("history", []).append(coord_str)
+            bot_shots["last_coord"] = coord
+            bot_shots["last_result"] = result
+            for key in (human, bot):
+                shots = match.shots.setdefault(key, {})
+                shots.setdefault("move_count", 0)
+                shots.setdefault("joke_start", joke_start(match, key))
+                shots["move_count"] += 1
+
+            if result == MISS:
+                match.turn = human
+                phrase_enemy = _phrase_or_joke(match, human, ENEMY_MISS).strip()
+                message = _compose_move_message(
+                    f"Ход соперника: {coord_str} — Промах.",
+                    phrase_enemy,
+                    "Следующим ходите вы.",
+                )
+            elif result == HIT:
+                match.turn = bot
+                phrase_enemy = _phrase_or_joke(match, human, ENEMY_HIT).strip()
+                message = _compose_move_message(
+                    f"Ход соперника: {coord_str} — Ваш корабль ранен.",
+                    phrase_enemy,
+                    "Следующим ходит соперник.",
+                )
+            elif result == REPEAT:
+                match.turn = bot
+                phrase_enemy = _phrase_or_joke(match, human, ENEMY_MISS).strip()
+                message = _compose_move_message(
+                    f"Ход соперника: {coord_str} — Клетка уже обстреляна.",
+                    phrase_enemy,
+                    "Следующим ходит соперник.",
+                )
+            elif result == KILL:
+                phrase_enemy = _phrase_or_joke(match, human, ENEMY_KILL).strip()
+                if board.alive_cells == 0:
+                    message = _compose_move_message(
+                        f"Ход соперника: {coord_str} — Ваш корабль уничтожен.",
+                        phrase_enemy,
+                        "Все ваши корабли уничтожены. Бот победил!",
+                    )
+                    storage.finish(match, bot)
+                    await _safe_send_state(human, message)
+                    await _safe_send_message(
+                        match.players[human].chat_id,
+                        "Игра завершена! Используйте /newgame, чтобы начать новую партию.",
+                    )
+                    break
+                match.turn = bot
                 message = _compose_move_message(
                     f"Ход соперника: {coord_str} — Ваш корабль уничтожен.",
                     phrase_enemy,
-                    "Все ваши корабли уничтожены. Бот победил!",
+                    "Следующим ходит соперник.",
                 )
-                storage.finish(match, bot)
-                await _safe_send_state(human, message)
-                await _safe_send_message(
-                    match.players[human].chat_id,
-                    "Игра завершена! Используйте /newgame, чтобы начать новую партию.",
+            else:
+                match.turn = human
+                message = _compose_move_message(
+                    f"Ход соперника: {coord_str} — Техническая ошибка.",
+                    None,
+                    "Следующим ходите вы.",
                 )
-                break
-            match.turn = bot
-            message = _compose_move_message(
-                f"Ход соперника: {coord_str} — Ваш корабль уничтожен.",
-                phrase_enemy,
-                "Следующим ходит соперник.",
-            )
-        else:
-            match.turn = human
-            message = _compose_move_message(
-                f"Ход соперника: {coord_str} — Техническая ошибка.",
-                None,
-                "Следующим ходите вы.",
-            )
 
-        storage.save_match(match)
-        await _safe_send_state(human, message)
+            storage.save_match(match)
+            await _safe_send_state(human, message)
 
-        if match.status == "finished":
-            break
+            if match.status == "finished":
+                break
+    finally:
+        _drop_bot_pools(match_id)
 
 
 async def board_test(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -457,12 +552,25 @@ async def board_test(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     match.status = "playing"
     match.turn = "A"
 
+    # Fleets of different players may touch; shots reveal all of them at once.
     mask = [[0] * 10 for _ in range(10)]
-    for key in ("A", "B", "C"):
-        board = placement.random_board_global(mask)
-        board.owner = key
-        match.players[key].ready = True
-        match.boards[key] = board
+    try:
+        for key in ("A", "B", "C"):
+            board = placement.random_board_global(
+                mask, rng=match_rng(match, "placement", key), reserve_halo=False
+            )
+            board.owner = key
+            match.players[key].ready = True
+            match.boards[key] = board
+    except placement.PlacementError:
+        logging.getLogger(__name__).exception(
+            "Failed to place test fleets for match %s", match.match_id
+        )
+        storage.delete_match(match.match_id)
+        await update.message.reply_text(
+            "Не удалось расставить корабли. Попробуйте /board_test ещё раз."
+        )
+        return
     storage.save_match(match)
 
     from . import router as router_module
@@ -502,7 +610,7 @@ async def board_test_two(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     match.status = "placing"
     match.turn = "A"
 
-    board_b = placement.random_board()
+    board_b = placement.random_board(match_rng(match, "placement", "B"))
     board_b.owner = "B"
     match.boards["B"] = board_b
 
@@ -1,12 +1,11 @@
 from __future__ import annotations
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputFile
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from types import SimpleNamespace
 
 import logging
 from pathlib import Path
 from io import BytesIO
-from contextlib import contextmanager
 from urllib.parse import quote_plus
 import os
 
@@ -16,6 +15,7 @@ import storage
 from logic.render import render_board_own, render_board_enemy
 from .board_test import board_test_two
 from app.config import BOARD15_ENABLED, BOARD15_TEST_ENABLED
+from app.file_ids import send_cached_photo
 
 
 logger = logging.getLogger(__name__)
@@ -95,13 +95,29 @@ except (TypeError, ValueError):
     ADMIN_ID = None
 
 
-@contextmanager
-def welcome_photo():
-    if WELCOME_IMAGE.exists():
-        with WELCOME_IMAGE.open('rb') as img:
-            yield InputFile(img, filename=WELCOME_IMAGE.name)
-    else:
-        yield InputFile(_generate_welcome_placeholder(), filename='welcome.png')
+WELCOME_CAPTION = 'Добро пожаловать в игру!'
+_WELCOME_IMAGE_CACHE: tuple[bytes, str] | None = None
+
+
+def _welcome_image() -> tuple[bytes, str]:
+    global _WELCOME_IMAGE_CACHE
+    if _WELCOME_IMAGE_CACHE is None:
+        if WELCOME_IMAGE.exists():
+            _WELCOME_IMAGE_CACHE = (WELCOME_IMAGE.read_bytes(), WELCOME_IMAGE.name)
+        else:
+            _WELCOME_IMAGE_CACHE = (_generate_welcome_placeholder(), 'welcome.png')
+    return _WELCOME_IMAGE_CACHE
+
+
+async def send_welcome_photo(reply_photo) -> None:
+    """Send the welcome picture, reusing its Telegram file_id after the first upload."""
+
+    data, filename = _welcome_image()
+    await send_cached_photo(
+        lambda photo: reply_photo(photo, caption=WELCOME_CAPTION),
+        data,
+        filename=filename,
+    )
 
 
 NAME_KEY = "player_name"
@@ -168,8 +184,7 @@ async def _send_join_success(
     reply_photo,
     reply_text,
 ) -> None:
-    with welcome_photo() as img:
-        await reply_photo(img, caption='Добро пожаловать в игру!')
+    await send_welcome_photo(reply_photo)
     await reply_text('Вы присоединились к матчу. Отправьте "авто" для расстановки кораблей.')
     await reply_text('Используйте @ или ! в начале сообщения, чтобы отправить сообщение соперникам в чат игры.')
 
@@ -245,8 +260,7 @@ async def finalize_board15_join(
 
     joiner_name = (getattr(joiner, "name", "") or name).strip() or "Игрок"
 
-    with welcome_photo() as img:
-        await update.message.reply_photo(img, caption='Добро пожаловать в игру!')
+    await send_welcome_photo(update.message.reply_photo)
 
     joined_count = sum(
         1 for player in match.players.values() if getattr(player, 'user_id', 0)
@@ -426,8 +440,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             )
             await update.message.reply_text(msg)
     else:
-        with welcome_photo() as img:
-            await update.message.reply_photo(img, caption='Добро пожаловать в игру!')
+        await send_welcome_photo(update.message.reply_photo)
         buttons = [
             [
                 InlineKeyboardButton('Игра вдвоем', callback_data='mode_2'),
@@ -494,8 +507,7 @@ async def newgame(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     )
     username = (await context.bot.get_me()).username
     await update.message.reply_text('Среда игры готова.')
-    with welcome_photo() as img:
-        await update.message.reply_photo(img, caption='Добро пожаловать в игру!')
+    await send_welcome_photo(update.message.reply_photo)
     link = f"https://t.me/{username}?start=inv_{match.match_id}"
     share_url = f"https://t.me/share/url?url={quote_plus(link)}"
     keyboard = InlineKeyboardMarkup(
@@ -618,6 +630,9 @@ async def quit_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             quitter = next((k for k, p in match15.players.items() if p.user_id == user_id), None)
             match15.status = 'finished'
             storage15.save_match(match15)
+            from game_board15 import compute as compute15  # type: ignore
+
+            compute15.cancel_match(match15.match_id)
             for key, player in match15.players.items():
                 if player.user_id == 0:
                     continue
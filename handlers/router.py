@@ -1,5 +1,4 @@
 from __future__ import annotations
-import random
 import os
 import asyncio
 import logging
@@ -8,7 +7,8 @@ from telegram.ext import ApplicationHandlerStop, ContextTypes
 
 import storage
 from logic.parser import parse_coord, format_coord
-from logic.placement import random_board
+from logic.layout_pool import MODE_BOARD10, generate_layout
+from logic.rng import joke_start, match_rng
 from logic.battle import apply_shot, MISS, HIT, KILL, REPEAT
 from logic.battle_test import apply_shot_multi
 from logic.render import render_board_own, render_board_enemy
@@ -23,7 +23,7 @@ from handlers.commands import (
     NAME_HINT_AUTO,
     NAME_PENDING_BOARD15_JOIN,
 )
-from .board_test import board_test, board_test_two
+from .board_test import board_test, board_test_two, note_history_shot
 from logic.phrases import (
     ENEMY_HIT,
     ENEMY_KILL,
@@ -75,6 +75,12 @@ def _cell_state(cell):
     return cell[0] if isinstance(cell, (list, tuple)) else cell
 
 
+def _board_cache_key(match, player_key: str):
+    """Return the row cache key of a player's board, if the match has an id."""
+    match_id = getattr(match, "match_id", None)
+    return (match_id, player_key) if match_id is not None else None
+
+
 async def _send_state(
     context: ContextTypes.DEFAULT_TYPE,
     match,
@@ -86,8 +92,12 @@ async def _send_state(
     chat_id = match.players[player_key].chat_id
     msgs = match.messages.setdefault(player_key, {})
 
-    own = render_board_own(match.boards[player_key])
-    enemy = render_board_enemy(match.boards[enemy_key])
+    own = render_board_own(
+        match.boards[player_key], cache_key=_board_cache_key(match, player_key)
+    )
+    enemy = render_board_enemy(
+        match.boards[enemy_key], cache_key=_board_cache_key(match, enemy_key)
+    )
     message = message.lstrip('\n')
     if message:
         board_text = f"Поле соперника:\n{enemy}\nВаше поле:\n{own}\n{message}"
@@ -133,7 +143,7 @@ async def _send_state_board_test(
                 merged[r][c] = cell
     board = Board(grid=merged, highlight=getattr(match, "last_highlight", []).copy())
     message = message.lstrip('\n')
-    board_body = render_board_own(board)
+    board_body = render_board_own(board, cache_key=_board_cache_key(match, player_key))
     if message:
         board_text = f"Ваше поле:\n{board_body}\n{message}"
     else:
@@ -176,11 +186,12 @@ def _phrase_or_joke(match, player_key: str, phrases: list[str]) -> str:
     shots = match.shots[player_key]
     start = shots.get("joke_start")
     if start is None:
-        start = shots["joke_start"] = random.randint(1, 10)
+        start = shots["joke_start"] = joke_start(match, player_key)
     count = shots.get("move_count", 0)
+    rng = match_rng(match, "phrase", player_key, count)
     if count >= start and (count - start) % 10 == 0:
-        return f"Слушай анекдот по этому поводу:\n{random_joke()}"
-    return random_phrase(phrases)
+        return f"Слушай анекдот по этому поводу:\n{random_joke(rng)}"
+    return random_phrase(phrases, rng)
 
 
 def _compose_move_message(
@@ -254,7 +265,7 @@ async def _handle_board_test_two(
     for key in (player_key, enemy_key):
         shots = match.shots.setdefault(key, {})
         shots.setdefault("move_count", 0)
-        shots.setdefault("joke_start", random.randint(1, 10))
+        shots.setdefault("joke_start", joke_start(match, key))
         shots["move_count"] += 1
 
     coord_str = format_coord(coord)
@@ -473,8 +484,15 @@ async def router_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
     if match.status == 'placing':
         if text == 'авто':
-            board = random_board()
+            # Follows from the match seed so the match replays; chaining the
+            # previous layout seed makes a repeated "авто" pick a new fleet.
+            previous = getattr(match.boards.get(player_key), 'layout_seed', None)
+            seed, board = generate_layout(
+                MODE_BOARD10,
+                match_rng(match, 'layout', player_key, previous).getrandbits(63),
+            )
             board.owner = player_key
+            board.layout_seed = seed
             storage.save_board(match, player_key, board)
             current_player = match.players.get(player_key)
             player_label = getattr(current_player, 'name', '') or f'Игрок {player_key}'
@@ -603,7 +621,7 @@ async def router_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     for k in ('A', 'B'):
         shots = match.shots.setdefault(k, {})
         shots.setdefault('move_count', 0)
-        shots.setdefault('joke_start', random.randint(1, 10))
+        shots.setdefault('joke_start', joke_start(match, k))
         shots['move_count'] += 1
     error = None
     coord_str = format_coord(coord)
@@ -848,10 +866,11 @@ async def router_text_board_test(update: Update, context: ContextTypes.DEFAULT_T
     else:
         match.last_highlight = [coord]
         match.shots[player_key]['last_result'] = 'miss'
+    note_history_shot(match, player_key, [coord, *match.last_highlight])
     for k in match.shots:
         shots = match.shots.setdefault(k, {})
         shots.setdefault('move_count', 0)
-        shots.setdefault('joke_start', random.randint(1, 10))
+        shots.setdefault('joke_start', joke_start(match, k))
         shots['move_count'] += 1
 
     coord_str = format_coord(coord)
@@ -927,7 +946,9 @@ async def router_text_board_test(update: Update, context: ContextTypes.DEFAULT_T
 
     next_label = getattr(match.players[next_player], 'name', '') or next_player
     next_phrase_self = f"Следующим ходит {next_label}."
-    summary = random.choice(list(self_msgs.values())) if self_msgs else ''
+    move_count = match.shots[player_key].get('move_count', 0)
+    summary_rng = match_rng(match, 'summary', player_key, move_count)
+    summary = summary_rng.choice(list(self_msgs.values())) if self_msgs else ''
     if summary:
         self_lines = [f"Ваш ход: {coord_str} — {summary}"]
     else:
@@ -0,0 +1,193 @@
+"""Pool of pre-generated fleet layouts.
+
+Creating a 15×15 match used to run the fleet placer inside the update
+handler.  The pool keeps a few ready layouts per mode so the handler only
+pops from a queue; a background task tops the queues up whenever they drop
+below the low watermark.  An empty (or disabled) pool falls back to
+generating the layout on demand.
+
+Each entry is ``(seed, layout)``: the layout is generated from
+:func:`layout_rng` so it can be reproduced from the seed later.  A pooled
+seed is random, so a pooled layout only replays a match whose seed is taken
+from it (as 15×15 matches do).  The 10×10 "авто" layout has to follow from
+an existing match seed instead; that mode is registered without a queue and
+built with :func:`generate_layout`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from app.config import LAYOUT_POOL_LOW_WATERMARK, LAYOUT_POOL_SIZE
+from logic.placement import PlacementError, random_board
+from logic.rng import new_seed, seeded_rng
+
+logger = logging.getLogger(__name__)
+
+MODE_BOARD10 = "board10"
+MODE_BOARD15 = "board15"
+
+LayoutFactory = Callable[[random.Random], Any]
+LayoutEntry = Tuple[int, Any]
+
+
+def layout_rng(seed: int) -> random.Random:
+    """RNG used to generate the layout of ``seed``; equals ``match_rng(match, "placement")``."""
+
+    return seeded_rng(seed, "placement")
+
+
+class LayoutPool:
+    """Per-mode queues of ``(seed, layout)`` entries with background refill."""
+
+    def __init__(self, size: int = 8, low_watermark: int = 3) -> None:
+        self.size = max(0, size)
+        self.low_watermark = min(max(0, low_watermark), self.size)
+        self._factories: Dict[str, LayoutFactory] = {}
+        self._queues: Dict[str, Deque[LayoutEntry]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, mode: str, factory: LayoutFactory, *, pooled: bool = True) -> None:
+        self._factories[mode] = factory
+        if pooled:
+            self._queues.setdefault(mode, deque())
+
+    def available(self, mode: str) -> int:
+        return len(self._queues.get(mode, ()))
+
+    def generate(self, mode: str, seed: Optional[int] = None) -> LayoutEntry:
+        """Build a fresh layout for ``mode`` without touching the queue."""
+
+        if seed is None:
+            seed = new_seed()
+        return seed, self._factories[mode](layout_rng(seed))
+
+    def take(self, mode: str) -> LayoutEntry:
+        """Pop a ready layout, generating one on demand if the queue is empty."""
+
+        queue = self._queues.get(mode)
+        if queue:
+            entry = queue.popleft()
+            self.hits += 1
+        else:
+            entry = self.generate(mode)
+            self.misses += 1
+        if queue is not None and len(queue) < self.low_watermark:
+            self._request_refill()
+        return entry
+
+    def _needs_refill(self) -> bool:
+        return any(len(queue) < self.size for queue in self._queues.values())
+
+    def _request_refill(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _top_up_one(self, mode: str) -> None:
+        try:
+            entry = self.generate(mode)
+        except PlacementError:
+            logger.exception("LAYOUT_POOL | generation failed mode=%s", mode)
+            return
+        self._queues[mode].append(entry)
+
+    def fill(self) -> int:
+        """Synchronously top every queue up to ``size``; return entries added."""
+
+        added = 0
+        for mode, queue in self._queues.items():
+            while len(queue) < self.size:
+                before = len(queue)
+                self._top_up_one(mode)
+                if len(queue) == before:
+                    break
+                added += 1
+        return added
+
+    async def _refill_loop(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            for mode, queue in list(self._queues.items()):
+                while len(queue) < self.size:
+                    before = len(queue)
+                    await asyncio.to_thread(self._top_up_one, mode)
+                    if len(queue) == before:
+                        break
+
+    async def start(self) -> None:
+        """Fill the queues and start the background refill task."""
+
+        if self.size <= 0 or self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._refill_loop())
+        if self._needs_refill():
+            self._wakeup.set()
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        self._wakeup = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+_pool: Optional[LayoutPool] = None
+
+
+def get_layout_pool() -> LayoutPool:
+    global _pool
+    if _pool is None:
+        _pool = LayoutPool(LAYOUT_POOL_SIZE, LAYOUT_POOL_LOW_WATERMARK)
+        # A 10×10 fleet takes well under a millisecond to place.
+        _pool.register(MODE_BOARD10, random_board, pooled=False)
+    return _pool
+
+
+def register_layout(mode: str, factory: LayoutFactory) -> None:
+    get_layout_pool().register(mode, factory)
+
+
+def take_layout(mode: str) -> LayoutEntry:
+    return get_layout_pool().take(mode)
+
+
+def generate_layout(mode: str, seed: int) -> LayoutEntry:
+    """Build the layout of ``seed``, e.g. one derived from a match seed."""
+
+    return get_layout_pool().generate(mode, seed)
+
+
+async def start_layout_pool() -> None:
+    await get_layout_pool().start()
+
+
+async def stop_layout_pool() -> None:
+    if _pool is not None:
+        await _pool.stop()
+
+
+__all__ = [
+    "LayoutPool",
+    "MODE_BOARD10",
+    "MODE_BOARD15",
+    "generate_layout",
+    "get_layout_pool",
+    "layout_rng",
+    "register_layout",
+    "start_layout_pool",
+    "stop_layout_pool",
+    "take_layout",
+]
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import random
 
 # Phrases shown when the opponent misses our ships
@@ -188,11 +190,11 @@ JOKES = [
 ]
 
 
-def random_phrase(phrases: list[str]) -> str:
+def random_phrase(phrases: list[str], rng: random.Random | None = None) -> str:
     """Return a random phrase from the given list."""
-    return random.choice(phrases)
+    return (rng or random).choice(phrases)
 
 
-def random_joke() -> str:
+def random_joke(rng: random.Random | None = None) -> str:
     """Return a random joke from the predefined list."""
-    return random.choice(JOKES)
+    return (rng or random).choice(JOKES)
@@ -1,11 +1,27 @@
 from __future__ import annotations
+import operator
 import random
-from typing import List, Tuple
+from functools import lru_cache
+from itertools import compress
+from typing import List, Optional, Sequence, Tuple
 
 from models import Board, Ship
 
 SHIP_SIZES = [4,3,3,2,2,2,1,1,1,1]
 
+# Upper bound on placement attempts (including backtracking) per fleet search.
+# A search that runs out of budget reports failure instead of spinning.
+MAX_PLACEMENT_STEPS = 20000
+RANDOM_TRIES = 8
+
+Coord = Tuple[int, int]
+# (bitmask of the ship cells, bitmask of the cells plus their neighbours, cells)
+Slot = Tuple[int, int, Tuple[Coord, ...]]
+
+
+class PlacementError(RuntimeError):
+    """Raised when a fleet cannot be placed on the remaining free cells."""
+
 
 def can_place(grid: List[List[int]], ship_cells: List[Tuple[int,int]]) -> bool:
     rows = len(grid)
@@ -26,42 +42,211 @@ def can_place(grid: List[List[int]], ship_cells: List[Tuple[int,int]]) -> bool:
     return True
 
 
-def place_ship(board: Board, size: int) -> None:
-    placed = False
-    while not placed:
-        orient = random.choice(['h','v'])
-        if orient == 'h':
-            r = random.randint(0,9)
-            c = random.randint(0,10-size)
-        else:
-            r = random.randint(0,10-size)
-            c = random.randint(0,9)
-        cells = []
-        for i in range(size):
-            rr = r + (i if orient=='v' else 0)
-            cc = c + (i if orient=='h' else 0)
-            cells.append((rr,cc))
-        if can_place(board.grid, cells):
-            ship = Ship(cells=cells)
-            board.ships.append(ship)
-            for rr, cc in cells:
-                board.grid[rr][cc] = 1
-            placed = True
-
-
-def random_board() -> Board:
+def _bit(size: int, r: int, c: int) -> int:
+    return 1 << (r * size + c)
+
+
+def halo_mask(size: int, cells: Sequence[Coord]) -> int:
+    """Bitmask of ``cells`` and every cell touching them."""
+    mask = 0
+    for r, c in cells:
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    mask |= _bit(size, nr, nc)
+    return mask
+
+
+@lru_cache(maxsize=None)
+def ship_slots(size: int, ship: int) -> Tuple[Slot, ...]:
+    """All straight placements of a ``ship``-long ship on a ``size`` board."""
+    slots: List[Slot] = []
+    for r in range(size):
+        for c in range(size):
+            shapes = [[(r, c + i) for i in range(ship)]]
+            if ship > 1:
+                shapes.append([(r + i, c) for i in range(ship)])
+            for cells in shapes:
+                if any(rr >= size or cc >= size for rr, cc in cells):
+                    continue
+                mask = 0
+                for rr, cc in cells:
+                    mask |= _bit(size, rr, cc)
+                slots.append((mask, halo_mask(size, cells), tuple(cells)))
+    return tuple(slots)
+
+
+@lru_cache(maxsize=None)
+def _slot_masks(size: int, ship: int) -> Tuple[int, ...]:
+    return tuple(slot[0] for slot in ship_slots(size, ship))
+
+
+def grid_mask(grid: Sequence[Sequence[object]], size: int) -> int:
+    """Bitmask of the non-empty cells of ``grid`` (list or annotated cells)."""
+    mask = 0
+    for r in range(min(size, len(grid))):
+        row = grid[r]
+        for c in range(min(size, len(row))):
+            cell = row[c]
+            value = cell[0] if isinstance(cell, (list, tuple)) else cell
+            if value:
+                mask |= _bit(size, r, c)
+    return mask
+
+
+def _search_fleet(
+    size: int,
+    ships: Sequence[int],
+    blocked: int,
+    rng,
+    budget: int,
+) -> Tuple[Optional[List[Slot]], int, int]:
+    """Depth-first search for one layout.
+
+    Returns ``(slots, reserved_mask, steps)``; ``slots`` is ``None`` when the
+    step budget ran out.  Exhausting the search space raises
+    :class:`PlacementError` because it proves the fleet cannot fit.
+    """
+    count = len(ships)
+    chosen: List[Optional[Slot]] = [None] * count
+    forbidden = [blocked] + [0] * count
+    tried: List[set] = [set() for _ in range(count)]
+    pending: List[Optional[List[int]]] = [None] * count
+    steps = 0
+    depth = 0
+    while depth < count:
+        if steps >= budget:
+            return None, 0, steps
+        steps += 1
+        slots = ship_slots(size, ships[depth])
+        mask = forbidden[depth]
+        pick: Optional[int] = None
+        if pending[depth] is None:
+            for _ in range(RANDOM_TRIES if slots else 0):
+                idx = rng.randrange(len(slots))
+                if idx not in tried[depth] and not slots[idx][0] & mask:
+                    pick = idx
+                    break
+            if pick is None:
+                masks = _slot_masks(size, ships[depth])
+                legal = list(
+                    compress(range(len(masks)), map(operator.not_, map(mask.__and__, masks)))
+                )
+                if tried[depth]:
+                    legal = [idx for idx in legal if idx not in tried[depth]]
+                pending[depth] = legal
+        candidates = pending[depth]
+        if pick is None and candidates:
+            j = rng.randrange(len(candidates))
+            candidates[j], candidates[-1] = candidates[-1], candidates[j]
+            pick = candidates.pop()
+        if pick is None:
+            # No slot left for this ship: reset it and revise the previous one.
+            tried[depth].clear()
+            pending[depth] = None
+            depth -= 1
+            if depth < 0:
+                raise PlacementError(
+                    f"Fleet {list(ships)} does not fit on a {size}×{size} board"
+                )
+            continue
+        tried[depth].add(pick)
+        chosen[depth] = slots[pick]
+        forbidden[depth + 1] = mask | slots[pick][1]
+        if depth + 1 < count:
+            tried[depth + 1].clear()
+            pending[depth + 1] = None
+        depth += 1
+    return [slot for slot in chosen if slot is not None], forbidden[count], steps
+
+
+def place_fleet(
+    size: int,
+    ships: Sequence[int],
+    *,
+    blocked: int = 0,
+    rng=None,
+    max_steps: int = MAX_PLACEMENT_STEPS,
+) -> Tuple[List[List[Coord]], int]:
+    """Place ``ships`` on a ``size``×``size`` board avoiding ``blocked`` cells.
+
+    Every ship picks a slot among the placements still legal for the current
+    free-cell mask (a few random probes first, the full enumeration when they
+    miss) and the search backtracks when a ship has no slot left.  Short
+    searches are restarted from scratch so an unlucky early choice does not
+    trap the search; the last restart gets the remaining budget.  The total
+    number of attempts is capped by ``max_steps`` so the worst case stays
+    bounded.
+
+    Returns the cells of each ship (in the order of ``ships``) and ``blocked``
+    extended with the new ships and their neighbours.  Raises
+    :class:`PlacementError` when the fleet does not fit or the budget runs out.
+    """
+    rng = rng if rng is not None else random
+    restart_budget = max(64, 4 * len(ships))
+    spent = 0
+    while spent < max_steps:
+        remaining = max_steps - spent
+        budget = restart_budget if remaining > 2 * restart_budget else remaining
+        slots, reserved, steps = _search_fleet(size, ships, blocked, rng, budget)
+        spent += steps
+        if slots is not None:
+            return [list(slot[2]) for slot in slots], reserved
+    raise PlacementError(
+        f"Fleet placement exceeded {max_steps} steps on a {size}×{size} board"
+    )
+
+
+def _board_from_cells(size: int, fleet: List[List[Coord]]) -> Board:
     board = Board()
-    for size in SHIP_SIZES:
-        place_ship(board, size)
+    if len(board.grid) != size:
+        board.grid = [[0] * size for _ in range(size)]
+    for cells in fleet:
+        board.ships.append(Ship(cells=cells))
+        for rr, cc in cells:
+            board.grid[rr][cc] = 1
     return board
 
 
-def random_board_global(global_mask: List[List[int]]) -> Board:
+def place_ship(board: Board, size: int, rng=None) -> None:
+    """Add one ship of ``size`` to ``board`` on a random legal slot."""
+    rng = rng if rng is not None else random
+    board_size = len(board.grid)
+    occupied = grid_mask(board.grid, board_size)
+    blocked = 0
+    for r in range(board_size):
+        for c in range(board_size):
+            if occupied & _bit(board_size, r, c):
+                blocked |= halo_mask(board_size, [(r, c)])
+    legal = [slot for slot in ship_slots(board_size, size) if not slot[0] & blocked]
+    if not legal:
+        raise PlacementError(f"No free slot for a ship of size {size}")
+    cells = list(rng.choice(legal)[2])
+    board.ships.append(Ship(cells=cells))
+    for rr, cc in cells:
+        board.grid[rr][cc] = 1
+
+
+def random_board(rng=None) -> Board:
+    fleet, _ = place_fleet(10, SHIP_SIZES, rng=rng)
+    return _board_from_cells(10, fleet)
+
+
+def random_board_global(
+    global_mask: List[List[int]],
+    rng=None,
+    *,
+    reserve_halo: bool = True,
+) -> Board:
     """Generate a board avoiding cells marked in ``global_mask``.
 
     ``global_mask`` uses ``1`` to denote cells that are occupied or touch ships
     of previously placed fleets.  The mask is updated in-place with the newly
     placed fleet so that subsequent calls will avoid those areas as well.
+    With ``reserve_halo=False`` only the ship cells are marked, so later fleets
+    may touch this one (three full fleets do not fit on 10×10 otherwise).
+    Raises :class:`PlacementError` if the fleet cannot fit.
     """
 
     if global_mask:
@@ -71,73 +256,15 @@ def random_board_global(global_mask: List[List[int]]) -> Board:
     else:
         board_size = 10
 
-    def _cell_clear(mask: List[List[int]], r: int, c: int) -> bool:
-        if r < 0 or c < 0:
-            return False
-        if r >= len(mask):
-            return True
-        row = mask[r]
-        if c >= len(row):
-            return True
-        return row[c] == 0
-
-    while True:
-        board = Board()
-        if len(board.grid) != board_size or (board.grid and len(board.grid[0]) != board_size):
-            board.grid = [[0] * board_size for _ in range(board_size)]
-        mask = [row[:] for row in global_mask]
-        success = True
-
-        for size in SHIP_SIZES:
-            placed = False
-            for _ in range(500):
-                orient = random.choice(['h', 'v'])
-                if orient == 'h':
-                    r = random.randint(0, board_size - 1)
-                    c = random.randint(0, board_size - size)
-                else:
-                    r = random.randint(0, board_size - size)
-                    c = random.randint(0, board_size - 1)
-
-                cells: List[Tuple[int, int]] = []
-                for i in range(size):
-                    rr = r + (i if orient == 'v' else 0)
-                    cc = c + (i if orient == 'h' else 0)
-                    cells.append((rr, cc))
-
-                if not all(_cell_clear(mask, rr, cc) for rr, cc in cells):
-                    continue
-                if not can_place(board.grid, cells):
-                    continue
-
-                ship = Ship(cells=cells)
-                board.ships.append(ship)
-                for rr, cc in cells:
-                    board.grid[rr][cc] = 1
-                for rr, cc in cells:
-                    for dr in (-1, 0, 1):
-                        for dc in (-1, 0, 1):
-                            nr, nc = rr + dr, cc + dc
-                            if nr < 0 or nc < 0:
-                                continue
-                            if nr >= len(mask):
-                                continue
-                            if nc >= len(mask[nr]):
-                                continue
-                            mask[nr][nc] = 1
-                placed = True
-                break
-
-            if not placed:
-                success = False
-                break
-
-        if not success:
-            continue
-
-        for r in range(len(mask)):
-            row_len = len(mask[r])
-            for c in range(row_len):
-                if mask[r][c]:
-                    global_mask[r][c] = 1
-        return board
+    blocked = grid_mask(global_mask, board_size)
+    fleet, reserved = place_fleet(board_size, SHIP_SIZES, blocked=blocked, rng=rng)
+    if not reserve_halo:
+        reserved = 0
+        for cells in fleet:
+            for r, c in cells:
+                reserved |= _bit(board_size, r, c)
+    for r in range(board_size):
+        for c in range(board_size):
+            if reserved & _bit(board_size, r, c):
+                global_mask[r][c] = 1
+    return _board_from_cells(board_size, fleet)
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import List, Tuple, Union
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Tuple, Union
 import re
 
 from models import Board
@@ -63,6 +64,13 @@ def format_cell(symbol: str) -> str:
 
 COL_HEADERS = ''.join(format_cell(letter) for letter in ROWS)
 HEADER_PREFIX = format_cell("") + "| "
+HEADER_LINE = format_cell("") + "|" + " " + COL_HEADERS
+
+VIEW_OWN = "own"
+VIEW_ENEMY = "enemy"
+
+# Cell states the boards hold; anything else is padded on demand.
+CELL_STATES = (0, 1, 2, 3, 4, 5)
 
 
 def _render_line(cells: List[str]) -> str:
@@ -80,68 +88,135 @@ def _resolve_cell(v: Union[int, Tuple[int, str]]) -> Tuple[int, str | None]:
     return state, owner
 
 
-def render_board_own(board: Board) -> str:
-    header = format_cell("") + "|" + " " + COL_HEADERS
-    lines = [header]
-    highlight = set(board.highlight)
-    for r_idx, row in enumerate(board.grid):
-        cells = []
-        for c_idx, v in enumerate(row):
-            coord = (r_idx, c_idx)
-            cell_state, owner = _resolve_cell(v)
-            owner_cell = owner == board.owner and owner is not None
-            if cell_state == 1 or (owner_cell and cell_state == 0):
-                sym = SHIP_SYMBOL
-            elif cell_state == 2:
-                sym = MISS_SYMBOL
-            elif cell_state == 3:
-                sym = HIT_SYMBOL
-            elif cell_state == 4:
-                sym = SUNK_SYMBOL
-            elif cell_state == 5:
-                sym = MISS_SYMBOL
-            else:
-                sym = EMPTY_SYMBOL
-            if coord in highlight:
-                if cell_state in (2, 5):
-                    sym = LAST_MOVE_MISS_SYMBOL
-                elif cell_state == 4:
-                    sym = LAST_MOVE_SUNK_SYMBOL
-                elif cell_state == 3:
-                    sym = LAST_MOVE_HIT_SYMBOL
-            cells.append(format_cell(sym))
-        row_label = format_cell(str(r_idx + 1))
-        lines.append(f"{row_label}| " + _render_line(cells))
-    return '<pre>' + '\n'.join(lines) + '</pre>'
+def _cell_symbol(view: str, cell_state: int, owner_cell: bool, highlighted: bool) -> str:
+    """Return the symbol of a cell before padding."""
+    if view == VIEW_OWN and (cell_state == 1 or (owner_cell and cell_state == 0)):
+        sym = SHIP_SYMBOL
+    elif cell_state == 2:
+        sym = MISS_SYMBOL
+    elif cell_state == 3:
+        sym = HIT_SYMBOL
+    elif cell_state == 4:
+        sym = SUNK_SYMBOL
+    elif cell_state == 5:
+        sym = MISS_SYMBOL
+    else:
+        sym = EMPTY_SYMBOL
+    if highlighted:
+        if cell_state in (2, 5):
+            sym = LAST_MOVE_MISS_SYMBOL
+        elif cell_state == 4:
+            sym = LAST_MOVE_SUNK_SYMBOL
+        elif cell_state == 3:
+            sym = LAST_MOVE_HIT_SYMBOL
+    return sym
+
+
+# ``(view, state, owner_cell, highlighted) -> padded cell``.  The symbol set is
+# fixed, so every cell of a board is a single lookup.
+CELL_TABLE: Dict[Tuple[str, int, bool, bool], str] = {
+    (view, cell_state, owner_cell, highlighted): format_cell(
+        _cell_symbol(view, cell_state, owner_cell, highlighted)
+    )
+    for view in (VIEW_OWN, VIEW_ENEMY)
+    for cell_state in CELL_STATES
+    for owner_cell in (False, True)
+    for highlighted in (False, True)
+}
+
+ROW_LABELS = [format_cell(str(r_idx + 1)) + "| " for r_idx in range(len(ROWS))]
+
+
+def _padded_cell(view: str, cell_state: int, owner_cell: bool, highlighted: bool) -> str:
+    key = (view, cell_state, owner_cell, highlighted)
+    try:
+        return CELL_TABLE[key]
+    except (KeyError, TypeError):
+        return format_cell(_cell_symbol(*key))
+
+
+def _row_label(r_idx: int) -> str:
+    if r_idx < len(ROW_LABELS):
+        return ROW_LABELS[r_idx]
+    return format_cell(str(r_idx + 1)) + "| "
+
+
+def _render_row(view: str, owner: str | None, r_idx: int, row, highlighted) -> str:
+    cells = []
+    for c_idx, v in enumerate(row):
+        cell_state, cell_owner = _resolve_cell(v)
+        owner_cell = owner is not None and cell_owner == owner
+        cells.append(_padded_cell(view, cell_state, owner_cell, c_idx in highlighted))
+    return _row_label(r_idx) + _render_line(cells)
+
+
+def _copy_row(row) -> list:
+    return [v[:] if isinstance(v, list) else v for v in row]
+
 
+class _RowCache:
+    """Rendered rows of one board view and the cells they were rendered from."""
 
-def render_board_enemy(board: Board) -> str:
-    header = format_cell("") + "|" + " " + COL_HEADERS
-    lines = [header]
-    highlight = set(board.highlight)
+    __slots__ = ("owner", "rows")
+
+    def __init__(self, owner: str | None) -> None:
+        self.owner = owner
+        self.rows: Dict[int, Tuple[list, frozenset, str]] = {}
+
+
+# Boards whose rows are kept; least recently rendered ones are dropped.
+ROW_CACHE_SIZE = 256
+_row_caches: "OrderedDict[Tuple[Hashable, str], _RowCache]" = OrderedDict()
+
+
+def _row_cache(cache_key: Hashable, view: str, owner: str | None) -> _RowCache:
+    key = (cache_key, view)
+    cache = _row_caches.get(key)
+    if cache is None or cache.owner != owner:
+        cache = _row_caches[key] = _RowCache(owner)
+        while len(_row_caches) > ROW_CACHE_SIZE:
+            _row_caches.popitem(last=False)
+    else:
+        _row_caches.move_to_end(key)
+    return cache
+
+
+def clear_row_cache() -> None:
+    _row_caches.clear()
+
+
+def _render_board(board: Board, view: str, cache_key: Hashable | None = None) -> str:
+    highlight_cols: Dict[int, set] = {}
+    for r_idx, c_idx in board.highlight:
+        highlight_cols.setdefault(r_idx, set()).add(c_idx)
+    owner = board.owner
+    cache = _row_cache(cache_key, view, owner) if cache_key is not None else None
+    lines = [HEADER_LINE]
     for r_idx, row in enumerate(board.grid):
-        cells = []
-        for c_idx, v in enumerate(row):
-            coord = (r_idx, c_idx)
-            cell_state, owner = _resolve_cell(v)
-            if cell_state == 2:
-                sym = MISS_SYMBOL
-            elif cell_state == 3:
-                sym = HIT_SYMBOL
-            elif cell_state == 4:
-                sym = SUNK_SYMBOL
-            elif cell_state == 5:
-                sym = MISS_SYMBOL
-            else:
-                sym = EMPTY_SYMBOL
-            if coord in highlight:
-                if cell_state in (2, 5):
-                    sym = LAST_MOVE_MISS_SYMBOL
-                elif cell_state == 4:
-                    sym = LAST_MOVE_SUNK_SYMBOL
-                elif cell_state == 3:
-                    sym = LAST_MOVE_HIT_SYMBOL
-            cells.append(format_cell(sym))
-        row_label = format_cell(str(r_idx + 1))
-        lines.append(f"{row_label}| " + _render_line(cells))
+        highlighted = frozenset(highlight_cols.get(r_idx, ()))
+        if cache is None:
+            lines.append(_render_row(view, owner, r_idx, row, highlighted))
+            continue
+        cached = cache.rows.get(r_idx)
+        if cached is not None and cached[1] == highlighted and cached[0] == row:
+            lines.append(cached[2])
+            continue
+        line = _render_row(view, owner, r_idx, row, highlighted)
+        cache.rows[r_idx] = (_copy_row(row), highlighted, line)
+        lines.append(line)
     return '<pre>' + '\n'.join(lines) + '</pre>'
+
+
+def render_board_own(board: Board, *, cache_key: Hashable | None = None) -> str:
+    """Render ``board`` as its owner sees it.
+
+    With ``cache_key`` (e.g. ``(match_id, player_key)``) rendered rows are
+    kept and only rows whose cells or highlight changed since the last call
+    with the same key are rendered again.
+    """
+    return _render_board(board, VIEW_OWN, cache_key)
+
+
+def render_board_enemy(board: Board, *, cache_key: Hashable | None = None) -> str:
+    """Render ``board`` as the opponent sees it; see :func:`render_board_own`."""
+    return _render_board(board, VIEW_ENEMY, cache_key)
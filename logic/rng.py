@@ -0,0 +1,55 @@
+"""Per-match deterministic randomness.
+
+Every match stores a ``seed`` in its payload.  Code that needs randomness
+derives a fresh :class:`random.Random` from that seed and a *scope* naming
+the decision (``"colors"``, ``("bot", "B", 12)`` …) instead of touching the
+global :mod:`random` state, so the same seed and the same moves replay a
+match bit-exactly regardless of which other matches ran in between.
+
+Scopes that are drawn repeatedly must include something that changes between
+draws, usually the move number.
+"""
+from __future__ import annotations
+
+import random
+from typing import Union
+
+Seed = Union[int, str]
+
+_seed_source = random.SystemRandom()
+
+
+def new_seed() -> int:
+    return _seed_source.getrandbits(63)
+
+
+def match_seed(match: object) -> Seed:
+    """Return the seed of ``match``; legacy matches fall back to their id."""
+
+    seed = getattr(match, "seed", None)
+    if seed is None:
+        return getattr(match, "match_id", "") or ""
+    return seed
+
+
+def seeded_rng(seed: Seed, *scope: object) -> random.Random:
+    return random.Random(":".join(str(part) for part in (seed, *scope)))
+
+
+def match_rng(match: object, *scope: object) -> random.Random:
+    return seeded_rng(match_seed(match), *scope)
+
+
+def joke_start(match: object, player_key: str) -> int:
+    """Move number of the first joke for ``player_key``."""
+
+    return match_rng(match, "joke_start", player_key).randint(1, 10)
+
+
+__all__ = [
+    "joke_start",
+    "match_rng",
+    "match_seed",
+    "new_seed",
+    "seeded_rng",
+]
@@ -0,0 +1,365 @@
+"""Board-size agnostic bot targeting shared by the 10×10 and 15×15 modes.
+
+Boards are accessed through :class:`BoardView`, a thin adapter exposing the
+public cell state and whether a cell belongs to the shooting bot.  Cell
+states follow the common convention: ``0`` unknown, ``1`` ship, ``2`` miss,
+``3`` wounded, ``4`` sunk and ``5`` contour.
+
+A bot keeps two pieces of incremental state on the match: the wounded cells
+of the ship it is finishing (``target_hits``/``target_owner`` in its shots
+entry) and a :class:`TargetPool` of legal cells that is patched after every
+shot instead of rescanning the board.
+"""
+from __future__ import annotations
+
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+Coord = Tuple[int, int]
+
+SHOT_STATES = (2, 3, 4, 5)
+
+HUNT_RANDOM = "random"
+HUNT_DENSITY = "density"
+
+
+class BoardView:
+    """Read-only access to a board from the point of view of one shooter."""
+
+    __slots__ = ("size", "state_at", "is_own")
+
+    def __init__(
+        self,
+        size: int,
+        state_at: Callable[[Coord], int],
+        is_own: Callable[[Coord], bool],
+    ) -> None:
+        self.size = size
+        self.state_at = state_at
+        self.is_own = is_own
+
+    def in_bounds(self, coord: Coord) -> bool:
+        return 0 <= coord[0] < self.size and 0 <= coord[1] < self.size
+
+
+def normalize_coord(value: object) -> Optional[Coord]:
+    if isinstance(value, (list, tuple)) and len(value) >= 2:
+        try:
+            return int(value[0]), int(value[1])
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def is_adjacent(a: Coord, b: Coord) -> bool:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+
+def orthogonal_neighbors(coord: Coord, size: int) -> List[Coord]:
+    r, c = coord
+    neighbours: List[Coord] = []
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < size and 0 <= nc < size:
+            neighbours.append((nr, nc))
+    return neighbours
+
+
+def surrounding_cells(coords: Iterable[Coord], size: int) -> Set[Coord]:
+    """Return ``coords`` together with all of their neighbours."""
+
+    out: Set[Coord] = set()
+    for r, c in coords:
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    out.add((nr, nc))
+    return out
+
+
+def has_diagonal_wounded(view: BoardView, coord: Coord) -> bool:
+    r, c = coord
+    for dr in (-1, 1):
+        for dc in (-1, 1):
+            neighbour = (r + dr, c + dc)
+            if view.in_bounds(neighbour) and view.state_at(neighbour) == 3:
+                return True
+    return False
+
+
+def is_available(view: BoardView, coord: Coord) -> bool:
+    """Return ``True`` if shooting at ``coord`` can still find a ship cell."""
+
+    if not view.in_bounds(coord) or view.is_own(coord):
+        return False
+    if has_diagonal_wounded(view, coord):
+        return False
+    return view.state_at(coord) not in SHOT_STATES
+
+
+class TargetPool:
+    """Legal targets of a single shooter, patched after every shot.
+
+    The pool is seeded with one scan of the board.  Afterwards only the cells
+    around a shot (its 3×3 neighbourhood, the sunk ship and its contour) are
+    re-evaluated.  Picking is O(1) expected: a random slot is validated and
+    dropped lazily if the board changed behind our back.
+    """
+
+    __slots__ = ("view", "_cells", "_index")
+
+    def __init__(self, view: BoardView) -> None:
+        self.view = view
+        self._cells: List[Coord] = []
+        self._index: Dict[Coord, int] = {}
+        for r in range(view.size):
+            for c in range(view.size):
+                if is_available(view, (r, c)):
+                    self._add((r, c))
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, coord: object) -> bool:
+        return coord in self._index
+
+    def cells(self) -> List[Coord]:
+        return list(self._cells)
+
+    def _add(self, coord: Coord) -> None:
+        if coord in self._index:
+            return
+        self._index[coord] = len(self._cells)
+        self._cells.append(coord)
+
+    def _discard(self, coord: Coord) -> None:
+        idx = self._index.pop(coord, None)
+        if idx is None:
+            return
+        last = self._cells.pop()
+        if idx < len(self._cells):
+            self._cells[idx] = last
+            self._index[last] = idx
+
+    def refresh(self, coords: Iterable[Coord]) -> None:
+        for coord in coords:
+            if is_available(self.view, coord):
+                self._add(coord)
+            else:
+                self._discard(coord)
+
+    def record_shot(self, touched: Iterable[Coord]) -> None:
+        """Re-evaluate the neighbourhood of every cell changed by a shot."""
+
+        self.refresh(surrounding_cells(touched, self.view.size))
+
+    def pick(self, rng: random.Random) -> Optional[Coord]:
+        while self._cells:
+            coord = self._cells[rng.randrange(len(self._cells))]
+            if is_available(self.view, coord):
+                return coord
+            self._discard(coord)
+        return None
+
+
+def normalize_hits(view: BoardView, entry: Dict[str, object]) -> List[Coord]:
+    """Drop stale entries from ``entry['target_hits']`` and return the rest."""
+
+    normalized: List[Coord] = []
+    seen: Set[Coord] = set()
+    for item in entry.get("target_hits") or []:
+        coord = normalize_coord(item)
+        if coord is None or coord in seen:
+            continue
+        if view.in_bounds(coord) and view.state_at(coord) == 3:
+            normalized.append(coord)
+            seen.add(coord)
+    entry["target_hits"] = normalized
+    if not normalized:
+        entry["target_owner"] = None
+    return normalized
+
+
+def neighbor_candidates(view: BoardView, hits: Sequence[Coord]) -> List[Coord]:
+    candidates: List[Coord] = []
+    seen: Set[Coord] = set()
+    for hit in hits:
+        for candidate in orthogonal_neighbors(hit, view.size):
+            if candidate in seen:
+                continue
+            seen.add(candidate)
+            if is_available(view, candidate):
+                candidates.append(candidate)
+    return candidates
+
+
+def line_candidates(
+    view: BoardView,
+    hits: Sequence[Coord],
+    ship_cells: Optional[Sequence[Coord]] = None,
+) -> List[Coord]:
+    """Return the cells extending the line formed by ``hits``.
+
+    ``ship_cells`` lets a caller that knows the wounded ship's layout aim at
+    its remaining cells directly.
+    """
+
+    if not hits:
+        return []
+    if ship_cells:
+        remaining = [
+            coord
+            for coord in ship_cells
+            if coord not in hits and is_available(view, coord)
+        ]
+        if remaining:
+            return remaining
+
+    rows = {r for r, _ in hits}
+    cols = {c for _, c in hits}
+    candidates: List[Coord] = []
+    seen: Set[Coord] = set()
+    if len(rows) == 1:
+        ordered = sorted(hits, key=lambda item: item[1])
+        deltas = ((0, -1), (0, 1))
+    elif len(cols) == 1:
+        ordered = sorted(hits, key=lambda item: item[0])
+        deltas = ((-1, 0), (1, 0))
+    else:
+        return candidates
+    for r, c in (ordered[0], ordered[-1]):
+        for dr, dc in deltas:
+            candidate = (r + dr, c + dc)
+            if candidate in seen:
+                continue
+            seen.add(candidate)
+            if is_available(view, candidate):
+                candidates.append(candidate)
+    return candidates
+
+
+def density_scores(
+    view: BoardView,
+    fleet: Sequence[int],
+    candidates: Iterable[Coord],
+) -> Dict[Coord, int]:
+    """Count how many placements of the remaining ``fleet`` cover each cell."""
+
+    open_cells = set(candidates)
+    scores: Dict[Coord, int] = {coord: 0 for coord in open_cells}
+    for size in fleet:
+        for r in range(view.size):
+            for c in range(view.size):
+                shapes = [[(r, c + i) for i in range(size)]]
+                if size > 1:
+                    shapes.append([(r + i, c) for i in range(size)])
+                for cells in shapes:
+                    if all(cell in open_cells for cell in cells):
+                        for cell in cells:
+                            scores[cell] += 1
+    return scores
+
+
+def hunt_target(
+    view: BoardView,
+    rng: random.Random,
+    *,
+    pool: Optional[TargetPool] = None,
+    strategy: str = HUNT_RANDOM,
+    fleet: Optional[Sequence[int]] = None,
+) -> Optional[Coord]:
+    """Pick a cell while no wounded ship is being finished."""
+
+    if pool is None:
+        pool = TargetPool(view)
+    if strategy == HUNT_DENSITY and fleet:
+        candidates = [coord for coord in pool.cells() if is_available(view, coord)]
+        if not candidates:
+            return None
+        scores = density_scores(view, fleet, candidates)
+        best = max(scores.values())
+        if best > 0:
+            top = sorted(coord for coord, score in scores.items() if score == best)
+            return rng.choice(top)
+    return pool.pick(rng)
+
+
+def choose_target(
+    view: BoardView,
+    entry: Dict[str, object],
+    rng: random.Random,
+    *,
+    pool: Optional[TargetPool] = None,
+    strategy: str = HUNT_RANDOM,
+    fleet: Optional[Sequence[int]] = None,
+    ship_cells: Optional[Callable[[Sequence[Coord]], Optional[Sequence[Coord]]]] = None,
+) -> Optional[Coord]:
+    """Finish the wounded ship recorded in ``entry`` or hunt for a new one."""
+
+    hits = normalize_hits(view, entry)
+    if hits:
+        if len(hits) == 1:
+            neighbours = neighbor_candidates(view, hits)
+            if neighbours:
+                rng.shuffle(neighbours)
+                return neighbours[0]
+        else:
+            known = ship_cells(hits) if ship_cells is not None else None
+            candidates = line_candidates(view, hits, known)
+            if candidates:
+                rng.shuffle(candidates)
+                return candidates[0]
+            neighbours = neighbor_candidates(view, hits)
+            if neighbours:
+                rng.shuffle(neighbours)
+                return neighbours[0]
+    return hunt_target(view, rng, pool=pool, strategy=strategy, fleet=fleet)
+
+
+def record_result(
+    view: BoardView,
+    entry: Dict[str, object],
+    coord: Coord,
+    result: str,
+    owner: Optional[str] = None,
+) -> None:
+    """Update the target-mode state of ``entry`` after its own shot."""
+
+    hits = normalize_hits(view, entry)
+    if result == "kill":
+        entry["target_hits"] = []
+        entry["target_owner"] = None
+        return
+    if result != "hit":
+        return
+    if entry.get("target_owner") not in (None, owner):
+        hits = []
+    if hits and not any(is_adjacent(hit, coord) for hit in hits):
+        hits = []
+    if coord not in hits:
+        hits.append(coord)
+    entry["target_hits"] = hits
+    entry["target_owner"] = owner
+
+
+__all__ = [
+    "BoardView",
+    "Coord",
+    "HUNT_DENSITY",
+    "HUNT_RANDOM",
+    "TargetPool",
+    "choose_target",
+    "density_scores",
+    "has_diagonal_wounded",
+    "hunt_target",
+    "is_adjacent",
+    "is_available",
+    "line_candidates",
+    "neighbor_candidates",
+    "normalize_coord",
+    "normalize_hits",
+    "orthogonal_neighbors",
+    "record_result",
+    "surrounding_cells",
+]
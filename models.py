@@ -3,7 +3,8 @@ from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Optional
 from datetime import datetime
 import uuid
-import random
+
+from logic.rng import new_seed
 
 
 Coord = Tuple[int, int]  # row, col indexes
@@ -24,6 +25,8 @@ class Board:
     highlight: List[Coord] = field(default_factory=list)
     # owner key ("A", "B" or "C") used for colouring
     owner: Optional[str] = None
+    # seed the fleet layout was generated from (auto placement only)
+    layout_seed: Optional[int] = None
 
 
 @dataclass
@@ -38,6 +41,8 @@ class Player:
 class Match:
     match_id: str
     status: str = "waiting"  # waiting|placing|playing|finished
+    # root of all per-match randomness, see ``logic.rng``
+    seed: Optional[int] = field(default_factory=new_seed)
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     players: Dict[str, Player] = field(default_factory=dict)
     turn: str = "A"
@@ -53,7 +58,7 @@ class Match:
                 "history": [],
                 "last_result": None,
                 "move_count": 0,
-                "joke_start": random.randint(1, 10),
+                "joke_start": None,
             }
             for k in ("A", "B", "C")
         }
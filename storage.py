@@ -183,6 +183,8 @@ def _board_to_payload(board: Board) -> dict:
         ],
         "owner": board.owner,
     }
+    if board.layout_seed is not None:
+        payload["layout_seed"] = board.layout_seed
     return payload
 
 
@@ -198,6 +200,7 @@ def _board_from_payload(owner: str, data: dict) -> Board:
         _coord_from_value(coord) for coord in data.get("highlight", [])
     ]
     board.owner = data.get("owner", owner)
+    board.layout_seed = data.get("layout_seed")
     return board
 
 
@@ -231,6 +234,7 @@ def _match_to_payload(match: Match) -> dict:
         "match_id": match.match_id,
         "status": match.status,
         "created_at": getattr(match, "created_at", datetime.utcnow().isoformat()),
+        "seed": getattr(match, "seed", None),
         "turn": match.turn,
         "players": players_payload,
         "boards": boards_payload,
@@ -257,6 +261,7 @@ def _payload_to_match(payload: dict) -> Match:
         match_id=payload.get("match_id", ""),
         status=payload.get("status", "waiting"),
         created_at=payload.get("created_at", datetime.utcnow().isoformat()),
+        seed=payload.get("seed"),
     )
     match.turn = payload.get("turn", match.turn)
 
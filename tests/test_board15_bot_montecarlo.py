@@ -0,0 +1,124 @@
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from game_board15 import handlers
+from game_board15.bot_montecarlo import (
+    MAX_SAMPLES,
+    build_hunt_problem,
+    choose_hard_target,
+    estimate_hit_density,
+)
+from game_board15.bot_targeting import _is_available_target
+from game_board15.models import Match15
+from game_board15.placement import generate_field
+
+
+def _playing_match(match_id: str) -> Match15:
+    match = Match15(match_id=match_id)
+    match.field, _ = generate_field()
+    match.status = "playing"
+    return match
+
+
+def test_hard_target_is_legal_on_fresh_field() -> None:
+    match = _playing_match("mc-fresh")
+    problem = build_hunt_problem(match, "B")
+
+    coord = choose_hard_target(problem, 50, seed=1)
+
+    assert coord is not None
+    assert _is_available_target(match.field, "B", coord)
+
+
+def test_density_respects_public_hit() -> None:
+    match = Match15(match_id="mc-hit")
+    match.status = "playing"
+    match.field.set_state((7, 7), 3, "A")
+
+    problem = build_hunt_problem(match, "B")
+    counts, samples = estimate_hit_density(problem, 300, seed=3)
+
+    assert samples > 0
+    assert (7, 7) not in counts
+    for neighbour in ((6, 7), (8, 7), (7, 6), (7, 8)):
+        assert counts.get(neighbour, 0) > 0
+    for diagonal in ((6, 6), (6, 8), (8, 6), (8, 8)):
+        assert counts.get(diagonal, 0) == 0
+
+
+def test_select_bot_target_uses_hard_search(monkeypatch) -> None:
+    match = _playing_match("mc-hard")
+    match.messages.setdefault("_flags", {})["bot_difficulty"] = "hard"
+    called = {}
+
+    def fake_choose(problem, samples, seed, budget_ms):
+        called["samples"] = samples
+        called["budget_ms"] = budget_ms
+        return problem.candidates[0]
+
+    monkeypatch.setattr(handlers, "choose_hard_target", fake_choose)
+
+    coord = asyncio.run(
+        handlers._select_bot_target(match, "B", match.shots["B"], random.Random(0))
+    )
+
+    assert called["samples"] == MAX_SAMPLES
+    assert called["budget_ms"] == handlers.BOARD15_HARD_BOT_BUDGET_MS
+    assert coord == build_hunt_problem(match, "B").candidates[0]
+
+    monkeypatch.setattr(handlers, "BOARD15_HARD_BOT_REPLAY", True)
+    asyncio.run(handlers._select_bot_target(match, "B", match.shots["B"], random.Random(0)))
+
+    assert called["samples"] == handlers.BOARD15_HARD_BOT_SAMPLES
+    assert called["budget_ms"] == handlers.BOARD15_HARD_BOT_BUDGET_MS
+
+
+def test_hard_search_stops_at_budget() -> None:
+    match = _playing_match("mc-budget")
+    problem = build_hunt_problem(match, "B")
+
+    started = time.perf_counter()
+    counts, found = estimate_hit_density(problem, 10**9, seed=2, budget_ms=20)
+    elapsed = time.perf_counter() - started
+
+    assert 0 < found < 10**9
+    assert counts
+    assert elapsed < 1.0
+
+
+def test_add_hard_bot_sets_difficulty_flag(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(handlers.storage, "find_match_by_user", lambda *a: match)
+    monkeypatch.setattr(handlers.storage, "append_snapshot", lambda *a, **k: None)
+    monkeypatch.setattr(handlers, "ensure_auto_play_bots", AsyncMock())
+    match = Match15.new(1, 1, "Игрок A")
+    match.players["B"] = handlers.Player(user_id=2, chat_id=2, name="Игрок B")
+
+    query = SimpleNamespace(
+        data="b15_add_bot_hard",
+        from_user=SimpleNamespace(id=1),
+        message=SimpleNamespace(
+            chat=SimpleNamespace(id=1),
+            reply_text=AsyncMock(),
+            edit_reply_markup=AsyncMock(),
+        ),
+        answer=AsyncMock(),
+    )
+    context = SimpleNamespace(bot=SimpleNamespace(send_message=AsyncMock()), bot_data={})
+
+    asyncio.run(handlers.add_board15_bot(SimpleNamespace(callback_query=query), context))
+
+    assert match.messages["_flags"]["bot_difficulty"] == "hard"
+    assert handlers._bot_difficulty(match) == "hard"
+
+
+def test_hard_search_depends_only_on_seed() -> None:
+    match = Match15(match_id="mc-replay")
+    match.field, _ = generate_field(random.Random(4))
+    match.status = "playing"
+    problem = build_hunt_problem(match, "B")
+
+    assert estimate_hit_density(problem, 200, seed=9) == estimate_hit_density(problem, 200, seed=9)
+    assert choose_hard_target(problem, 200, seed=9) == choose_hard_target(problem, 200, seed=9)
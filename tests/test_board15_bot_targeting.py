@@ -169,3 +169,88 @@ def test_available_target_skips_diagonal_near_wounded() -> None:
     assert not _is_available_target(field, "B", (4, 4))
     assert not _is_available_target(field, "B", (6, 6))
     assert _is_available_target(field, "B", (5, 6))
+
+
+def test_target_pool_tracks_shots_incrementally() -> None:
+    from game_board15.battle import apply_shot
+    from game_board15.bot_targeting import BOARD_SIZE, _target_pool
+    from game_board15.placement import generate_field
+
+    match = Match15(match_id="pool")
+    match.field, _ = generate_field()
+    match.status = "playing"
+    match.turn_idx = match.order.index("B")
+    pool = _target_pool(match, "B")
+    rng = random.Random(5)
+
+    for _ in range(60):
+        coord = pool.pick(rng)
+        assert coord is not None
+        result = apply_shot(match, "B", coord)
+        _update_bot_target_state(match, "B", result)
+        expected = {
+            (r, c)
+            for r in range(BOARD_SIZE)
+            for c in range(BOARD_SIZE)
+            if _is_available_target(match.field, "B", (r, c))
+        }
+        assert set(pool._cells) == expected
+        assert _target_pool(match, "B") is pool
+
+
+def test_choose_bot_target_uses_pool_when_hunting() -> None:
+    from game_board15.bot_targeting import _target_pool
+
+    match = Match15(match_id="hunt")
+    entry = match.shots["B"]
+    pool = _target_pool(match, "B")
+    match.field.set_state((0, 0), 2, None)
+
+    coord = _choose_bot_target(match.field, "B", entry, random.Random(0), pool=pool)
+
+    assert coord is not None
+    assert _is_available_target(match.field, "B", coord)
+
+
+def test_target_pool_survives_match_reload(monkeypatch) -> None:
+    import copy
+
+    from game_board15 import bot_targeting
+    from game_board15.battle import apply_shot
+    from game_board15.bot_targeting import BOARD_SIZE, _drop_target_pools, _target_pool
+    from game_board15.placement import generate_field
+
+    scans = []
+    pool_init = bot_targeting.TargetPool.__init__
+
+    def counting_init(self, field, shooter):
+        scans.append(shooter)
+        pool_init(self, field, shooter)
+
+    monkeypatch.setattr(bot_targeting.TargetPool, "__init__", counting_init)
+    match = Match15(match_id="pool-reload")
+    match.field, _ = generate_field(random.Random(3))
+    match.status = "playing"
+    match.turn_idx = match.order.index("B")
+    pool = _target_pool(match, "B")
+    rng = random.Random(8)
+    try:
+        for _ in range(30):
+            # The bot loop works on a fresh copy of the match every move.
+            match = copy.deepcopy(match)
+            assert _target_pool(match, "B") is pool
+            coord = pool.pick(rng)
+            result = apply_shot(match, "B", coord)
+            _update_bot_target_state(match, "B", result)
+            expected = {
+                (r, c)
+                for r in range(BOARD_SIZE)
+                for c in range(BOARD_SIZE)
+                if _is_available_target(match.field, "B", (r, c))
+            }
+            assert set(pool.cells()) == expected
+        assert scans == ["B"]
+    finally:
+        _drop_target_pools("pool-reload")
+    assert _target_pool(match, "B") is not pool
+    _drop_target_pools("pool-reload")
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+
+import pytest
+
+from game_board15.compute import ComputeExecutor
+
+
+def test_compute_executor_runs_jobs_off_loop() -> None:
+    executor = ComputeExecutor("thread", 2)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        result = await executor.run(lambda: threading.get_ident(), match_id="m1")
+        assert result != loop_thread
+        assert await executor.run(sum, [1, 2, 3]) == 6
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown(wait=True)
+
+
+def test_compute_executor_cancels_match_jobs() -> None:
+    executor = ComputeExecutor("thread", 1)
+    release = threading.Event()
+
+    async def run():
+        blocker = asyncio.ensure_future(executor.run(release.wait, 5, match_id="busy"))
+        queued = asyncio.ensure_future(executor.run(sum, [1], match_id="done"))
+        await asyncio.sleep(0.05)
+        assert executor.cancel_match("done") == 1
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        assert await blocker is True
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown(wait=True)
@@ -65,7 +65,7 @@ def test_router_text_skips_dummy_chat_notifications(monkeypatch):
             lambda *args, **kwargs: ShotResult(result=MISS, owner=None, coord=(0, 0)),
         )
         monkeypatch.setattr(router15, "_phrase_or_joke", lambda m, pk, ph: "")
-        monkeypatch.setattr(router15, "random_phrase", lambda phrases: "")
+        monkeypatch.setattr(router15, "random_phrase", lambda phrases, rng=None: "")
 
         send_state = AsyncMock()
         monkeypatch.setattr(router15, "_send_state", send_state)
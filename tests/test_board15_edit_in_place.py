@@ -0,0 +1,91 @@
+import asyncio
+import time
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from telegram import InputMediaPhoto
+from telegram.error import BadRequest
+
+from app import file_ids
+from app.file_ids import FileIdCache
+from game_board15 import router as router15
+from game_board15.models import Match15
+
+
+def _photo(message_id, file_id):
+    return SimpleNamespace(message_id=message_id, photo=[SimpleNamespace(file_id=file_id)])
+
+
+def _setup(monkeypatch, tmp_path, *, edit_in_place=True):
+    monkeypatch.setattr(file_ids, "_cache", FileIdCache(tmp_path / "ids.json"))
+    frames = iter(range(1000))
+
+    def fake_render(state, player_key):
+        buffer = BytesIO(b"frame-%d" % next(frames))
+        buffer.name = "board.png"
+        state.rendered_ship_cells = 20
+        return buffer
+
+    monkeypatch.setattr(router15, "render_board", fake_render)
+    match = Match15.new(1, 101, "Tester")
+    match.messages.setdefault("_flags", {})["board15_edit_in_place"] = edit_in_place
+    sent_ids = iter(range(10, 1000))
+    context = SimpleNamespace(
+        bot=SimpleNamespace(
+            send_photo=AsyncMock(side_effect=lambda *a, **k: _photo(next(sent_ids), "sent")),
+            edit_message_media=AsyncMock(return_value=_photo(10, "edited")),
+        ),
+        bot_data={},
+    )
+    return match, context
+
+
+def test_edit_in_place_updates_last_board_message(monkeypatch, tmp_path):
+    match, context = _setup(monkeypatch, tmp_path)
+
+    async def run():
+        await router15._send_state(context, match, "A", "first")
+        await router15._send_state(context, match, "A", "second")
+
+    asyncio.run(run())
+
+    assert context.bot.send_photo.await_count == 1
+    kwargs = context.bot.edit_message_media.await_args.kwargs
+    assert kwargs["message_id"] == 10
+    assert isinstance(kwargs["media"], InputMediaPhoto)
+    assert kwargs["media"].caption == "second"
+    msgs = match.messages["A"]
+    assert msgs["board"] == 10
+    assert msgs["board_history"] == [10]
+    assert msgs["text_history"] == ["first", "second"]
+
+
+def test_failed_or_stale_edit_falls_back_to_new_photo(monkeypatch, tmp_path):
+    match, context = _setup(monkeypatch, tmp_path)
+    context.bot.edit_message_media.side_effect = BadRequest("Message to edit not found")
+
+    async def run():
+        await router15._send_state(context, match, "A", "first")
+        await router15._send_state(context, match, "A", "second")
+        match.messages["A"]["board_sent_at"] = time.time() - router15.BOARD15_EDIT_MAX_AGE - 1
+        await router15._send_state(context, match, "A", "third")
+
+    asyncio.run(run())
+
+    assert context.bot.edit_message_media.await_count == 1
+    assert context.bot.send_photo.await_count == 3
+    assert match.messages["A"]["board_history"] == [10, 11, 12]
+
+
+def test_edit_in_place_is_off_without_the_match_flag(monkeypatch, tmp_path):
+    match, context = _setup(monkeypatch, tmp_path, edit_in_place=False)
+
+    async def run():
+        await router15._send_state(context, match, "A", "first")
+        await router15._send_state(context, match, "A", "second")
+
+    asyncio.run(run())
+
+    context.bot.edit_message_media.assert_not_awaited()
+    assert match.messages["A"]["board_history"] == [10, 11]
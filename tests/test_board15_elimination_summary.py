@@ -85,7 +85,7 @@ def test_router_text_sends_elimination_and_final_summary(monkeypatch):
         monkeypatch.setattr(router15.parser, "parse_coord", fake_parse_coord)
         monkeypatch.setattr(router15.parser, "format_coord", fake_format_coord)
         monkeypatch.setattr(router15, "_phrase_or_joke", lambda m, pk, ph: "")
-        monkeypatch.setattr(router15, "random_phrase", lambda phrases: "")
+        monkeypatch.setattr(router15, "random_phrase", lambda phrases, rng=None: "")
         monkeypatch.setattr(router15, "_send_state", fake_send_state)
 
         update = SimpleNamespace(
@@ -0,0 +1,55 @@
+from PIL import Image, features
+import pytest
+
+from game_board15 import encode
+from game_board15 import render as render_mod
+from game_board15.render_benchmark import build_scenarios
+
+
+def _frames():
+    return [render_mod.compose_board(state, key) for state, key in build_scenarios(depths=(0, 120))]
+
+
+def test_palette_png_is_exact_and_smaller():
+    for frame in _frames():
+        truecolour = encode.encode_frame(frame, encode.FORMAT_PNG).getvalue()
+        buffer = encode.encode_frame(frame, encode.FORMAT_PALETTE)
+        decoded = Image.open(buffer)
+
+        assert buffer.name == "board.png"
+        assert decoded.mode == "P"
+        assert decoded.convert("RGBA").tobytes() == frame.tobytes()
+        assert len(buffer.getvalue()) < len(truecolour)
+
+
+def test_palette_falls_back_to_truecolour_png():
+    gradient = Image.linear_gradient("L").resize((64, 64))
+    noisy = Image.merge("RGB", (gradient, gradient.rotate(90), gradient.rotate(180)))
+    encode.reset_encode_stats()
+
+    decoded = Image.open(encode.encode_frame(noisy, encode.FORMAT_PALETTE))
+
+    assert decoded.mode == "RGB"
+    assert decoded.tobytes() == noisy.tobytes()
+    assert encode.encode_stats()[encode.FORMAT_PNG]["frames"] == 1
+
+
+def test_channel_tables_give_every_colour_its_index():
+    colors = [(v, v, v) for v in range(0, 256, 2)] + [(0, 115, 255), (255, 140, 0), (46, 176, 75)]
+    red, green, blue = encode._channel_tables(colors)
+    assert [(red[r] + green[g] + blue[b]) % 256 for r, g, b in colors] == list(range(len(colors)))
+
+
+@pytest.mark.skipif(not features.check("webp"), reason="Pillow built without WebP")
+def test_webp_is_lossless_and_counted():
+    frame = _frames()[-1]
+    encode.reset_encode_stats()
+
+    buffer = encode.encode_frame(frame, encode.FORMAT_WEBP)
+
+    assert buffer.name == "board.webp"
+    assert Image.open(buffer).convert("RGBA").tobytes() == frame.tobytes()
+    stats = encode.encode_stats()[encode.FORMAT_WEBP]
+    assert stats["frames"] == 1
+    assert stats["bytes"] == len(buffer.getvalue())
+    assert stats["mean_ms"] > 0
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from game_board15 import router as router15
+from game_board15.models import Match15, Player
+
+
+def _match():
+    match = Match15.new(1, 101, "A")
+    match.players["B"] = Player(user_id=2, chat_id=102, name="B")
+    match.players["C"] = Player(user_id=3, chat_id=103, name="C")
+    return match
+
+
+def test_players_are_served_concurrently_in_order(monkeypatch):
+    match = _match()
+    delivered = []
+
+    async def send_state(context, match_obj, player_key, message, *, snapshot=None):
+        await asyncio.sleep(0.05)
+        delivered.append((player_key, message))
+
+    monkeypatch.setattr(router15, "_send_state", send_state)
+    started = time.perf_counter()
+    asyncio.run(
+        router15._deliver_states(
+            None,
+            match,
+            {"A": ["self"], "B": ["enemy-B"], "C": ["enemy-C"]},
+            eliminated=["C"],
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    notice = router15._elimination_text(match, "C")
+    for key, first in (("A", "self"), ("B", "enemy-B"), ("C", "enemy-C")):
+        assert [message for player, message in delivered if player == key] == [first, notice]
+    # Two sends per player, players in parallel.
+    assert elapsed < 0.25
+
+
+def test_strict_failure_is_raised_after_other_players_are_served(monkeypatch):
+    match = _match()
+    delivered = []
+
+    async def send_state(context, match_obj, player_key, message, *, snapshot=None):
+        if player_key == "A":
+            raise RuntimeError("upload failed")
+        await asyncio.sleep(0.01)
+        delivered.append(player_key)
+
+    monkeypatch.setattr(router15, "_send_state", send_state)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            router15._deliver_states(
+                None, match, {"A": ["self"], "B": ["enemy"], "C": ["enemy"]}, strict="A"
+            )
+        )
+    assert sorted(delivered) == ["B", "C"]
+
+
+def test_players_sharing_a_chat_are_served_in_turn(monkeypatch):
+    match = _match()
+    match.players["C"].chat_id = match.players["B"].chat_id
+    events = []
+
+    async def send_state(context, match_obj, player_key, message, *, snapshot=None):
+        chat_id = match_obj.players[player_key].chat_id
+        events.append(("start", chat_id, player_key, message))
+        await asyncio.sleep(0.02)
+        events.append(("end", chat_id, player_key, message))
+
+    monkeypatch.setattr(router15, "_send_state", send_state)
+    asyncio.run(
+        router15._deliver_states(
+            None,
+            match,
+            {"A": ["self"], "B": ["enemy-B", "more-B"], "C": ["enemy-C"]},
+        )
+    )
+
+    shared = [event for event in events if event[1] == 102]
+    # Sends to the shared chat never overlap and keep each player's order.
+    assert [event[0] for event in shared] == ["start", "end"] * 3
+    assert [event[3] for event in shared if event[0] == "end"] == ["enemy-B", "more-B", "enemy-C"]
+    # The other chat was served alongside the shared one.
+    first_a = next(idx for idx, event in enumerate(events) if event[1] == 101)
+    assert first_a < len(events) // 2
@@ -0,0 +1,194 @@
+from game_board15 import render as render_mod
+from game_board15.models import Field15
+
+
+def _state(**kwargs):
+    field = Field15()
+    history = [[0] * 15 for _ in range(15)]
+    return render_mod.RenderState(field=field, history=history, footer_label="", **kwargs)
+
+
+def test_render_reuses_base_layer_without_mutating_it():
+    base = render_mod._base_layer()
+    pristine = base.tobytes()
+
+    state = _state(last_move=(0, 0))
+    state.history[0][0] = [3, "B", 0]
+    state.field.grid[0][0] = 3
+    state.field.owners[0][0] = "B"
+    first = render_mod.render_board(state, "A").getvalue()
+    second = render_mod.render_board(state, "A").getvalue()
+
+    assert render_mod._base_layer() is base
+    assert base.tobytes() == pristine
+    assert first == second
+
+
+def test_fonts_are_loaded_once():
+    assert render_mod._load_font(render_mod.AXIS_FONT_SIZE) is render_mod._load_font(
+        render_mod.AXIS_FONT_SIZE
+    )
+
+
+def test_frame_margins_come_from_base_layer():
+    image = render_mod.Image.open(render_mod.render_board(_state(), "A")).convert("RGBA")
+    base = render_mod._base_layer()
+
+    top = (0, 0, render_mod.IMAGE_WIDTH, render_mod.MARGIN_TOP)
+    left = (0, 0, render_mod.MARGIN_LEFT, render_mod.IMAGE_HEIGHT)
+    assert image.crop(top).tobytes() == base.crop(top).tobytes()
+    assert image.crop(left).tobytes() == base.crop(left).tobytes()
+
+
+def test_sprite_frames_match_primitive_painter():
+    from game_board15.render_benchmark import build_scenarios
+
+    for state, key in build_scenarios(depths=(0, 90, 180)):
+        sprite_frame = render_mod.compose_board(state, key)
+        sprite_count = state.rendered_ship_cells
+        reference = render_mod.compose_board(state, key, sprites=False)
+        assert sprite_frame.tobytes() == reference.tobytes()
+        assert sprite_count == state.rendered_ship_cells
+
+
+def test_benchmark_baseline_draws_the_same_frames():
+    from game_board15.render_benchmark import build_scenarios, compose_baseline
+
+    for state, key in build_scenarios(depths=(0, 120)):
+        expected = render_mod.compose_board(state, key).tobytes()
+        assert compose_baseline(state, key).tobytes() == expected
+
+
+def test_visible_own_count_matches_rendered_count():
+    from game_board15.render_benchmark import build_scenarios
+
+    for state, key in build_scenarios(depths=(0, 90, 180)):
+        expected = render_mod.count_visible_own_cells(state.field, state.history, key)
+        render_mod.compose_board(state, key)
+        assert expected == state.rendered_ship_cells
+
+
+def test_cell_sprites_are_built_once_per_recipe():
+    recipe = (("fill", (10, 20, 30)), ("cross",), ("outline",))
+    sprite = render_mod._cell_sprite(recipe)
+    assert render_mod._cell_sprite(recipe) is sprite
+    assert sprite.size == (render_mod.SPRITE_SIZE, render_mod.SPRITE_SIZE)
+
+
+def test_incremental_frames_match_full_renders():
+    import random
+
+    from game_board15 import battle, storage
+    from game_board15 import router as router15
+    from game_board15.models import Match15, PLAYER_ORDER
+
+    render_mod.clear_frame_cache()
+    match = Match15.new(1, 1, "Alice")
+    match.status = "playing"
+    rng = random.Random(5)
+    cells = [(r, c) for r in range(15) for c in range(15)]
+    rng.shuffle(cells)
+    patched = 0
+    for coord in cells[:60]:
+        shooter = match.turn
+        r, c = coord
+        if match.field.grid[r][c] not in (0, 1) or match.field.owners[r][c] == shooter:
+            continue
+        result = battle.apply_shot(match, shooter, coord)
+        router15._update_history(match, shooter, result)
+        snapshot = match.create_snapshot()
+        previous = match.snapshots[-2]
+        idx = len(match.snapshots) - 1
+        changed = storage.snapshot_changed_cells(previous, snapshot)
+        changed |= storage.snapshot_fresh_cells(previous)
+        for key in PLAYER_ORDER:
+            state = render_mod.RenderState(
+                field=snapshot.field,
+                history=snapshot.cell_history,
+                footer_label="",
+                reveal_ships=False,
+                last_move=snapshot.last_move,
+                color_map=dict(match.color_map),
+                delta=render_mod.FrameDelta(
+                    key=match.match_id,
+                    base_version=(idx - 1, len(previous.shot_history)),
+                    version=(idx, len(snapshot.shot_history)),
+                    cells=frozenset(changed),
+                ),
+            )
+            cached = render_mod._frames.get(match.match_id)
+            patched += cached is not None and cached.version == state.delta.base_version
+            frame = render_mod.render_frame(state, key)
+            frame_count = state.rendered_ship_cells
+            full = render_mod.compose_board(state, key)
+            assert frame.tobytes() == full.tobytes()
+            assert frame_count == state.rendered_ship_cells
+        match.turn_idx = (match.turn_idx + 1) % len(match.order)
+    assert patched > 0
+    render_mod.clear_frame_cache()
+
+
+def test_frame_cache_falls_back_when_base_is_unknown():
+    render_mod.clear_frame_cache()
+    state = _state(
+        delta=render_mod.FrameDelta(
+            key="m", base_version=(4, 4), version=(5, 5), cells=frozenset({(0, 0)})
+        )
+    )
+    state.field.grid[3][3] = 2
+    frame = render_mod.render_frame(state, "A")
+    assert frame.tobytes() == render_mod.compose_board(state, "A").tobytes()
+    assert render_mod._frames["m"].version == (5, 5)
+    render_mod.clear_frame_cache()
+
+
+def test_views_of_a_snapshot_share_one_public_layer(monkeypatch):
+    from game_board15.render_benchmark import build_scenarios
+
+    render_mod.clear_frame_cache()
+    builds = []
+    compose_public = render_mod._compose_public
+
+    def counting_compose_public(state, version):
+        builds.append(version)
+        return compose_public(state, version)
+
+    monkeypatch.setattr(render_mod, "_compose_public", counting_compose_public)
+    scenarios = build_scenarios(depths=(120,))
+    for reveal in (False, True):
+        for state, key in scenarios:
+            state.reveal_ships = reveal
+            state.delta = render_mod.FrameDelta(
+                key="shared", base_version=None, version=(0, 0), cells=frozenset()
+            )
+            frame = render_mod.render_frame(state, key)
+            frame_count = state.rendered_ship_cells
+            full = render_mod.compose_board(state, key)
+            assert frame.tobytes() == full.tobytes()
+            assert frame_count == state.rendered_ship_cells == 20
+
+    assert len(builds) == 1
+    render_mod.clear_frame_cache()
+
+
+def test_view_overlay_is_composed_outside_the_frame_lock(monkeypatch):
+    from game_board15.render_benchmark import build_scenarios
+
+    render_mod.clear_frame_cache()
+    finish_view = render_mod._finish_view
+    locked = []
+
+    def checking_finish_view(image, private, state, player_key):
+        locked.append(render_mod._frames_lock.locked())
+        return finish_view(image, private, state, player_key)
+
+    monkeypatch.setattr(render_mod, "_finish_view", checking_finish_view)
+    for state, key in build_scenarios(depths=(60,)):
+        state.delta = render_mod.FrameDelta(
+            key="lock", base_version=None, version=(0, 0), cells=frozenset()
+        )
+        frame = render_mod.render_frame(state, key, backend="pil")
+        assert frame.tobytes() == render_mod.compose_board(state, key).tobytes()
+
+    assert locked and not any(locked)
+    render_mod.clear_frame_cache()
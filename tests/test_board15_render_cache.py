@@ -0,0 +1,70 @@
+from game_board15 import render as render_mod
+from game_board15 import render_cache
+from game_board15.models import Field15
+from game_board15.render_cache import CachedFrame, RenderCache
+
+
+def _state(**kwargs):
+    field = Field15()
+    field.grid[0][0] = 1
+    field.owners[0][0] = "A"
+    history = [[[0, None, 1] for _ in range(15)] for _ in range(15)]
+    return render_mod.RenderState(field=field, history=history, footer_label="", **kwargs)
+
+
+def test_identical_views_are_served_from_cache(monkeypatch):
+    cache = RenderCache(1 << 20)
+    monkeypatch.setattr(render_cache, "_cache", cache)
+    state = _state(reveal_ships=False)
+
+    first = render_mod.render_board(state, "A")
+    state.rendered_ship_cells = 0
+    second = render_mod.render_board(state, "A")
+
+    assert second.getvalue() == first.getvalue()
+    assert second.name == first.name
+    assert state.rendered_ship_cells == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["bytes"] == len(first.getvalue())
+
+
+def test_view_digest_covers_everything_the_pixels_depend_on():
+    state = _state(reveal_ships=False)
+    base = render_cache.view_digest(state, "A")
+
+    assert render_cache.view_digest(state, "B") != base
+    assert render_cache.view_digest(state, "A", salt="webp") != base
+    state.reveal_ships = True
+    assert render_cache.view_digest(state, "A") != base
+    state.reveal_ships = False
+    state.color_map = {"A": "B", "B": "A", "C": "C"}
+    assert render_cache.view_digest(state, "A") != base
+    state.color_map = {key: key for key in "ABC"}
+    state.history[3][3] = [2, None, 0]
+    assert render_cache.view_digest(state, "A") != base
+    state.history[3][3] = [0, None, 1]
+    state.footer_label = "not drawn"
+    assert render_cache.view_digest(state, "A") == base
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    cache = RenderCache(25)
+    for key in "abc":
+        if key == "c":
+            assert cache.get("a") is not None
+        cache.put(key, CachedFrame(data=b"x" * 10, name="board.png", visible_own=20))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] == 20
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = RenderCache(0)
+    cache.put("a", CachedFrame(data=b"x", name="board.png", visible_own=20))
+
+    assert not cache.enabled
+    assert cache.get("a") is None
@@ -0,0 +1,126 @@
+import random
+import sys
+
+import pytest
+
+from game_board15 import render as render_mod
+from game_board15.render_benchmark import build_scenarios
+from game_board15.render_preview import build_preview_state
+
+np = pytest.importorskip("numpy")
+
+from game_board15 import render_numpy  # noqa: E402
+from game_board15.render_numpy import compose_board_numpy  # noqa: E402
+
+
+def test_numpy_backend_matches_preview_scene():
+    field, history = build_preview_state()
+    for key in render_mod.PLAYER_ORDER:
+        for reveal in (False, True):
+            state = render_mod.RenderState(
+                field=field,
+                history=history,
+                footer_label="Preview",
+                reveal_ships=reveal,
+                last_move=field.last_move,
+            )
+            vectorised = compose_board_numpy(state, key)
+            count = state.rendered_ship_cells
+            reference = render_mod.compose_board(state, key)
+            assert vectorised.tobytes() == reference.tobytes()
+            assert count == state.rendered_ship_cells
+
+
+def test_numpy_backend_matches_played_games():
+    for state, key in build_scenarios(depths=(0, 90, 180)):
+        for last_move in (state.last_move, (0, 0), (14, 14)):
+            state.last_move = last_move
+            vectorised = compose_board_numpy(state, key)
+            reference = render_mod.compose_board(state, key)
+            assert vectorised.tobytes() == reference.tobytes()
+
+
+def test_numpy_frames_use_and_patch_the_shared_layer():
+    from game_board15 import battle, storage
+    from game_board15 import router as router15
+    from game_board15.models import Match15, PLAYER_ORDER
+
+    render_mod.clear_frame_cache()
+    match = Match15.new(1, 1, "Alice")
+    match.status = "playing"
+    rng = random.Random(7)
+    cells = [(r, c) for r in range(15) for c in range(15)]
+    rng.shuffle(cells)
+    patched = 0
+    for coord in cells[:60]:
+        shooter = match.turn
+        r, c = coord
+        if match.field.grid[r][c] not in (0, 1) or match.field.owners[r][c] == shooter:
+            continue
+        result = battle.apply_shot(match, shooter, coord)
+        router15._update_history(match, shooter, result)
+        snapshot = match.create_snapshot()
+        previous = match.snapshots[-2]
+        idx = len(match.snapshots) - 1
+        changed = storage.snapshot_changed_cells(previous, snapshot)
+        changed |= storage.snapshot_fresh_cells(previous)
+        for turn, key in enumerate(PLAYER_ORDER):
+            state = render_mod.RenderState(
+                field=snapshot.field,
+                history=snapshot.cell_history,
+                footer_label="",
+                last_move=snapshot.last_move,
+                color_map=dict(match.color_map),
+                delta=render_mod.FrameDelta(
+                    key=match.match_id,
+                    base_version=(idx - 1, len(previous.shot_history)),
+                    version=(idx, len(snapshot.shot_history)),
+                    cells=frozenset(changed),
+                ),
+            )
+            cached = render_mod._frames.get(match.match_id)
+            patched += cached is not None and cached.version == state.delta.base_version
+            # Alternate the backends: both paint and read the same layers.
+            backend = "numpy" if (idx + turn) % 2 else "pil"
+            frame = render_mod.render_frame(state, key, backend=backend)
+            frame_count = state.rendered_ship_cells
+            full = render_mod.compose_board(state, key)
+            assert frame.tobytes() == full.tobytes()
+            assert frame_count == state.rendered_ship_cells
+        match.turn_idx = (match.turn_idx + 1) % len(match.order)
+    assert patched > 0
+    render_mod.clear_frame_cache()
+
+
+def test_numpy_backend_draws_one_layer_per_snapshot(monkeypatch):
+    render_mod.clear_frame_cache()
+    builds = []
+    compose_public = render_numpy.compose_public_numpy
+
+    def counting_compose_public(state, version):
+        builds.append(version)
+        return compose_public(state, version)
+
+    monkeypatch.setattr(render_numpy, "compose_public_numpy", counting_compose_public)
+    monkeypatch.setattr(render_mod, "BOARD15_RENDER_BACKEND", "numpy")
+    for state, key in build_scenarios(depths=(120,)):
+        state.delta = render_mod.FrameDelta(
+            key="shared", base_version=None, version=(0, 0), cells=frozenset()
+        )
+        frame = render_mod.render_frame(state, key)
+        assert frame.tobytes() == render_mod.compose_board(state, key).tobytes()
+    assert builds == [(0, 0)]
+    render_mod.clear_frame_cache()
+
+
+def test_backend_selection_falls_back_without_numpy(monkeypatch):
+    render_mod._backend.cache_clear()
+    try:
+        assert render_mod._backend("pil") is None
+        assert render_mod._backend("numpy") is render_numpy
+        render_mod._backend.cache_clear()
+        monkeypatch.setitem(sys.modules, "game_board15.render_numpy", None)
+        monkeypatch.delattr(sys.modules["game_board15"], "render_numpy")
+        assert render_mod._backend("numpy") is None
+    finally:
+        render_mod._backend.cache_clear()
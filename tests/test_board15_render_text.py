@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from game_board15 import router as router15
+from game_board15.models import Match15
+from game_board15.render import RenderState, count_visible_own_cells
+from game_board15.render_preview import build_preview_state
+from game_board15.render_text import render_board_text
+from logic.render import HIT_SYMBOL, SHIP_SYMBOL, SUNK_SYMBOL
+
+
+def _rows(text):
+    assert text.startswith("<pre>") and text.endswith("</pre>")
+    return text[len("<pre>") : -len("</pre>")].split("\n")
+
+
+def test_text_board_marks_owners_and_hides_enemy_ships():
+    field, history = build_preview_state()
+    state = RenderState(field=field, history=history, footer_label="", reveal_ships=False)
+
+    rows = _rows(render_board_text(state, "A"))
+
+    assert rows[0].split() == list("ABCDEFGHIJKLMNO")
+    assert len(rows) == 16
+    assert all(row.startswith(f"{idx:>2} ") for idx, row in enumerate(rows[1:], 1))
+    body = "".join(row[3:] for row in rows[1:])
+    assert SHIP_SYMBOL + " " in body
+    assert SHIP_SYMBOL + "b" not in body and SHIP_SYMBOL + "c" not in body
+    assert HIT_SYMBOL + "b" in body
+    assert SUNK_SYMBOL + " " in body
+    assert state.rendered_ship_cells == count_visible_own_cells(field, history, "A")
+
+
+def test_text_board_reveals_enemy_ships_with_owner_markers():
+    field, history = build_preview_state()
+    state = RenderState(field=field, history=history, footer_label="", reveal_ships=True)
+
+    body = "".join(row[3:] for row in _rows(render_board_text(state, "B"))[1:])
+
+    assert SHIP_SYMBOL + "a" in body
+    assert SHIP_SYMBOL + "c" in body
+
+
+def test_player_can_choose_text_boards(monkeypatch):
+    match = Match15.new(1, 101, "Tester")
+    match.status = "playing"
+    monkeypatch.setattr(router15.storage, "find_match_by_user", lambda *args: match)
+    monkeypatch.setattr(router15.storage, "save_match", lambda m: None)
+    monkeypatch.setattr(router15.storage, "append_snapshot", lambda m, **kwargs: None)
+
+    rendered = []
+    monkeypatch.setattr(router15, "render_board", lambda *args: rendered.append(args))
+    context = SimpleNamespace(
+        bot=SimpleNamespace(
+            send_photo=AsyncMock(),
+            send_message=AsyncMock(return_value=SimpleNamespace(message_id=5)),
+        ),
+        bot_data={},
+    )
+    reply = AsyncMock()
+    update = SimpleNamespace(
+        message=SimpleNamespace(text="Текст", reply_text=reply),
+        effective_user=SimpleNamespace(id=1),
+        effective_chat=SimpleNamespace(id=101),
+    )
+
+    async def run():
+        await router15.router_text(update, context)
+        await router15._send_state(context, match, "A", "Ваш ход.")
+
+    asyncio.run(run())
+
+    assert match.messages["A"]["board_format"] == "text"
+    assert rendered == []
+    reply.assert_awaited_once_with("Поле будет приходить текстом.")
+    context.bot.send_photo.assert_not_awaited()
+    text = context.bot.send_message.await_args.args[1]
+    assert text.startswith("<pre>") and text.endswith("Ваш ход.")
+    assert match.messages["A"]["board"] == 5
@@ -0,0 +1,115 @@
+import asyncio
+import gc
+
+from game_board15 import handlers
+from game_board15.models import Match15, Player
+from game_board15.placement import generate_field
+
+
+def _bot_match(match_id: str) -> Match15:
+    match = Match15(match_id=match_id)
+    match.field, _ = generate_field()
+    match.status = "playing"
+    match.players["A"] = Player(user_id=1, chat_id=1, name="A")
+    match.players["B"] = Player(user_id=0, chat_id=0, name="Бот B")
+    match.turn_idx = match.order.index("B")
+    return match
+
+
+def test_speculated_move_is_reused(monkeypatch) -> None:
+    match = _bot_match("spec-hit")
+    calls = []
+    original = handlers._select_bot_target
+
+    async def counting(*args, **kwargs):
+        calls.append(args[1])
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(handlers, "_select_bot_target", counting)
+
+    async def run():
+        loop_task = asyncio.ensure_future(asyncio.sleep(10))
+        handlers._bot_loop_tasks[match.match_id] = loop_task
+        try:
+            handlers.speculate_bot_move(match)
+            await asyncio.sleep(0)
+            speculated = await handlers._speculations[match.match_id][1]
+            coord = await handlers._next_bot_target(match, "B")
+            assert coord == speculated
+            assert calls == ["B"]
+        finally:
+            loop_task.cancel()
+            handlers._bot_loop_tasks.pop(match.match_id, None)
+
+    asyncio.run(run())
+
+
+def test_speculation_dropped_when_state_changes(monkeypatch) -> None:
+    match = _bot_match("spec-stale")
+    calls = []
+    original = handlers._select_bot_target
+
+    async def counting(*args, **kwargs):
+        calls.append(args[1])
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(handlers, "_select_bot_target", counting)
+
+    async def run():
+        loop_task = asyncio.ensure_future(asyncio.sleep(10))
+        handlers._bot_loop_tasks[match.match_id] = loop_task
+        try:
+            handlers.speculate_bot_move(match)
+            speculated = await handlers._speculations[match.match_id][1]
+            match.field.set_state(speculated, 2, None)
+            coord = await handlers._next_bot_target(match, "B")
+            assert coord != speculated
+            assert calls == ["B", "B"]
+            assert match.match_id not in handlers._speculations
+        finally:
+            loop_task.cancel()
+            handlers._bot_loop_tasks.pop(match.match_id, None)
+
+    asyncio.run(run())
+
+
+def test_notify_turn_change_wakes_waiting_loop() -> None:
+    async def run():
+        waiter = asyncio.ensure_future(handlers._wait_for_turn_change("wake"))
+        await asyncio.sleep(0)
+        handlers.notify_turn_change("wake")
+        await asyncio.wait_for(waiter, 0.2)
+        handlers._turn_events.pop("wake", None)
+
+    asyncio.run(run())
+
+
+def test_failed_discarded_speculation_is_retrieved(monkeypatch, caplog) -> None:
+    match = _bot_match("spec-failed")
+
+    async def failing(*args, **kwargs):
+        raise RuntimeError("search failed")
+
+    monkeypatch.setattr(handlers, "_select_bot_target", failing)
+    unretrieved = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _loop, context: unretrieved.append(context))
+        loop_task = asyncio.ensure_future(asyncio.sleep(10))
+        handlers._bot_loop_tasks[match.match_id] = loop_task
+        try:
+            handlers.speculate_bot_move(match)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            handlers._discard_speculation(match.match_id)
+        finally:
+            loop_task.cancel()
+            handlers._bot_loop_tasks.pop(match.match_id, None)
+        gc.collect()
+
+    with caplog.at_level("WARNING", logger=handlers.logger.name):
+        asyncio.run(run())
+
+    assert unretrieved == []
+    assert "Speculative bot move failed" in caplog.text
@@ -75,3 +75,101 @@ def test_available_bot_targets_skip_diagonal_from_wounded() -> None:
     assert (6, 6) not in targets
     assert (5, 6) in targets
 
+
+
+def test_two_player_bot_never_repeats_and_finishes_fleet() -> None:
+    from logic.battle import REPEAT, apply_shot
+    from logic.placement import random_board
+
+    board = random_board()
+    match = Match.new(1, 100)
+    shots = 0
+    while board.alive_cells > 0:
+        view = board_test._board_view(board)
+        coord = board_test._choose_bot_coord(
+            match, "B", view, board_test._remaining_fleet([board])
+        )
+        assert coord is not None
+        result = apply_shot(board, coord)
+        assert result != REPEAT
+        board_test._record_bot_shot(match, "B", view, coord, result, "A", board.highlight)
+        shots += 1
+    assert shots < 100
+
+
+def test_auto_play_bots_reuses_target_pools_across_reloads(monkeypatch):
+    import copy
+    import random
+
+    from logic import targeting
+    from logic.placement import random_board
+
+    match = Match.new(1, 100)
+    rng = random.Random(5)
+    for key in ("A", "B", "C"):
+        board = random_board(rng)
+        board.owner = key
+        match.boards[key] = board
+    match.players["B"] = Player(user_id=0, chat_id=200, name="B")
+    match.players["C"] = Player(user_id=0, chat_id=300, name="C")
+    match.status = "playing"
+    match.turn = "A"
+    stored = {"payload": storage._match_to_payload(match)}
+
+    builds: list[str] = []
+    shooters: list[str] = []
+
+    class CountingPool(targeting.TargetPool):
+        __slots__ = ()
+
+        def __init__(self, view):
+            builds.append("pool")
+            super().__init__(view)
+
+    real_apply = board_test.battle.apply_shot_multi
+
+    def apply_shot_multi(coord, enemy_boards, history):
+        if len(shooters) == 9:
+            raise RuntimeError("stop")
+        shooters.append(stored["payload"]["turn"])
+        return real_apply(coord, enemy_boards, history)
+
+    def save_match(m):
+        stored["payload"] = copy.deepcopy(storage._match_to_payload(m))
+
+    def get_match(match_id):
+        # Every reload builds a new match object, like the real storage.
+        return storage._payload_to_match(copy.deepcopy(stored["payload"]))
+
+    async def fake_send_state(context, match_, player_key, message):
+        pass
+
+    monkeypatch.setattr(targeting, "TargetPool", CountingPool)
+    monkeypatch.setattr(board_test.battle, "apply_shot_multi", apply_shot_multi)
+    monkeypatch.setattr(router_std, "_send_state_board_test", fake_send_state)
+    monkeypatch.setattr(storage, "save_match", save_match)
+    monkeypatch.setattr(storage, "get_match", get_match)
+    monkeypatch.setattr(storage, "finish", lambda m, w: None)
+
+    context = SimpleNamespace(bot=SimpleNamespace(send_message=AsyncMock()), bot_data={})
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(board_test._auto_play_bots(match, context, 0, human="-", delay=0))
+
+    assert len(shooters) == 9
+    assert len(builds) == len(set(shooters)) < len(shooters)
+    assert not any(key[0] == match.match_id for key in board_test._target_pools)
+
+
+def test_human_shot_patches_bot_pools():
+    match = Match.new(1, 100)
+    match.players["B"] = Player(user_id=0, chat_id=200, name="B")
+    view = board_test._history_view(match, "B")
+    pool = board_test._bot_pool(match, "B", view)
+    try:
+        assert (0, 0) in pool
+        match.history[0][0] = 2
+        board_test.note_history_shot(match, "A", [(0, 0)])
+        assert (0, 0) not in pool
+    finally:
+        board_test._drop_bot_pools(match.match_id)
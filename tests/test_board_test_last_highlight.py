@@ -27,7 +27,7 @@ def test_send_state_board_test_uses_match_highlight(monkeypatch):
 
         captured = {}
 
-        def fake_render_board_own(b):
+        def fake_render_board_own(b, **kwargs):
             captured["highlight"] = b.highlight.copy()
             return "board"
 
@@ -13,7 +13,7 @@ def test_board_test_start_order(monkeypatch):
         match = Match.new(1, 100)
         monkeypatch.setattr(storage, "create_match", lambda uid, cid, name=None: match)
         monkeypatch.setattr(storage, "save_match", lambda m: None)
-        monkeypatch.setattr(placement, "random_board_global", lambda mask: Board())
+        monkeypatch.setattr(placement, "random_board_global", lambda mask, rng=None, **kwargs: Board())
 
         calls: list[str] = []
 
@@ -53,7 +53,7 @@ def test_board_test_two_schedules_bot_with_delay(monkeypatch):
         match = Match.new(1, 200)
         monkeypatch.setattr(storage, "create_match", lambda uid, cid, name=None: match)
         monkeypatch.setattr(storage, "save_match", lambda m: None)
-        monkeypatch.setattr(placement, "random_board", lambda: Board())
+        monkeypatch.setattr(placement, "random_board", lambda rng=None: Board())
 
         auto_mock = AsyncMock()
         monkeypatch.setattr("handlers.board_test._auto_play_bot", auto_mock)
@@ -89,3 +89,73 @@ def test_board_test_two_schedules_bot_with_delay(monkeypatch):
         )
 
     asyncio.run(run())
+
+
+def _start_board_test(monkeypatch):
+    replies: list[str] = []
+    states: list[str] = []
+
+    async def reply_text(msg):
+        replies.append(msg)
+        return SimpleNamespace()
+
+    async def fake_send_state(context, match_, key, message):
+        states.append(key)
+
+    monkeypatch.setattr(router, "_send_state_board_test", fake_send_state)
+    orig_create_task = asyncio.create_task
+
+    def fake_create_task(coro):
+        coro.close()
+        return orig_create_task(asyncio.sleep(0))
+
+    monkeypatch.setattr(asyncio, "create_task", fake_create_task)
+    update = SimpleNamespace(
+        message=SimpleNamespace(reply_text=reply_text),
+        effective_user=SimpleNamespace(id=1, first_name="Tester"),
+        effective_chat=SimpleNamespace(id=100),
+    )
+    context = SimpleNamespace(bot=SimpleNamespace(send_message=AsyncMock()), bot_data={})
+
+    async def run():
+        await board_test(update, context)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    return replies, states
+
+
+def test_board_test_places_three_fleets(monkeypatch, tmp_path):
+    monkeypatch.setattr(storage, "DATA_FILE", tmp_path / "data.json")
+
+    replies, states = _start_board_test(monkeypatch)
+
+    assert states == ["A"]
+    match = storage.find_match_by_user(1, 100)
+    occupied: dict[tuple[int, int], str] = {}
+    for key in ("A", "B", "C"):
+        board = match.boards[key]
+        assert sum(len(ship.cells) for ship in board.ships) == sum(placement.SHIP_SIZES)
+        for ship in board.ships:
+            for cell in ship.cells:
+                assert cell not in occupied
+                occupied[tuple(cell)] = key
+    assert len(occupied) == 3 * sum(placement.SHIP_SIZES)
+
+
+def test_board_test_reports_failed_placement(monkeypatch):
+    match = Match.new(1, 100)
+    deleted = []
+    monkeypatch.setattr(storage, "create_match", lambda uid, cid, name=None: match)
+    monkeypatch.setattr(storage, "delete_match", deleted.append)
+
+    def no_room(mask, rng=None, **kwargs):
+        raise placement.PlacementError("no room")
+
+    monkeypatch.setattr(placement, "random_board_global", no_room)
+
+    replies, states = _start_board_test(monkeypatch)
+
+    assert states == []
+    assert deleted == [match.match_id]
+    assert "Не удалось" in replies[0]
@@ -52,7 +52,9 @@ def test_router_text_board_test_skips_unaffected_enemy(monkeypatch):
             "apply_shot_multi",
             lambda coord, boards, history: {"B": router.HIT, "C": router.MISS},
         )
-        monkeypatch.setattr(router.random, "choice", lambda seq: seq[0])
+        monkeypatch.setattr(
+            router, "match_rng", lambda *scope: SimpleNamespace(choice=lambda seq: seq[0])
+        )
 
         calls: list[str] = []
 
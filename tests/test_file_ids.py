@@ -0,0 +1,114 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, call
+
+import pytest
+
+from telegram import InputFile
+from telegram.error import BadRequest
+
+from app import file_ids
+from app.file_ids import FileIdCache, content_digest, send_cached_photo
+from handlers import commands
+
+
+def _sent(file_id):
+    return SimpleNamespace(photo=[SimpleNamespace(file_id="thumb"), SimpleNamespace(file_id=file_id)])
+
+
+def test_second_send_references_uploaded_file_id(monkeypatch, tmp_path):
+    monkeypatch.setattr(file_ids, "_cache", FileIdCache(tmp_path / "ids.json"))
+    send = AsyncMock(return_value=_sent("photo-1"))
+
+    async def run():
+        await send_cached_photo(send, b"frame", filename="board.png")
+        await send_cached_photo(send, b"frame", filename="board.png")
+        await send_cached_photo(send, b"other", filename="board.png")
+
+    asyncio.run(run())
+
+    uploads = [args[0] for args, _kwargs in send.call_args_list]
+    assert isinstance(uploads[0], InputFile)
+    assert uploads[1] == "photo-1"
+    assert isinstance(uploads[2], InputFile)
+
+
+def test_rejected_file_id_is_uploaded_again(monkeypatch, tmp_path):
+    cache = FileIdCache(tmp_path / "ids.json")
+    cache.put(content_digest(b"frame"), "expired")
+    monkeypatch.setattr(file_ids, "_cache", cache)
+
+    async def send(photo):
+        if photo == "expired":
+            raise BadRequest("Wrong file identifier")
+        return _sent("fresh")
+
+    asyncio.run(send_cached_photo(send, b"frame", filename="board.png"))
+
+    assert cache.get(content_digest(b"frame")) == "fresh"
+
+
+def test_other_bad_requests_are_raised_without_upload(monkeypatch, tmp_path):
+    cache = FileIdCache(tmp_path / "ids.json")
+    cache.put(content_digest(b"frame"), "known")
+    monkeypatch.setattr(file_ids, "_cache", cache)
+    send = AsyncMock(side_effect=BadRequest("Message caption is too long"))
+
+    with pytest.raises(BadRequest):
+        asyncio.run(send_cached_photo(send, b"frame", filename="board.png"))
+
+    send.assert_awaited_once_with("known")
+    assert cache.get(content_digest(b"frame")) == "known"
+
+
+def test_file_ids_survive_restart_and_stay_bounded(tmp_path):
+    path = tmp_path / "ids.json"
+    cache = FileIdCache(path, max_entries=2)
+    for idx in range(3):
+        cache.put(f"digest-{idx}", f"id-{idx}")
+    cache.flush()
+
+    restored = FileIdCache(path, max_entries=2)
+
+    assert restored.get("digest-0") is None
+    assert restored.get("digest-2") == "id-2"
+    assert len(restored) == 2
+
+
+def test_welcome_photo_is_uploaded_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(file_ids, "_cache", FileIdCache(tmp_path / "ids.json"))
+    reply_photo = AsyncMock(return_value=_sent("welcome-id"))
+
+    async def run():
+        await commands.send_welcome_photo(reply_photo)
+        await commands.send_welcome_photo(reply_photo)
+
+    asyncio.run(run())
+
+    assert reply_photo.call_args_list[1] == call("welcome-id", caption=commands.WELCOME_CAPTION)
+
+
+def test_file_ids_are_written_off_the_event_loop(monkeypatch, tmp_path):
+    path = tmp_path / "ids.json"
+    cache = FileIdCache(path)
+    cache.put("digest-0", "id-0")
+    # A fresh cache does not write on its first put.
+    assert not cache.save_due()
+    assert not path.exists()
+
+    monkeypatch.setattr(file_ids, "_cache", cache)
+    monkeypatch.setattr(file_ids, "FLUSH_INTERVAL", 0.0)
+    offloaded = []
+    to_thread = asyncio.to_thread
+
+    async def recording_to_thread(fn, *args):
+        offloaded.append(fn.__name__)
+        return await to_thread(fn, *args)
+
+    monkeypatch.setattr(file_ids.asyncio, "to_thread", recording_to_thread)
+    send = AsyncMock(return_value=_sent("photo-1"))
+
+    asyncio.run(send_cached_photo(send, b"frame", filename="board.png"))
+
+    assert offloaded == ["save"]
+    assert FileIdCache(path).get(content_digest(b"frame")) == "photo-1"
@@ -0,0 +1,68 @@
+import asyncio
+
+from game_board15.models import Match15
+from game_board15.placement import generate_field
+from logic import layout_pool
+from logic.layout_pool import LayoutPool, MODE_BOARD10, MODE_BOARD15, layout_rng
+from logic.placement import random_board
+
+
+def test_take_falls_back_to_on_demand_generation() -> None:
+    pool = LayoutPool(size=0, low_watermark=0)
+    pool.register(MODE_BOARD10, random_board)
+
+    seed, board = pool.take(MODE_BOARD10)
+
+    assert len(board.ships) == 10
+    assert pool.misses == 1 and pool.hits == 0
+    assert random_board(layout_rng(seed)).grid == board.grid
+
+
+def test_fill_and_take_hand_out_distinct_layouts() -> None:
+    pool = LayoutPool(size=3, low_watermark=1)
+    pool.register(MODE_BOARD15, generate_field)
+
+    assert pool.fill() == 3
+    entries = [pool.take(MODE_BOARD15) for _ in range(3)]
+
+    assert pool.hits == 3
+    assert len({id(field) for _seed, (field, _fleets) in entries}) == 3
+    assert pool.available(MODE_BOARD15) == 0
+
+
+def test_background_task_refills_below_watermark() -> None:
+    pool = LayoutPool(size=4, low_watermark=2)
+    pool.register(MODE_BOARD10, random_board)
+
+    async def run():
+        await pool.start()
+        for _ in range(100):
+            if pool.available(MODE_BOARD10) == 4:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.available(MODE_BOARD10) == 4
+
+        pool.take(MODE_BOARD10)
+        pool.take(MODE_BOARD10)
+        pool.take(MODE_BOARD10)
+        for _ in range(100):
+            if pool.available(MODE_BOARD10) == 4:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.available(MODE_BOARD10) == 4
+        await pool.stop()
+
+    asyncio.run(run())
+
+
+def test_match15_new_pops_layout_from_pool(monkeypatch) -> None:
+    pool = LayoutPool(size=1, low_watermark=0)
+    pool.register(MODE_BOARD15, generate_field)
+    pool.fill()
+    monkeypatch.setattr(layout_pool, "_pool", pool)
+
+    match = Match15.new(1, 1, "Alice")
+
+    assert pool.hits == 1
+    assert pool.available(MODE_BOARD15) == 0
+    assert sum(match.alive_cells.values()) == 60
@@ -1,26 +1,75 @@
 import random
+import time
+
+import pytest
+
 from models import Board
-from logic.placement import place_ship, random_board
+from logic.placement import (
+    PlacementError,
+    SHIP_SIZES,
+    place_fleet,
+    place_ship,
+    random_board,
+    random_board_global,
+    ship_slots,
+)
 from tests.utils import _state
 
 
-def test_vertical_start_row_respects_ship_size(monkeypatch):
+def test_vertical_slots_respect_ship_size():
+    slots = ship_slots(10, 4)
+    assert len(slots) == 2 * 10 * 7
+    for _mask, _halo, cells in slots:
+        for r, c in cells:
+            assert 0 <= r < 10
+            assert 0 <= c < 10
+
+
+def test_place_ship_uses_free_slot_and_reports_full_board():
     board = Board()
-    monkeypatch.setattr(random, 'choice', lambda seq: 'v')
-    calls = []
-    def fake_randint(a, b):
-        calls.append((a, b))
-        return a
-    monkeypatch.setattr(random, 'randint', fake_randint)
-    place_ship(board, 4)
-    assert calls[0] == (0, 6)
-    assert calls[1] == (0, 9)
-    for r, c in board.ships[0].cells:
-        assert 0 <= r < 10
-        assert 0 <= c < 10
+    place_ship(board, 4, rng=random.Random(0))
+    assert len(board.ships[0].cells) == 4
+
+    full = Board()
+    full.grid = [[1] * 10 for _ in range(10)]
+    with pytest.raises(PlacementError):
+        place_ship(full, 1)
 
 
 def test_random_board_ship_count():
     board = random_board()
     total = sum(_state(cell) == 1 for row in board.grid for cell in row)
     assert total == 20
+
+
+def test_global_boards_never_touch_and_update_mask():
+    mask = [[0] * 15 for _ in range(15)]
+    rng = random.Random(7)
+    boards = [random_board_global(mask, rng=rng) for _ in range(3)]
+    cells = [cell for board in boards for ship in board.ships for cell in ship.cells]
+    assert len(cells) == len(set(cells)) == 60
+    owners = {cell: idx for idx, board in enumerate(boards) for ship in board.ships for cell in ship.cells}
+    for (r, c), idx in owners.items():
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                other = owners.get((r + dr, c + dc))
+                assert other is None or other == idx
+        assert mask[r][c] == 1
+
+
+def test_global_boards_report_overfull_mask():
+    mask = [[0] * 10 for _ in range(10)]
+    rng = random.Random(7)
+    random_board_global(mask, rng=rng)
+    with pytest.raises(PlacementError):
+        for _ in range(2):
+            random_board_global(mask, rng=rng)
+
+
+def test_place_fleet_reports_infeasible_layout_quickly():
+    started = time.perf_counter()
+    with pytest.raises(PlacementError):
+        place_fleet(4, [4, 4, 4], rng=random.Random(1))
+    with pytest.raises(PlacementError):
+        place_fleet(10, SHIP_SIZES * 4, rng=random.Random(1), max_steps=500)
+    assert time.perf_counter() - started < 1.0
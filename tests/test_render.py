@@ -1,3 +1,6 @@
+import unicodedata
+
+import logic.render as render_mod
 from logic.render import (
     render_board_own,
     render_board_enemy,
@@ -8,6 +11,7 @@ from logic.render import (
     LAST_MOVE_HIT_SYMBOL,
     LAST_MOVE_SUNK_SYMBOL,
     format_cell,
+    CELL_TABLE,
     CELL_WIDTH,
 )
 from logic.parser import ROWS
@@ -151,3 +155,58 @@ def test_format_cell_keeps_visual_width():
     assert wcswidth(double) == CELL_WIDTH
     assert single.startswith(' ')
     assert not single.endswith(' ')
+
+
+def test_cell_table_pads_every_symbol():
+    assert all(wcswidth(cell) == CELL_WIDTH for cell in CELL_TABLE.values())
+
+
+def test_render_pads_states_outside_the_table():
+    board = Board()
+    board.grid[0][0] = 7
+    board.grid[0][1] = [1, 'A']
+    board.owner = 'A'
+    own_row = render_board_own(board).split('\n')[1]
+    enemy_row = render_board_enemy(board).split('\n')[1]
+
+    assert own_row.startswith(format_cell('1') + '| ' + format_cell('·') + format_cell(SHIP_SYMBOL))
+    assert enemy_row.startswith(format_cell('1') + '| ' + format_cell('·') * 2)
+
+
+def test_wcswidth_matches_unicode_widths():
+    def reference(text):
+        return sum(
+            0 if unicodedata.combining(ch)
+            else 2 if unicodedata.east_asian_width(ch) in ('W', 'F')
+            else 1
+            for ch in text
+        )
+
+    samples = ['', 'x', ' 10', '·', 'e\u0301', '💣', '漢字', 'A▢■▩●▣', 'x💣x']
+    for text in samples:
+        assert wcswidth(text) == reference(text)
+        assert wcswidth(text) == reference(text)
+
+
+def test_cached_rows_rerender_only_changed_rows(monkeypatch):
+    render_mod.clear_row_cache()
+    board = Board(owner='A')
+    board.grid[0][0] = [1, 'A']
+    key = ('match', 'A')
+    assert render_board_own(board, cache_key=key) == render_board_own(board)
+
+    rendered = []
+    original = render_mod._render_row
+
+    def counting_render_row(view, owner, r_idx, row, highlighted):
+        rendered.append(r_idx)
+        return original(view, owner, r_idx, row, highlighted)
+
+    monkeypatch.setattr(render_mod, '_render_row', counting_render_row)
+    board.grid[0][0][0] = 3
+    board.highlight = [(4, 4)]
+    text = render_board_own(board, cache_key=key)
+
+    assert sorted(rendered) == [0, 4]
+    monkeypatch.setattr(render_mod, '_render_row', original)
+    assert text == render_board_own(board)
@@ -35,30 +35,55 @@ def _get_safe_send_state(context, match, human):
     )
 
 
+def _failing_render_setup(monkeypatch, send_message):
+    match = Match15.new(1, 1, "A")
+    match.players["B"] = Player(user_id=0, chat_id=2, name="B")
+    context = SimpleNamespace(
+        bot=SimpleNamespace(
+            send_photo=AsyncMock(),
+            send_message=send_message,
+        ),
+        bot_data={},
+    )
+
+    def fail_render(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(handlers, "render_board", fail_render)
+    monkeypatch.setattr(router, "render_board", fail_render)
+    return match, context
+
+
+def test_render_failure_falls_back_to_text_board(monkeypatch):
+    async def run():
+        send_message = AsyncMock(return_value=SimpleNamespace(message_id=7))
+        match, context = _failing_render_setup(monkeypatch, send_message)
+
+        safe_send_state = _get_safe_send_state(context, match, "A")
+        await safe_send_state("B", "msg")
+
+        assert context.bot.send_photo.call_count == 0
+        send_message.assert_called_once()
+        text = send_message.call_args[0][1]
+        assert text.startswith("<pre>")
+        assert text.endswith("msg")
+        assert send_message.call_args.kwargs["parse_mode"] == "HTML"
+        assert match.messages["B"]["board"] == 7
+
+    asyncio.run(run())
+
+
 def test_render_failure(monkeypatch):
     async def run():
-        match = Match15.new(1, 1, "A")
-        match.players["B"] = Player(user_id=0, chat_id=2, name="B")
-        context = SimpleNamespace(
-            bot=SimpleNamespace(
-                send_photo=AsyncMock(),
-                send_message=AsyncMock(),
-            ),
-            bot_data={},
-        )
-
-        def fail_render(*args, **kwargs):
-            raise RuntimeError("boom")
-
-        monkeypatch.setattr(handlers, "render_board", fail_render)
-        monkeypatch.setattr(router, "render_board", fail_render)
+        send_message = AsyncMock(side_effect=[RuntimeError("down"), None])
+        match, context = _failing_render_setup(monkeypatch, send_message)
 
         safe_send_state = _get_safe_send_state(context, match, "A")
         await safe_send_state("B", "msg")
 
         assert context.bot.send_photo.call_count == 0
-        context.bot.send_message.assert_called_once()
-        text = context.bot.send_message.call_args[0][1]
+        assert send_message.call_count == 2
+        text = send_message.call_args[0][1]
         assert "Не удалось отправить обновление" in text
 
     asyncio.run(run())
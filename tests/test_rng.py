@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import storage
+from game_board15.models import Match15, PLAYER_COLOR_SCHEMES, PLAYER_ORDER
+from game_board15.placement import generate_field
+from handlers import router
+from logic.layout_pool import layout_rng
+from logic.phrases import SELF_MISS
+from logic.placement import random_board
+from logic.rng import match_rng, match_seed
+
+
+def test_match_rng_depends_only_on_seed_and_scope() -> None:
+    match = SimpleNamespace(seed=42, match_id="m1")
+    other = SimpleNamespace(seed=42, match_id="m2")
+
+    assert match_rng(match, "bot", "B", 3).random() == match_rng(other, "bot", "B", 3).random()
+    assert match_rng(match, "bot", "B", 3).random() != match_rng(match, "bot", "B", 4).random()
+    assert match_seed(SimpleNamespace(seed=None, match_id="legacy")) == "legacy"
+
+
+def test_match15_replays_from_seed() -> None:
+    match = Match15.new(1, 1, "Alice")
+    field, _ = generate_field(layout_rng(match.seed))
+
+    assert field.grid == match.field.grid
+    assert field.owners == match.field.owners
+
+    color_keys = list(PLAYER_COLOR_SCHEMES)
+    match_rng(match, "colors").shuffle(color_keys)
+    assert [match.color_map[key] for key in PLAYER_ORDER] == color_keys[: len(PLAYER_ORDER)]
+
+    restored = Match15.from_payload(match.to_payload())
+    assert restored.seed == match.seed
+
+
+def test_phrases_follow_match_seed() -> None:
+    def pick(seed):
+        match = SimpleNamespace(
+            seed=seed,
+            shots={"A": {"move_count": 2, "joke_start": 5}},
+        )
+        return [router._phrase_or_joke(match, "A", SELF_MISS) for _ in range(3)]
+
+    assert pick(7) == pick(7)
+    assert len(set(pick(7))) == 1
+
+
+def test_seeds_survive_storage(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(storage, "DATA_FILE", tmp_path / "data.json")
+    match = storage.create_match(1, 100)
+    storage.join_match(match.match_id, 2, 200)
+    board = random_board(layout_rng(99))
+    board.layout_seed = 99
+    storage.save_board(match, "A", board)
+
+    loaded = storage.get_match(match.match_id)
+
+    assert loaded.seed == match.seed
+    assert loaded.boards["A"].layout_seed == 99
+    assert random_board(layout_rng(99)).grid == loaded.boards["A"].grid
+
+
+def test_auto_layout_follows_match_seed(monkeypatch) -> None:
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from models import Match, Player
+
+    def auto_boards(seed):
+        match = Match.new(1, 10)
+        match.seed = seed
+        match.players["B"] = Player(user_id=2, chat_id=20)
+        match.status = "placing"
+        saved = []
+
+        def save_board(m, key, board):
+            m.boards[key] = board
+            saved.append(board)
+
+        monkeypatch.setattr(storage, "find_match_by_user", lambda uid, chat_id=None: match)
+        monkeypatch.setattr(storage, "save_board", save_board)
+        monkeypatch.setattr(storage, "save_match", lambda m: None)
+        update = SimpleNamespace(
+            message=SimpleNamespace(text="авто", reply_text=AsyncMock()),
+            effective_user=SimpleNamespace(id=1),
+            effective_chat=SimpleNamespace(id=10),
+        )
+        context = SimpleNamespace(
+            bot=SimpleNamespace(send_message=AsyncMock(), delete_message=AsyncMock())
+        )
+        for _ in range(2):
+            asyncio.run(router.router_text(update, context))
+        return saved
+
+    first, second = auto_boards(7)
+    again = auto_boards(7)
+
+    assert [board.grid for board in again] == [first.grid, second.grid]
+    # Asking again rerolls the fleet.
+    assert first.layout_seed != second.layout_seed
+    assert random_board(layout_rng(second.layout_seed)).grid == second.grid
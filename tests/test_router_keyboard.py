@@ -12,8 +12,8 @@ def test_send_state_sends_new_board_message_and_updates_history(monkeypatch):
             boards={'A': SimpleNamespace(), 'B': SimpleNamespace()},
             messages={'A': {}},
         )
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(router.storage, 'save_match', lambda m: None)
         bot = SimpleNamespace(
             send_message=AsyncMock(return_value=SimpleNamespace(message_id=50)),
@@ -40,8 +40,8 @@ def test_send_state_appends_new_board_messages_to_history(monkeypatch):
             boards={'A': SimpleNamespace(), 'B': SimpleNamespace()},
             messages={'A': {'board': 10, 'board_history': [10]}},
         )
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(router.storage, 'save_match', lambda m: None)
         bot = SimpleNamespace(
             send_message=AsyncMock(return_value=SimpleNamespace(message_id=20)),
@@ -64,8 +64,8 @@ def test_send_state_initialises_history_if_missing(monkeypatch):
             boards={'A': SimpleNamespace(), 'B': SimpleNamespace()},
             messages={'A': {'board': 10}},
         )
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(router.storage, 'save_match', lambda m: None)
         bot = SimpleNamespace(
             send_message=AsyncMock(return_value=SimpleNamespace(message_id=60)),
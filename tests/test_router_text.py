@@ -228,13 +228,13 @@ def test_router_text_handles_latin_coords_standard_match(monkeypatch):
         )
 
         monkeypatch.setattr(storage, "find_match_by_user", lambda uid, chat_id=None: match)
-        monkeypatch.setattr(router, "render_board_own", lambda board: "own")
-        monkeypatch.setattr(router, "render_board_enemy", lambda board: "enemy")
+        monkeypatch.setattr(router, "render_board_own", lambda board, **kwargs: "own")
+        monkeypatch.setattr(router, "render_board_enemy", lambda board, **kwargs: "enemy")
         monkeypatch.setattr(storage, "save_match", lambda m: None)
         monkeypatch.setattr(router, "parse_coord", lambda text: (0, 0))
         monkeypatch.setattr(router, "format_coord", lambda coord: "a1")
-        monkeypatch.setattr(router, "random_phrase", lambda phrases: phrases[0])
-        monkeypatch.setattr(router, "random_joke", lambda: "JOKE")
+        monkeypatch.setattr(router, "random_phrase", lambda phrases, rng=None: phrases[0])
+        monkeypatch.setattr(router, "random_joke", lambda rng=None: "JOKE")
 
         apply_calls: list[tuple[object, tuple[int, int]]] = []
 
@@ -287,8 +287,8 @@ def test_router_text_handles_latin_coords_board_test_two(monkeypatch):
         monkeypatch.setattr(storage, "find_match_by_user", lambda uid, chat_id=None: match)
         monkeypatch.setattr(router, "parse_coord", lambda text: (0, 0))
         monkeypatch.setattr(router, "format_coord", lambda coord: "a1")
-        monkeypatch.setattr(router, "random_phrase", lambda phrases: phrases[0])
-        monkeypatch.setattr(router, "random_joke", lambda: "JOKE")
+        monkeypatch.setattr(router, "random_phrase", lambda phrases, rng=None: phrases[0])
+        monkeypatch.setattr(router, "random_joke", lambda rng=None: "JOKE")
         monkeypatch.setattr(storage, "save_match", lambda m: None)
 
         apply_calls: list[tuple[object, tuple[int, int]]] = []
@@ -341,8 +341,8 @@ def test_handle_board_test_two_hit_message_second_person(monkeypatch):
         monkeypatch.setattr(storage, "find_match_by_user", lambda uid, chat_id=None: match)
         monkeypatch.setattr(router, "parse_coord", lambda text: (0, 0))
         monkeypatch.setattr(router, "format_coord", lambda coord: "a1")
-        monkeypatch.setattr(router, "random_phrase", lambda phrases: phrases[0])
-        monkeypatch.setattr(router, "random_joke", lambda: "JOKE")
+        monkeypatch.setattr(router, "random_phrase", lambda phrases, rng=None: phrases[0])
+        monkeypatch.setattr(router, "random_joke", lambda rng=None: "JOKE")
         monkeypatch.setattr(storage, "save_match", lambda m: None)
 
         apply_calls: list[tuple[object, tuple[int, int]]] = []
@@ -398,7 +398,7 @@ def test_router_text_auto_board_test_two_matches_standard_flow(monkeypatch):
         monkeypatch.setattr(storage, "find_match_by_user", lambda uid, chat_id=None: match)
 
         board_instance = SimpleNamespace(owner=None)
-        monkeypatch.setattr(router, "random_board", lambda: board_instance)
+        monkeypatch.setattr(router, "generate_layout", lambda mode, seed: (seed, board_instance))
 
         def fake_save_board(match_obj, player_key, board):
             match_obj.players[player_key].ready = True
@@ -480,8 +480,8 @@ def test_router_invalid_cell_shows_board(monkeypatch):
             messages={},
         )
         monkeypatch.setattr(storage, 'find_match_by_user', lambda uid, chat_id=None: match)
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(storage, 'save_match', lambda m: None)
 
         send_message = AsyncMock()
@@ -515,8 +515,8 @@ def test_router_wrong_turn_shows_board(monkeypatch):
             messages={},
         )
         monkeypatch.setattr(storage, 'find_match_by_user', lambda uid, chat_id=None: match)
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(storage, 'save_match', lambda m: None)
 
         send_message = AsyncMock()
@@ -557,9 +557,9 @@ def test_router_auto_shows_board(monkeypatch):
 
         monkeypatch.setattr(storage, 'save_board', fake_save_board)
         monkeypatch.setattr(storage, 'find_match_by_user', lambda uid, chat_id=None: match)
-        monkeypatch.setattr(router, 'random_board', lambda: SimpleNamespace())
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'generate_layout', lambda mode, seed: (seed, SimpleNamespace()))
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(storage, 'save_match', lambda m: None)
 
         send_message = AsyncMock()
@@ -606,9 +606,9 @@ def test_router_auto_waits_and_sends_instruction(monkeypatch):
 
         monkeypatch.setattr(storage, 'save_board', fake_save_board)
         monkeypatch.setattr(storage, 'find_match_by_user', lambda uid, chat_id=None: match)
-        monkeypatch.setattr(router, 'random_board', lambda: SimpleNamespace())
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'generate_layout', lambda mode, seed: (seed, SimpleNamespace()))
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(storage, 'save_match', lambda m: None)
 
         send_message = AsyncMock()
@@ -662,8 +662,8 @@ def test_router_kill_message(monkeypatch):
             messages={},
         )
         monkeypatch.setattr(storage, 'find_match_by_user', lambda uid, chat_id=None: match)
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(storage, 'save_match', lambda m: None)
         send_message = AsyncMock()
         context = SimpleNamespace(bot=SimpleNamespace(send_message=send_message, delete_message=AsyncMock()))
@@ -734,13 +734,13 @@ def test_router_joke_format(monkeypatch):
             messages={},
         )
         monkeypatch.setattr(storage, 'find_match_by_user', lambda uid, chat_id=None: match)
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(router, 'apply_shot', lambda board, coord: router.MISS)
         monkeypatch.setattr(router, 'parse_coord', lambda text: (0, 0))
         monkeypatch.setattr(router, 'format_coord', lambda coord: 'a1')
-        monkeypatch.setattr(router, 'random_phrase', lambda phrases: phrases[0])
-        monkeypatch.setattr(router, 'random_joke', lambda: 'JOKE')
+        monkeypatch.setattr(router, 'random_phrase', lambda phrases, rng=None: phrases[0])
+        monkeypatch.setattr(router, 'random_joke', lambda rng=None: 'JOKE')
         monkeypatch.setattr(storage, 'save_match', lambda m: None)
 
         send_message = AsyncMock()
@@ -779,8 +779,8 @@ def test_router_game_over_messages(monkeypatch):
             m.status = 'finished'
             return None
         monkeypatch.setattr(storage, 'find_match_by_user', lambda uid, chat_id=None: match)
-        monkeypatch.setattr(router, 'render_board_own', lambda b: 'own')
-        monkeypatch.setattr(router, 'render_board_enemy', lambda b: 'enemy')
+        monkeypatch.setattr(router, 'render_board_own', lambda b, **kwargs: 'own')
+        monkeypatch.setattr(router, 'render_board_enemy', lambda b, **kwargs: 'enemy')
         monkeypatch.setattr(storage, 'finish', fake_finish)
         monkeypatch.setattr(storage, 'save_match', lambda m: None)
         send_message = AsyncMock()
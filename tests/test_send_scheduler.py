@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+from telegram.error import RetryAfter
+
+from app.send_scheduler import PRIORITY_LOW, SendScheduler
+
+
+def _scheduler(**kwargs):
+    options = dict(global_per_second=1000, chat_per_minute=60000, group_per_minute=60000)
+    options.update(kwargs)
+    return SendScheduler(**options)
+
+
+def test_requests_for_a_chat_keep_their_order():
+    scheduler = _scheduler()
+    delivered = []
+
+    async def send(chat_id, text, delay):
+        await asyncio.sleep(delay)
+        delivered.append((chat_id, text))
+        return text
+
+    async def run():
+        await asyncio.gather(
+            *(
+                scheduler.process_request(
+                    send, (chat_id, idx, 0.01 * (3 - idx)), {}, "sendMessage", {"chat_id": chat_id}, None
+                )
+                for idx in range(3)
+                for chat_id in (1, 2)
+            )
+        )
+
+    asyncio.run(run())
+
+    for chat_id in (1, 2):
+        assert [text for chat, text in delivered if chat == chat_id] == [0, 1, 2]
+    assert scheduler.stats()["requests"] == 6
+    assert scheduler.stats()["queued"] == 0
+
+
+def test_retry_after_pauses_and_retries():
+    scheduler = _scheduler()
+    attempts = []
+
+    async def send():
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) == 1:
+            raise RetryAfter(0)
+        return "ok"
+
+    async def run():
+        return await scheduler.process_request(send, (), {}, "sendPhoto", {"chat_id": 1}, None)
+
+    assert asyncio.run(run()) == "ok"
+    assert len(attempts) == 2
+    assert scheduler.stats()["retries"] == 1
+
+
+def test_retry_after_is_raised_after_max_retries():
+    scheduler = _scheduler(max_retries=1)
+
+    async def send():
+        raise RetryAfter(0)
+
+    async def run():
+        await scheduler.process_request(send, (), {}, "sendMessage", {"chat_id": 1}, None)
+
+    with pytest.raises(RetryAfter):
+        asyncio.run(run())
+
+
+def test_move_results_go_before_cosmetic_requests():
+    scheduler = _scheduler(global_per_second=20)
+    order = []
+
+    async def send(name):
+        order.append(name)
+
+    async def run():
+        # Drain the global bucket so the remaining requests have to wait.
+        scheduler._global.tokens = 0
+        scheduler._global._updated = asyncio.get_running_loop().time()
+        low = [
+            scheduler.process_request(
+                send, (f"delete-{chat_id}",), {}, "deleteMessage", {"chat_id": chat_id}, None
+            )
+            for chat_id in range(3)
+        ]
+        high = [
+            scheduler.process_request(
+                send, (f"photo-{chat_id}",), {}, "sendPhoto", {"chat_id": chat_id + 10}, None
+            )
+            for chat_id in range(2)
+        ]
+        forced = scheduler.process_request(
+            send, ("text",), {}, "sendMessage", {"chat_id": 20}, PRIORITY_LOW
+        )
+        await asyncio.gather(*low, forced, *high)
+
+    asyncio.run(run())
+
+    assert sorted(order[:2]) == ["photo-0", "photo-1"]
+    assert "text" in order[2:]
+
+
+def test_chat_rate_is_kept_between_sequential_sends():
+    scheduler = _scheduler(chat_per_minute=600)
+
+    async def send():
+        return asyncio.get_running_loop().time()
+
+    async def run():
+        return [
+            await scheduler.process_request(send, (), {}, "sendMessage", {"chat_id": 1}, None)
+            for _ in range(5)
+        ]
+
+    times = asyncio.run(run())
+
+    # Three messages fit the burst, the next ones wait for 10 per second.
+    assert times[4] - times[0] >= 0.15
+
+
+def test_deletes_and_edits_do_not_use_the_chat_rate():
+    scheduler = _scheduler(chat_per_minute=60)
+
+    async def send():
+        return asyncio.get_running_loop().time()
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        for endpoint in ("deleteMessage", "editMessageMedia") * 3:
+            await scheduler.process_request(send, (), {}, endpoint, {"chat_id": 1}, None)
+        sent = [
+            await scheduler.process_request(send, (), {}, "sendPhoto", {"chat_id": 1}, None)
+            for _ in range(3)
+        ]
+        return sent[-1] - started
+
+    # Six cleanups and edits leave the three-message burst for the photos.
+    assert asyncio.run(run()) < 0.5
+
+
+def test_move_result_overtakes_cleanup_queued_in_the_same_chat():
+    scheduler = _scheduler()
+    order = []
+
+    async def send(name, gate=None):
+        if gate is not None:
+            await gate.wait()
+        order.append(name)
+
+    async def run():
+        gate = asyncio.Event()
+        first = asyncio.create_task(
+            scheduler.process_request(send, ("first", gate), {}, "sendPhoto", {"chat_id": 1}, None)
+        )
+        await asyncio.sleep(0.01)
+        cleanup = asyncio.create_task(
+            scheduler.process_request(send, ("delete",), {}, "deleteMessage", {"chat_id": 1}, None)
+        )
+        await asyncio.sleep(0.01)
+        result = asyncio.create_task(
+            scheduler.process_request(send, ("result",), {}, "sendPhoto", {"chat_id": 1}, None)
+        )
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(first, cleanup, result)
+
+    asyncio.run(run())
+
+    assert order == ["first", "result", "delete"]
@@ -63,9 +63,12 @@ def test_send_state_allows_expected_frame_changes(monkeypatch):
     async def run():
         match = Match15.new(1, 101, "Tester")
         match.match_id = "frame-guard-allow"
-        match.field.grid[0][1] = 2
+        cell = next(
+            (r, c) for r in range(15) for c in range(15) if match.field.grid[r][c] == 0
+        )
+        match.field.grid[cell[0]][cell[1]] = 2
         snapshot = match.create_snapshot()
-        match._last_expected_changes = {(0, 1)}
+        match._last_expected_changes = {cell}
 
         context = SimpleNamespace(
             bot=SimpleNamespace(send_photo=AsyncMock(return_value=SimpleNamespace(message_id=42))),
@@ -0,0 +1,59 @@
+import random
+
+from logic import targeting
+
+
+def _view(grid, own=()):
+    own_cells = set(own)
+    return targeting.BoardView(
+        len(grid),
+        lambda coord: grid[coord[0]][coord[1]],
+        lambda coord: coord in own_cells,
+    )
+
+
+def test_pool_matches_full_scan_after_patches() -> None:
+    grid = [[0] * 10 for _ in range(10)]
+    view = _view(grid, own=[(0, 0)])
+    pool = targeting.TargetPool(view)
+    assert (0, 0) not in pool
+    assert len(pool) == 99
+
+    grid[4][4] = 3
+    grid[2][7] = 2
+    pool.record_shot([(4, 4), (2, 7)])
+
+    expected = {
+        (r, c) for r in range(10) for c in range(10) if targeting.is_available(view, (r, c))
+    }
+    assert set(pool.cells()) == expected
+    assert (3, 3) not in pool and (4, 5) in pool
+
+
+def test_choose_target_extends_line_and_records_kill() -> None:
+    grid = [[0] * 10 for _ in range(10)]
+    grid[5][5] = grid[5][6] = 3
+    grid[5][4] = 2
+    view = _view(grid)
+    entry = {"target_hits": [(5, 5), (5, 6)], "target_owner": "A"}
+
+    coord = targeting.choose_target(view, entry, random.Random(0))
+    assert coord == (5, 7)
+
+    grid[5][5] = grid[5][6] = grid[5][7] = 4
+    targeting.record_result(view, entry, (5, 7), "kill", "A")
+    assert entry == {"target_hits": [], "target_owner": None}
+
+
+def test_density_hunt_prefers_open_water() -> None:
+    grid = [[2] * 10 for _ in range(10)]
+    for c in range(4):
+        grid[0][c] = 0
+    grid[9][9] = 0
+    view = _view(grid)
+
+    coord = targeting.hunt_target(
+        view, random.Random(1), strategy=targeting.HUNT_DENSITY, fleet=[3]
+    )
+
+    assert coord in {(0, 1), (0, 2)}
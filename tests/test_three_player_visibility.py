@@ -39,7 +39,7 @@ def test_render_board_hides_enemy_ships_when_reveal_disabled():
     )
 
     buffer = render_mod.render_board(state, "A")
-    image = render_mod.Image.open(buffer)
+    image = render_mod.Image.open(buffer).convert("RGBA")
     try:
         own_center = _cell_center(0, 0)
         enemy_center = _cell_center(0, 1)
@@ -0,0 +1,130 @@
+import asyncio
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from fastapi.testclient import TestClient
+
+from app.update_queue import UpdateQueue
+
+
+def _update(chat_id, idx):
+    return SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id), idx=idx)
+
+
+def test_updates_of_a_chat_are_processed_in_order():
+    processed = []
+
+    async def process(update):
+        await asyncio.sleep(0.001 * (5 - update.idx))
+        processed.append((update.effective_chat.id, update.idx))
+
+    async def run():
+        queue = UpdateQueue(process, max_size=100, workers=3)
+        queue.start()
+        for idx in range(5):
+            for chat_id in (1, 2, 3, 4):
+                assert queue.offer(_update(chat_id, idx))
+        await queue.drain(timeout=5)
+        return queue.stats()
+
+    stats = asyncio.run(run())
+
+    for chat_id in (1, 2, 3, 4):
+        assert [idx for chat, idx in processed if chat == chat_id] == list(range(5))
+    assert stats["processed"] == 20
+    assert stats["pending"] == 0
+
+
+def test_slow_chat_does_not_hold_up_other_chats():
+    async def run():
+        gate = asyncio.Event()
+        seen = []
+
+        async def process(update):
+            if update.effective_chat.id == 1:
+                await gate.wait()
+            seen.append((update.effective_chat.id, update.idx))
+
+        queue = UpdateQueue(process, max_size=100, workers=2)
+        queue.start()
+        # Chats 1, 3 and 5 would share a worker if chats were pinned to one.
+        assert queue.offer(_update(1, 0))
+        assert queue.offer(_update(1, 1))
+        for idx in range(3):
+            for chat_id in (3, 5):
+                assert queue.offer(_update(chat_id, idx))
+        for _ in range(20):
+            await asyncio.sleep(0)
+        served_while_blocked = list(seen)
+        gate.set()
+        await queue.drain(timeout=5)
+        return served_while_blocked, seen
+
+    served_while_blocked, seen = asyncio.run(run())
+
+    assert sorted(served_while_blocked) == [(3, 0), (3, 1), (3, 2), (5, 0), (5, 1), (5, 2)]
+    assert [idx for chat, idx in seen if chat == 1] == [0, 1]
+
+
+def test_full_queue_rejects_updates_and_failures_do_not_stop_workers():
+    async def run():
+        gate = asyncio.Event()
+        seen = []
+
+        async def process(update):
+            await gate.wait()
+            seen.append(update.idx)
+            if update.idx == 0:
+                raise RuntimeError("handler failed")
+
+        queue = UpdateQueue(process, max_size=2, workers=1)
+        assert not queue.offer(_update(1, -1))
+        queue.start()
+        assert queue.offer(_update(1, 0))
+        assert queue.offer(_update(1, 1))
+        assert not queue.offer(_update(1, 2))
+        gate.set()
+        await queue.drain(timeout=5)
+        return queue.stats(), seen
+
+    stats, seen = asyncio.run(run())
+
+    assert seen == [0, 1]
+    assert stats["rejected"] == 2
+    assert stats["failed"] == 1
+    assert stats["processed"] == 1
+
+
+def test_webhook_answers_before_the_update_is_processed(monkeypatch):
+    os.environ.setdefault("BOT_TOKEN", "test")
+    os.environ.setdefault("WEBHOOK_URL", "http://example.com")
+
+    from app import main
+
+    for name in ("initialize", "start", "stop", "shutdown"):
+        monkeypatch.setattr(main.bot_app, name, AsyncMock())
+    bot_cls = main.bot_app.bot.__class__
+    monkeypatch.setattr(bot_cls, "set_webhook", AsyncMock())
+    monkeypatch.setattr(bot_cls, "delete_webhook", AsyncMock())
+    monkeypatch.setattr(main, "WEBHOOK_SECRET", "")
+    processed = []
+
+    async def slow_process(update):
+        await asyncio.sleep(0.2)
+        processed.append(update.update_id)
+
+    monkeypatch.setattr(main.bot_app, "process_update", slow_process)
+    monkeypatch.setattr(main.update_queue, "max_size", 1)
+
+    with TestClient(main.app) as client:
+        first = client.post("/webhook", json={"update_id": 1})
+        second = client.post("/webhook", json={"update_id": 2})
+        malformed = client.post("/webhook", json=[])
+        assert processed == []
+
+    assert first.status_code == 200
+    assert second.status_code == 503
+    assert malformed.status_code == 400
+    # Shutdown drained the queued update.
+    assert processed == [1]
@@ -1,10 +1,29 @@
 import unicodedata
+from functools import lru_cache
 
-def wcswidth(text: str) -> int:
-    width = 0
-    for ch in text:
+# Widths of characters seen so far; the boards use a handful of symbols.
+_CHAR_WIDTHS: dict = {}
+
+
+def _char_width(ch: str) -> int:
+    width = _CHAR_WIDTHS.get(ch)
+    if width is None:
         if unicodedata.combining(ch):
-            continue
-        eaw = unicodedata.east_asian_width(ch)
-        width += 2 if eaw in ('W', 'F') else 1
+            width = 0
+        elif unicodedata.east_asian_width(ch) in ('W', 'F'):
+            width = 2
+        else:
+            width = 1
+        _CHAR_WIDTHS[ch] = width
     return width
+
+
+@lru_cache(maxsize=1024)
+def _string_width(text: str) -> int:
+    return sum(map(_char_width, text))
+
+
+def wcswidth(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return _string_width(text)